@@ -1,26 +1,127 @@
+"""
+Daniels 5K Planner.
 
-from .athlete import AthleteConfig
-from .zones import DanielsZones
-from .sessions import (
-    ZoneCode, ContinuousSegment, IntervalBlock,
-    SessionTemplate, Workout, build_5k_session_library
-)
-from .selection import WeeklySessionSelector
-from .volume import WeeklyVolumePlanner
-from .pacing import (
-    WorkoutPaceAnnotator,
-    weekly_plan_to_workouts,
-    workouts_to_dataframe,
-    format_plan_for_console,
-    format_plan_as_table,
-    print_plan,
-)
-from .feedback import (
-    CompletedWorkoutFeedback, WeeklyFeedback,
-    FeedbackAdjustment, FeedbackEngine
-)
-from .facade_5k import (
-    estimate_vdot_from_race,
-    build_5k_phase_sequence_simple,
-    generate_5k_plan_from_race,
-)
+Os submódulos são importados sob demanda (PEP 562): ``import daniels_5k_planner``
+não carrega NumPy nem pandas; cada nome abaixo é resolvido no primeiro acesso.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+_LAZY_EXPORTS = {
+    "athlete": ("AthleteConfig",),
+    "zones": ("DanielsZones", "pace_code", "pace_str", "zone_pace_table", "zone_records_for_vdots"),
+    "sessions": (
+        "ZoneCode", "ContinuousSegment", "IntervalBlock",
+        "SessionTemplate", "Workout", "build_5k_session_library",
+    ),
+    "session_data": ("load_session_library", "dump_session_library"),
+    "plan": ("WeeklyPlan",),
+    "library": ("SessionLibraryIndex",),
+    "scheduling": ("SchedulingConstraints", "solve_week_layout"),
+    "selection": ("WeeklySessionSelector", "SelectorState"),
+    "volume": ("WeeklyVolumePlanner",),
+    "pacing": (
+        "WorkoutPaceAnnotator",
+        "weekly_plan_to_workouts",
+        "workouts_to_dataframe",
+        "workouts_to_records",
+        "workouts_to_structured_array",
+        "format_plan_for_console",
+        "format_plan_as_table",
+        "print_plan",
+    ),
+    "progression": ("vdot_trajectory", "weekly_plan_to_workouts_progressive", "update_workouts_vdot"),
+    "steps": ("WorkoutStep", "iter_session_steps", "plan_step_table"),
+    "splits": ("split_table", "attach_rep_splits", "format_split"),
+    "device_export": ("WorkoutFileExporter",),
+    "sweep": ("sweep_5k_plans",),
+    "render": ("render_plan_console", "render_plan_table"),
+    "serialize": ("workout_to_record", "iter_ndjson", "write_ndjson"),
+    "hashing": ("content_hash", "library_hash", "plan_hash"),
+    "ics": ("IcsCalendarExporter", "write_plan_ics"),
+    "storage": ("PlanRepository",),
+    "diff": ("PlanDiff", "diff_plans", "apply_plan_patch"),
+    "feedback": (
+        "CompletedWorkoutFeedback", "WeeklyFeedback",
+        "FeedbackAdjustment", "FeedbackEngine",
+    ),
+    "quality": ("apply_quality_bias",),
+    "feedback_rules": ("FeedbackRuleSet", "DEFAULT_FEEDBACK_RULES"),
+    "prediction": ("predict_race_time", "predict_race_times", "equivalent_race_times"),
+    "simulation": ("SyntheticAthleteModel", "simulate_feedback", "feedback_engine_policy"),
+    "facade_5k": (
+        "estimate_vdot_from_race",
+        "build_5k_phase_sequence_simple",
+        "generate_5k_plan_from_race",
+    ),
+}
+
+_NAME_TO_MODULE = {name: module for module, names in _LAZY_EXPORTS.items() for name in names}
+
+__all__ = list(_NAME_TO_MODULE)
+
+
+def __getattr__(name: str):
+    module = _NAME_TO_MODULE.get(name)
+    if module is not None:
+        value = getattr(importlib.import_module(f".{module}", __name__), name)
+    elif name in _LAZY_EXPORTS:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_LAZY_EXPORTS))
+
+
+if TYPE_CHECKING:
+    from .athlete import AthleteConfig
+    from .zones import DanielsZones, pace_code, pace_str, zone_pace_table, zone_records_for_vdots
+    from .sessions import (
+        ZoneCode, ContinuousSegment, IntervalBlock,
+        SessionTemplate, Workout, build_5k_session_library
+    )
+    from .session_data import load_session_library, dump_session_library
+    from .plan import WeeklyPlan
+    from .library import SessionLibraryIndex
+    from .scheduling import SchedulingConstraints, solve_week_layout
+    from .selection import WeeklySessionSelector, SelectorState
+    from .volume import WeeklyVolumePlanner
+    from .pacing import (
+        WorkoutPaceAnnotator,
+        weekly_plan_to_workouts,
+        workouts_to_dataframe,
+        workouts_to_records,
+        workouts_to_structured_array,
+        format_plan_for_console,
+        format_plan_as_table,
+        print_plan,
+    )
+    from .progression import vdot_trajectory, weekly_plan_to_workouts_progressive, update_workouts_vdot
+    from .steps import WorkoutStep, iter_session_steps, plan_step_table
+    from .splits import split_table, attach_rep_splits, format_split
+    from .device_export import WorkoutFileExporter
+    from .sweep import sweep_5k_plans
+    from .render import render_plan_console, render_plan_table
+    from .serialize import workout_to_record, iter_ndjson, write_ndjson
+    from .hashing import content_hash, library_hash, plan_hash
+    from .ics import IcsCalendarExporter, write_plan_ics
+    from .storage import PlanRepository
+    from .diff import PlanDiff, diff_plans, apply_plan_patch
+    from .feedback import (
+        CompletedWorkoutFeedback, WeeklyFeedback,
+        FeedbackAdjustment, FeedbackEngine
+    )
+    from .quality import apply_quality_bias
+    from .feedback_rules import FeedbackRuleSet, DEFAULT_FEEDBACK_RULES
+    from .prediction import predict_race_time, predict_race_times, equivalent_race_times
+    from .simulation import SyntheticAthleteModel, simulate_feedback, feedback_engine_policy
+    from .facade_5k import (
+        estimate_vdot_from_race,
+        build_5k_phase_sequence_simple,
+        generate_5k_plan_from_race,
+    )
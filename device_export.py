@@ -0,0 +1,381 @@
+from __future__ import annotations
+
+import re
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from .pacing import WorkoutPaceAnnotator
+from .plan import WeeklyPlan
+from .sessions import ContinuousSegment, IntervalBlock, SessionTemplate
+from .zones import zone_records_for_vdots
+
+VdotInput = Union[float, Sequence[float], np.ndarray]
+
+DEFAULT_VDOT_BUCKET = 0.5
+
+# --- FIT -------------------------------------------------------------------------------
+
+FIT_PROFILE_VERSION = 2132
+FIT_EPOCH_OFFSET = 631065600  # 1989-12-31T00:00:00Z em segundos Unix
+FIT_WORKOUT_NAME_SIZE = 24
+
+_FIT_FILE_TYPE_WORKOUT = 5
+_FIT_MANUFACTURER_DEVELOPMENT = 255
+_FIT_SPORT_RUNNING = 1
+_FIT_DURATION_TIME, _FIT_DURATION_DISTANCE, _FIT_DURATION_REPEAT = 0, 1, 6
+_FIT_TARGET_SPEED = 0
+_FIT_INTENSITY = {"active": 0, "rest": 1, "warmup": 2, "cooldown": 3}
+_FIT_INVALID_ENUM, _FIT_INVALID_UINT32 = 0xFF, 0xFFFFFFFF
+
+_ENUM, _UINT16, _UINT32, _UINT32Z, _STRING = 0x00, 0x84, 0x86, 0x8C, 0x07
+
+
+def _fit_definition(local: int, global_num: int, fields: Sequence[Tuple[int, int, int]]) -> bytes:
+    out = struct.pack("<BBBHB", 0x40 | local, 0, 0, global_num, len(fields))
+    return out + b"".join(struct.pack("<BBB", *f) for f in fields)
+
+
+_FIT_FILE_ID_DEF = _fit_definition(0, 0, [(0, 1, _ENUM), (1, 2, _UINT16), (2, 2, _UINT16), (3, 4, _UINT32Z), (4, 4, _UINT32)])
+_FIT_WORKOUT_DEF = _fit_definition(1, 26, [(4, 1, _ENUM), (6, 2, _UINT16), (8, FIT_WORKOUT_NAME_SIZE, _STRING)])
+_FIT_STEP_DEF = _fit_definition(2, 27, [
+    (254, 2, _UINT16), (1, 1, _ENUM), (2, 4, _UINT32), (3, 1, _ENUM),
+    (4, 4, _UINT32), (5, 4, _UINT32), (6, 4, _UINT32), (7, 1, _ENUM),
+])
+_FIT_STEP = struct.Struct("<BHBIBIIIB")
+
+
+def _crc_table() -> List[int]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC_TABLE = _crc_table()
+_crc_shift_basis: Dict[int, List[int]] = {}
+
+
+def fit_crc16(data: bytes, crc: int = 0) -> int:
+    """CRC-16 do protocolo FIT (polinômio 0xA001 refletido, início 0)."""
+    table = _CRC_TABLE
+    for b in data:
+        crc = (crc >> 8) ^ table[(crc ^ b) & 0xFF]
+    return crc
+
+
+def _crc_combine(crc_a: int, crc_b: int, len_b: int) -> int:
+    """
+    CRC de ``A + B`` a partir dos CRCs de ``A`` e ``B`` (ambos iniciados em 0).
+
+    Processar ``len_b`` bytes é linear no estado inicial; a imagem de cada bit do
+    estado é calculada uma vez por comprimento e reaproveitada.
+    """
+    basis = _crc_shift_basis.get(len_b)
+    if basis is None:
+        basis = []
+        for bit in range(16):
+            crc = 1 << bit
+            for _ in range(len_b):
+                crc = (crc >> 8) ^ _CRC_TABLE[crc & 0xFF]
+            basis.append(crc)
+        _crc_shift_basis[len_b] = basis
+    out = crc_b
+    for bit in range(16):
+        if crc_a >> bit & 1:
+            out ^= basis[bit]
+    return out
+
+
+def _speed_mm_s(pace_code: int) -> int:
+    return int(round(1_000_000 / pace_code)) if pace_code > 0 else 0
+
+
+# --- passos estruturados (com repetição) ------------------------------------------------
+
+def _structured_steps(template: SessionTemplate) -> List[tuple]:
+    """
+    Passos da sessão no formato dos relógios: ``("step", intensidade, alvo, valor, zona)``
+    ou ``("repeat", primeiro_passo, reps)``. ``alvo`` é ``"distance"`` (m) ou ``"time"`` (s).
+    """
+    steps: List[tuple] = []
+
+    def continuous(seg: ContinuousSegment, intensity: str) -> tuple:
+        if seg.distance_km is not None:
+            return ("step", intensity, "distance", seg.distance_km * 1000.0, seg.zone)
+        return ("step", intensity, "time", seg.duration_min * 60.0, seg.zone)
+
+    for seg in template.warmup:
+        steps.append(continuous(seg, "warmup"))
+    for item in template.main:
+        if isinstance(item, ContinuousSegment):
+            steps.append(continuous(item, "active"))
+        elif isinstance(item, IntervalBlock):
+            first = len(steps)
+            if item.work_distance_m is not None:
+                steps.append(("step", "active", "distance", float(item.work_distance_m), item.work_zone))
+            else:
+                steps.append(("step", "active", "time", item.work_duration_min * 60.0, item.work_zone))
+            if item.recovery_distance_m is not None:
+                steps.append(("step", "rest", "distance", float(item.recovery_distance_m), item.recovery_zone))
+            else:
+                steps.append(("step", "rest", "time", item.recovery_duration_min * 60.0, item.recovery_zone))
+            if item.reps > 1:
+                steps.append(("repeat", first, item.reps))
+    for seg in template.cooldown:
+        steps.append(continuous(seg, "cooldown"))
+    return steps
+
+
+class WorkoutFileExporter:
+    """
+    Exporta sessões anotadas como treinos estruturados FIT (binário) e TCX.
+
+    O VDOT de cada atleta/semana é arredondado para um bucket (``vdot_bucket``); os
+    passos codificados de cada ``(hash do template, bucket)`` — bytes FIT com o CRC parcial, ou
+    o fragmento XML do TCX — ficam em cache e são reaproveitados entre atletas. Por
+    arquivo só são montados o cabeçalho, o ``file_id`` e o nome do treino.
+    ``time_created`` (segundos Unix) é fixo por exportador, o que torna a saída determinística.
+    """
+
+    def __init__(self, vdot_bucket: float = DEFAULT_VDOT_BUCKET, time_created: Optional[int] = None):
+        if vdot_bucket <= 0:
+            raise ValueError("vdot_bucket deve ser positivo.")
+        self.vdot_bucket = float(vdot_bucket)
+        unix_time = int(time.time()) if time_created is None else int(time_created)
+        self.fit_time_created = max(0, unix_time - FIT_EPOCH_OFFSET)
+        self._paces: Dict[float, Dict[str, Dict]] = {}
+        self._fit_blocks: Dict[Tuple[str, float], Tuple[bytes, int, int]] = {}
+        self._tcx_blocks: Dict[Tuple[str, float], str] = {}
+
+    # -- zonas por bucket --
+
+    def bucket(self, vdot: VdotInput) -> np.ndarray:
+        v = np.asarray(vdot, dtype=np.float64)
+        return np.round(v / self.vdot_bucket) * self.vdot_bucket
+
+    def prepare(self, vdots: VdotInput) -> None:
+        """Calcula de uma vez (vetorizado) as zonas de todos os buckets ainda não vistos."""
+        buckets = [b for b in np.unique(self.bucket(vdots)).tolist() if b not in self._paces]
+        if buckets:
+            for b, records in zip(buckets, zone_records_for_vdots(buckets)):
+                self._paces[b] = WorkoutPaceAnnotator(records).zone_paces
+
+    def _paces_for(self, bucket: float) -> Dict[str, Dict]:
+        if bucket not in self._paces:
+            self.prepare([bucket])
+        return self._paces[bucket]
+
+    # -- FIT --
+
+    def _fit_block(
+        self, template: SessionTemplate, bucket: float, tpl_hash: Optional[str]
+    ) -> Tuple[bytes, int, int]:
+        key = (tpl_hash or template.content_hash, bucket)
+        block = self._fit_blocks.get(key)
+        if block is None:
+            paces = self._paces_for(bucket)
+            parts = [_FIT_STEP_DEF]
+            steps = _structured_steps(template)
+            for i, s in enumerate(steps):
+                if s[0] == "repeat":
+                    parts.append(_FIT_STEP.pack(
+                        2, i, _FIT_DURATION_REPEAT, s[1], _FIT_INVALID_ENUM, s[2],
+                        _FIT_INVALID_UINT32, _FIT_INVALID_UINT32, _FIT_INVALID_ENUM,
+                    ))
+                    continue
+                _, intensity, target, value, zone = s
+                p = paces[zone]
+                if target == "distance":
+                    duration_type, duration_value = _FIT_DURATION_DISTANCE, int(round(value * 100))
+                else:
+                    duration_type, duration_value = _FIT_DURATION_TIME, int(round(value * 1000))
+                parts.append(_FIT_STEP.pack(
+                    2, i, duration_type, duration_value, _FIT_TARGET_SPEED, 0,
+                    _speed_mm_s(p["slow_code"]), _speed_mm_s(p["fast_code"]), _FIT_INTENSITY[intensity],
+                ))
+            data = b"".join(parts)
+            block = self._fit_blocks[key] = (data, fit_crc16(data), len(steps))
+        return block
+
+    def fit_bytes(
+        self,
+        template: SessionTemplate,
+        vdot: float,
+        name: Optional[str] = None,
+        serial: int = 0,
+        tpl_hash: Optional[str] = None,
+    ) -> bytes:
+        """
+        Arquivo FIT de treino estruturado (``file_id`` + ``workout`` + ``workout_step``).
+
+        ``tpl_hash`` é o ``content_hash`` do template, se já calculado pelo chamador.
+        """
+        bucket = float(self.bucket(vdot))
+        block, block_crc, n_steps = self._fit_block(template, bucket, tpl_hash)
+        raw_name = (name or template.name).encode("utf-8")[:FIT_WORKOUT_NAME_SIZE - 1]
+        wkt_name = raw_name.decode("utf-8", "ignore").encode("utf-8")
+        prefix = b"".join((
+            _FIT_FILE_ID_DEF,
+            struct.pack(
+                "<BBHHII", 0, _FIT_FILE_TYPE_WORKOUT, _FIT_MANUFACTURER_DEVELOPMENT, 0,
+                serial & 0xFFFFFFFF or 1, self.fit_time_created,
+            ),
+            _FIT_WORKOUT_DEF,
+            struct.pack(f"<BBH{FIT_WORKOUT_NAME_SIZE}s", 1, _FIT_SPORT_RUNNING, n_steps, wkt_name),
+        ))
+        header = struct.pack("<BBHI4s", 14, 0x20, FIT_PROFILE_VERSION, len(prefix) + len(block), b".FIT")
+        header += struct.pack("<H", fit_crc16(header))
+        crc = _crc_combine(fit_crc16(prefix, fit_crc16(header)), block_crc, len(block))
+        return b"".join((header, prefix, block, struct.pack("<H", crc)))
+
+    # -- TCX --
+
+    def _tcx_block(self, template: SessionTemplate, bucket: float, tpl_hash: Optional[str]) -> str:
+        key = (tpl_hash or template.content_hash, bucket)
+        block = self._tcx_blocks.get(key)
+        if block is not None:
+            return block
+        paces = self._paces_for(bucket)
+        steps = _structured_steps(template)
+        repeats = {s[1]: (i, s[2]) for i, s in enumerate(steps) if s[0] == "repeat"}
+
+        def step_xml(step_id: int, s: tuple, tag: str) -> str:
+            _, intensity, target, value, zone = s
+            p = paces[zone]
+            duration = (
+                f'<Duration xsi:type="Distance_t"><Meters>{int(round(value))}</Meters></Duration>'
+                if target == "distance"
+                else f'<Duration xsi:type="Time_t"><Seconds>{int(round(value))}</Seconds></Duration>'
+            )
+            return (
+                f'<{tag} xsi:type="Step_t"><StepId>{step_id}</StepId><Name>{zone}</Name>{duration}'
+                f'<Intensity>{"Resting" if intensity == "rest" else "Active"}</Intensity>'
+                f'<Target xsi:type="Speed_t"><SpeedZone xsi:type="CustomSpeedZone_t">'
+                f'<LowInMetersPerSecond>{1000 / p["slow_code"]:.3f}</LowInMetersPerSecond>'
+                f'<HighInMetersPerSecond>{1000 / p["fast_code"]:.3f}</HighInMetersPerSecond>'
+                f'</SpeedZone></Target></{tag}>'
+            )
+
+        parts: List[str] = []
+        step_id = 0
+        i = 0
+        while i < len(steps):
+            if i in repeats:
+                end, reps = repeats[i]
+                step_id += 1
+                repeat_id = step_id
+                children = []
+                for child in steps[i:end]:
+                    step_id += 1
+                    children.append(step_xml(step_id, child, "Child"))
+                parts.append(
+                    f'<Step xsi:type="Repeat_t"><StepId>{repeat_id}</StepId>'
+                    f'<Repetitions>{reps}</Repetitions>{"".join(children)}</Step>'
+                )
+                i = end + 1
+                continue
+            step_id += 1
+            parts.append(step_xml(step_id, steps[i], "Step"))
+            i += 1
+        block = self._tcx_blocks[key] = "".join(parts)
+        return block
+
+    def tcx_workout(
+        self, template: SessionTemplate, vdot: float, name: Optional[str] = None, tpl_hash: Optional[str] = None
+    ) -> str:
+        """Elemento ``<Workout>`` do TCX (nome limitado a 15 caracteres, como exige o formato)."""
+        bucket = float(self.bucket(vdot))
+        label = escape((name or template.code)[:15])
+        return (
+            f'<Workout Sport="Running"><Name>{label}</Name>'
+            f"{self._tcx_block(template, bucket, tpl_hash)}</Workout>"
+        )
+
+    # -- planos e elencos --
+
+    @staticmethod
+    def _template_hashes(plan: WeeklyPlan) -> Dict[int, str]:
+        # templates são mutáveis: o hash vale pelo tempo de uma exportação
+        return {t: plan.templates[t].content_hash for t in np.unique(plan.template_idx).tolist()}
+
+    @staticmethod
+    def _plan_vdots(plan: WeeklyPlan, vdot: VdotInput) -> np.ndarray:
+        v = np.asarray(vdot, dtype=np.float64)
+        if v.ndim == 0:
+            return np.full(plan.n_sessions, float(v))
+        if v.shape != (plan.n_weeks,):
+            raise ValueError(f"vdot deve ser um valor ou um por semana ({plan.n_weeks}).")
+        return v[plan.week_of_slot()]
+
+    def iter_plan_fit(self, plan: WeeklyPlan, athlete_name: str, vdot: VdotInput) -> Iterator[Tuple[str, bytes]]:
+        """Gera ``(nome_do_arquivo, bytes FIT)`` para cada sessão do plano."""
+        slot_vdot = self._plan_vdots(plan, vdot)
+        self.prepare(slot_vdot)
+        safe = re.sub(r"[^A-Za-z0-9_-]+", "_", athlete_name).strip("_") or "athlete"
+        weeks = (plan.week_of_slot() + plan.first_week).tolist()
+        days = plan.day_of_week.tolist()
+        vdots = slot_vdot.tolist()
+        hashes = self._template_hashes(plan)
+        for i, t in enumerate(plan.template_idx.tolist()):
+            tpl = plan.templates[t]
+            name = f"S{weeks[i]:02d}D{days[i]} {tpl.name}"
+            serial = zlib.crc32(f"{athlete_name}|{weeks[i]}|{days[i]}".encode("utf-8"))
+            data = self.fit_bytes(tpl, vdots[i], name, serial, hashes[t])
+            yield f"{safe}_W{weeks[i]:02d}_D{days[i]}_{tpl.code}.fit", data
+
+    def export_plan_fit(
+        self, plan: WeeklyPlan, athlete_name: str, vdot: VdotInput, dest_dir: Union[str, Path]
+    ) -> List[Path]:
+        """Grava um arquivo FIT por sessão do plano em ``dest_dir``."""
+        dest = Path(dest_dir)
+        dest.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for filename, data in self.iter_plan_fit(plan, athlete_name, vdot):
+            path = dest / filename
+            path.write_bytes(data)
+            paths.append(path)
+        return paths
+
+    def plan_to_tcx(self, plan: WeeklyPlan, vdot: VdotInput) -> str:
+        """Documento TCX com um ``<Workout>`` por sessão do plano."""
+        slot_vdot = self._plan_vdots(plan, vdot)
+        self.prepare(slot_vdot)
+        weeks = (plan.week_of_slot() + plan.first_week).tolist()
+        days = plan.day_of_week.tolist()
+        vdots = slot_vdot.tolist()
+        parts = [
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<TrainingCenterDatabase xmlns="http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2" '
+            'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"><Workouts>'
+        ]
+        hashes = self._template_hashes(plan)
+        for i, t in enumerate(plan.template_idx.tolist()):
+            tpl = plan.templates[t]
+            parts.append(self.tcx_workout(tpl, vdots[i], f"S{weeks[i]:02d}D{days[i]} {tpl.code}", hashes[t]))
+        parts.append("</Workouts></TrainingCenterDatabase>\n")
+        return "".join(parts)
+
+    def export_roster_fit(
+        self, entries: Iterable[Tuple[str, WeeklyPlan, VdotInput]], dest_dir: Union[str, Path]
+    ) -> List[Path]:
+        """
+        Exporta vários atletas ``(nome, plano, vdot)``; cada atleta vai para uma subpasta.
+        As zonas de todos os buckets do elenco são calculadas numa única passada.
+        """
+        entries = list(entries)
+        if entries:
+            self.prepare(np.concatenate([self._plan_vdots(plan, v) for _, plan, v in entries]))
+        paths: List[Path] = []
+        for athlete_name, plan, vdot in entries:
+            safe = re.sub(r"[^A-Za-z0-9_-]+", "_", athlete_name).strip("_") or "athlete"
+            paths.extend(self.export_plan_fit(plan, athlete_name, vdot, Path(dest_dir) / safe))
+        return paths
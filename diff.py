@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from .pacing import PLAN_COLUMNS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+PlanInput = Union["pd.DataFrame", Sequence[Mapping[str, Any]]]
+
+DIFF_KEY = ("athlete", "week", "day_of_week")
+PATCH_VERSION = 1
+
+
+def _as_frame(plan: PlanInput) -> pd.DataFrame:
+    import pandas as pd
+
+    if hasattr(plan, "columns"):
+        return plan.reset_index(drop=True)
+    return pd.DataFrame(list(plan))
+
+
+def _key_index(df: pd.DataFrame, key: Sequence[str]) -> pd.MultiIndex:
+    import pandas as pd
+
+    index = pd.MultiIndex.from_frame(df[list(key)])
+    if not index.is_unique:
+        raise ValueError(f"Chave {tuple(key)} repetida no plano; o diff exige uma sessão por chave.")
+    return index
+
+
+def _column_hashes(df: pd.DataFrame, fields: Sequence[str]) -> np.ndarray:
+    """Matriz ``(linhas, campos)`` de hashes uint64, um por célula."""
+    import pandas as pd
+
+    out = np.empty((len(df), len(fields)), dtype=np.uint64)
+    for j, col in enumerate(fields):
+        out[:, j] = pd.util.hash_pandas_object(df[col], index=False).to_numpy()
+    return out
+
+
+def _native(values: np.ndarray) -> List[Any]:
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+@dataclass
+class PlanDiff:
+    """
+    Diferença entre duas versões de um plano, por chave ``(athlete, week, day_of_week)``.
+
+    ``added`` e ``removed`` são listas de linhas (dicts); ``modified`` traz, para cada chave
+    alterada, só os campos que mudaram com o valor novo.
+    """
+
+    key: List[str]
+    fields: List[str]
+    added: List[Dict[str, Any]]
+    removed: List[Dict[str, Any]]
+    modified: List[Dict[str, Any]]
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.modified)
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.removed) + len(self.modified)
+
+    def to_patch(self) -> Dict[str, Any]:
+        """
+        Patch compacto e JSON-serializável.
+
+        Formato (``v`` = ``PATCH_VERSION``)::
+
+            {"v": 1, "key": [...], "fields": [...],
+             "removed": [[valores da chave], ...],
+             "added": [[valores da chave + valores de fields], ...],
+             "modified": [[[valores da chave], {campo: valor novo}], ...]}
+
+        Chaves viram listas posicionais na ordem de ``key``; modificações levam só os
+        campos que mudaram. ``apply_plan_patch`` remove, modifica e acrescenta nessa ordem
+        e recusa patches de outra versão.
+        """
+        return {
+            "v": PATCH_VERSION,
+            "key": list(self.key),
+            "fields": list(self.fields),
+            "removed": [[row[k] for k in self.key] for row in self.removed],
+            "added": [[row[k] for k in self.key] + [row[f] for f in self.fields] for row in self.added],
+            "modified": [[[m[k] for k in self.key], m["changes"]] for m in self.modified],
+        }
+
+
+def diff_plans(
+    old: PlanInput,
+    new: PlanInput,
+    key: Sequence[str] = DIFF_KEY,
+    fields: Optional[Sequence[str]] = None,
+) -> PlanDiff:
+    """
+    Compara dois planos (DataFrame ou registros) sem percorrer linha a linha.
+
+    As linhas são casadas pelo índice da chave e cada célula vira um hash uint64; uma
+    linha casada mudou se algum hash da sua linha difere. Só as células alteradas são
+    materializadas como valores Python. ``fields`` padrão: colunas de ``PLAN_COLUMNS``
+    (fora a chave) presentes nos dois planos.
+    """
+    old_df, new_df = _as_frame(old), _as_frame(new)
+    key = list(key)
+    if fields is None:
+        fields = [c for c in PLAN_COLUMNS if c not in key and c in old_df.columns and c in new_df.columns]
+    else:
+        fields = [c for c in fields if c not in key]
+        missing = [c for c in fields if c not in old_df.columns or c not in new_df.columns]
+        if missing:
+            raise ValueError(f"Campos ausentes em um dos planos: {missing}")
+
+    old_index = _key_index(old_df, key)
+    new_index = _key_index(new_df, key)
+    new_to_old = old_index.get_indexer(new_index)
+    matched_new = np.flatnonzero(new_to_old >= 0)
+    matched_old = new_to_old[matched_new]
+    added_rows = np.flatnonzero(new_to_old < 0)
+    kept = np.zeros(len(old_df), dtype=bool)
+    kept[matched_old] = True
+    removed_rows = np.flatnonzero(~kept)
+
+    changed = _column_hashes(old_df.iloc[matched_old], fields) != _column_hashes(new_df.iloc[matched_new], fields)
+    changed_rows = np.flatnonzero(changed.any(axis=1))
+
+    modified: List[Dict[str, Any]] = []
+    if len(changed_rows):
+        rows = new_df.iloc[matched_new[changed_rows]]
+        key_values = {k: _native(rows[k].to_numpy()) for k in key}
+        field_values = {f: _native(rows[f].to_numpy()) for f in fields}
+        for r, mask in enumerate(changed[changed_rows]):
+            entry = {k: key_values[k][r] for k in key}
+            entry["changes"] = {f: field_values[f][r] for f, c in zip(fields, mask) if c}
+            modified.append(entry)
+
+    columns = key + fields
+    return PlanDiff(
+        key=key,
+        fields=list(fields),
+        added=new_df.iloc[added_rows][columns].to_dict("records"),
+        removed=old_df.iloc[removed_rows][key].to_dict("records"),
+        modified=modified,
+    )
+
+
+def apply_plan_patch(plan: PlanInput, patch: Mapping[str, Any]) -> pd.DataFrame:
+    """
+    Aplica um patch de ``PlanDiff.to_patch`` a um plano e devolve o DataFrame resultante,
+    ordenado pela chave, com as colunas do plano original.
+    """
+    import pandas as pd
+
+    if patch.get("v") != PATCH_VERSION:
+        raise ValueError(f"Versão de patch não suportada: {patch.get('v')!r}")
+    key, fields = list(patch["key"]), list(patch["fields"])
+    df = _as_frame(plan).copy()
+    index = _key_index(df, key)
+
+    if patch["removed"]:
+        drop = index.get_indexer(pd.MultiIndex.from_tuples([tuple(k) for k in patch["removed"]], names=key))
+        if (drop < 0).any():
+            raise ValueError("Patch remove sessões que não existem no plano.")
+        keep = np.ones(len(df), dtype=bool)
+        keep[drop] = False
+        df = df[keep]
+        index = index[keep]
+
+    if patch["modified"]:
+        rows = index.get_indexer(pd.MultiIndex.from_tuples([tuple(k) for k, _ in patch["modified"]], names=key))
+        if (rows < 0).any():
+            raise ValueError("Patch modifica sessões que não existem no plano.")
+        df = df.reset_index(drop=True)
+        by_field: Dict[str, tuple] = {}
+        for row, (_, changes) in zip(rows.tolist(), patch["modified"]):
+            for f, value in changes.items():
+                by_field.setdefault(f, ([], []))
+                by_field[f][0].append(row)
+                by_field[f][1].append(value)
+        for f, (positions, values) in by_field.items():
+            col = df.columns.get_loc(f)
+            df.iloc[positions, col] = pd.Series(values, dtype=df[f].dtype).to_numpy()
+
+    if patch["added"]:
+        added = pd.DataFrame(patch["added"], columns=key + fields)
+        df = pd.concat([df, added.astype(df.dtypes[key + fields].to_dict())], ignore_index=True)
+
+    return df.sort_values(key, kind="stable").reset_index(drop=True)
@@ -1,26 +1,39 @@
 
+from __future__ import annotations
+
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 import numpy as np
-import pandas as pd
 
 from .athlete import AthleteConfig
 from .sessions import build_5k_session_library
 from .selection import WeeklySessionSelector
+from .scheduling import SchedulingConstraints
 from .volume import WeeklyVolumePlanner
-from .zones import DanielsZones
-from .pacing import weekly_plan_to_workouts, workouts_to_dataframe
+from .zones import DanielsZones, FRAC_A1, FRAC_A2, FRAC_C, FRAC_K1, FRAC_K2, VO2_A, VO2_B, VO2_C
+from .pacing import (
+    weekly_plan_to_workouts,
+    workouts_to_dataframe,
+    workouts_to_records,
+    workouts_to_structured_array,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def estimate_vdot_from_race(distance_km: float, time_min: float) -> float:
     distance_m = distance_km * 1000.0
     v = distance_m / time_min  # m/min
-    vo2 = -4.60 + 0.182258 * v + 0.000104 * v * v
-    frac = 0.8 + 0.1894393 * np.exp(-0.012778 * time_min) + 0.2989558 * np.exp(-0.1932605 * time_min)
+    vo2 = VO2_C + VO2_B * v + VO2_A * v * v
+    frac = FRAC_C + FRAC_A1 * np.exp(FRAC_K1 * time_min) + FRAC_A2 * np.exp(FRAC_K2 * time_min)
     vdot = vo2 / frac
     return float(vdot)
 
 
+PLAN_OUTPUTS = ("dataframe", "records", "array")
+
+
 @dataclass
 class SimplePhaseDef:
     name: str
@@ -50,13 +63,20 @@ def build_5k_phase_sequence_simple(total_weeks: int) -> List[str]:
     classic_order = ["Base", "EarlyQ", "Threshold", "Interval", "Repetition", "RS", "Taper"]
     if diff > 0:
         phases_sorted = sorted(phases, key=lambda p: (p.priority, classic_order.index(p.name)))
-        while diff > 0:
+        while diff > 0 and any(weeks_map[p.name] > 1 for p in phases_sorted):
             for p in phases_sorted:
                 if weeks_map[p.name] > 1:
                     weeks_map[p.name] -= 1
                     diff -= 1
                     if diff == 0:
                         break
+        # todas as fases já com 1 semana (planos curtos): descarta as de menor prioridade,
+        # de modo que RS e Taper sempre permanecem
+        for p in phases_sorted:
+            if diff <= 0:
+                break
+            weeks_map[p.name] = 0
+            diff -= 1
     elif diff < 0:
         phases_sorted = sorted(phases, key=lambda p: (-p.priority, -classic_order.index(p.name)))
         while diff < 0:
@@ -80,7 +100,23 @@ def generate_5k_plan_from_race(
     total_weeks: int = 8,
     initial_weekly_volume: float = 30.0,
     peak_weekly_volume: float = 50.0,
-) -> Tuple[pd.DataFrame, float]:
+    schedule_constraints: Optional[SchedulingConstraints] = None,
+    selection_mode: str = "rotation",
+    output: str = "dataframe",
+    vdot_gain_per_phase: Optional[Dict[str, float]] = None,
+    vdot_retests: Optional[Dict[int, float]] = None,
+) -> Tuple[Union[pd.DataFrame, List[Dict[str, Any]], np.ndarray], float]:
+    """
+    Pipeline completo a partir de uma prova.
+
+    ``output`` escolhe o formato do plano: ``"dataframe"`` (padrão), ``"records"``
+    (lista de dicts, sem pandas) ou ``"array"`` (array estruturado do NumPy).
+
+    ``vdot_gain_per_phase`` / ``vdot_retests`` ativam a progressão de VDOT ao longo do
+    plano (ver ``progression.vdot_trajectory``); o VDOT retornado continua sendo o da prova.
+    """
+    if output not in PLAN_OUTPUTS:
+        raise ValueError(f"output inválido: {output!r} (use {PLAN_OUTPUTS}).")
     vdot = estimate_vdot_from_race(distance_km=race_distance_km, time_min=race_time_min)
     athlete = AthleteConfig(
         name=athlete_name,
@@ -91,12 +127,24 @@ def generate_5k_plan_from_race(
     )
     phase_sequence = build_5k_phase_sequence_simple(total_weeks)
     session_lib = build_5k_session_library()
-    selector = WeeklySessionSelector(athlete, session_lib)
-    weekly_plan = selector.build_weekly_plan(phase_sequence)
+    selector = WeeklySessionSelector(
+        athlete, session_lib, constraints=schedule_constraints, selection_mode=selection_mode
+    )
     volume_planner = WeeklyVolumePlanner(athlete)
     weekly_targets = volume_planner.compute_weekly_targets(phase_sequence)
-    weekly_plan_with_vol = volume_planner.apply_volume_to_plan(weekly_plan, weekly_targets)
-    zones_df = DanielsZones(vdot).build_dataframe()
-    workouts = weekly_plan_to_workouts(weekly_plan_with_vol, athlete, zones_df)
+    plan = selector.build_plan(phase_sequence, weekly_targets)
+    volume_planner.apply_volume_to_plan(plan, weekly_targets)
+    if vdot_gain_per_phase or vdot_retests:
+        from .progression import vdot_trajectory, weekly_plan_to_workouts_progressive
+
+        trajectory = vdot_trajectory(vdot, phase_sequence, vdot_gain_per_phase, vdot_retests)
+        workouts = weekly_plan_to_workouts_progressive(plan, athlete, trajectory)
+    else:
+        zones = DanielsZones(vdot).build_records()
+        workouts = weekly_plan_to_workouts(plan, athlete, zones)
+    if output == "records":
+        return workouts_to_records(workouts), vdot
+    if output == "array":
+        return workouts_to_structured_array(workouts), vdot
     df_plan = workouts_to_dataframe(workouts)
     return df_plan, vdot
@@ -1,7 +1,13 @@
 
 from dataclasses import dataclass
 from typing import Optional, List
+import numpy as np
+
 from .athlete import AthleteConfig
+from .feedback_rules import FeedbackRuleSet
+from .library import SessionLibraryIndex
+from .plan import WeeklyPlan
+from .quality import apply_quality_bias
 
 @dataclass
 class CompletedWorkoutFeedback:
@@ -30,44 +36,38 @@ class FeedbackAdjustment:
     comment: str = ""
 
 class FeedbackEngine:
-    def __init__(self, athlete: AthleteConfig):
+    """
+    Converte feedback semanal em ajustes de volume/qualidade.
+
+    As regras vêm de um ``FeedbackRuleSet`` (padrão: ``DEFAULT_FEEDBACK_RULES``, que
+    reproduz os limiares originais); cada clube pode passar a sua tabela.
+    """
+
+    def __init__(self, athlete: AthleteConfig, rules: Optional[FeedbackRuleSet] = None):
         self.athlete = athlete
+        self.rules = rules if rules is not None else FeedbackRuleSet.default()
 
     def compute_adjustment_from_week(self, fb: WeeklyFeedback) -> FeedbackAdjustment:
-        A = fb.completed_volume_km / max(fb.planned_volume_km, 1e-3)
-        fatigue = fb.fatigue_score if fb.fatigue_score is not None else 5
-        soreness = fb.soreness_score if fb.soreness_score is not None else 5
-        volume_factor = 1.0
-        quality_bias = 1.0
-        comment = []
+        return self.compute_adjustments([fb])[0]
 
-        if A < 0.6 or fatigue >= 8 or soreness >= 8:
-            volume_factor = 0.8
-            quality_bias = 0.7
-            comment.append("Redução forte por baixa adesão ou fadiga/dor alta.")
-        elif A < 0.9 or fatigue >= 7:
-            volume_factor = 0.9
-            quality_bias = 0.85
-            comment.append("Redução moderada de volume e qualidade.")
-        elif 0.9 <= A <= 1.1 and fatigue <= 6 and soreness <= 6:
-            volume_factor = 1.0
-            quality_bias = 1.0
-            comment.append("Manter progressão planejada.")
-        elif A > 1.1 and fatigue <= 5 and soreness <= 5:
-            volume_factor = 1.05
-            quality_bias = 1.05
-            comment.append("Atleta suportando bem — leve aumento permitido.")
-        else:
-            comment.append("Situação intermediária — manter plano.")
-            volume_factor = 1.0
-            quality_bias = 1.0
-
-        return FeedbackAdjustment(
-            week=fb.week,
-            volume_factor=volume_factor,
-            quality_bias=quality_bias,
-            comment=" ".join(comment),
-        )
+    def compute_adjustments(self, feedbacks: List[WeeklyFeedback]) -> List[FeedbackAdjustment]:
+        """Avalia vários feedbacks (semanas ou atletas) numa única chamada às regras."""
+        nan = float("nan")
+        adherence = np.array([fb.completed_volume_km / max(fb.planned_volume_km, 1e-3) for fb in feedbacks])
+        fatigue = np.array([nan if fb.fatigue_score is None else fb.fatigue_score for fb in feedbacks], dtype=float)
+        soreness = np.array([nan if fb.soreness_score is None else fb.soreness_score for fb in feedbacks], dtype=float)
+        rpe = np.array([nan if fb.avg_rpe_quality is None else fb.avg_rpe_quality for fb in feedbacks], dtype=float)
+        missed = np.array([fb.missed_workouts for fb in feedbacks], dtype=float)
+        volume_factor, quality_bias, winner = self.rules(adherence, fatigue, soreness, rpe, missed)
+        return [
+            FeedbackAdjustment(
+                week=fb.week,
+                volume_factor=float(volume_factor[i]),
+                quality_bias=float(quality_bias[i]),
+                comment=self.rules.comments[winner[i]],
+            )
+            for i, fb in enumerate(feedbacks)
+        ]
 
     def apply_adjustment_to_targets(self, weekly_targets: List[float], adjustment: FeedbackAdjustment, from_week_exclusive: int) -> List[float]:
         new_targets = []
@@ -77,3 +77,16 @@ class FeedbackEngine:
             else:
                 new_targets.append(Vw)
         return new_targets
+
+    def apply_adjustment_to_plan(
+        self,
+        plan: WeeklyPlan,
+        adjustment: FeedbackAdjustment,
+        from_week_exclusive: int,
+        index: SessionLibraryIndex,
+    ) -> WeeklyPlan:
+        """
+        Aplica ``quality_bias`` às sessões de qualidade seguintes (ver
+        ``quality.apply_quality_bias``). O ``plan`` é alterado in-place e devolvido.
+        """
+        return apply_quality_bias(plan, adjustment.quality_bias, from_week_exclusive, index)[0]
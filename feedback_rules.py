@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+# Variáveis de entrada, na ordem das colunas da matriz avaliada
+FEEDBACK_VARIABLES = ("adherence", "fatigue", "soreness", "rpe", "missed_workouts")
+_OPS = ("<", "<=", ">", ">=", "==", "!=")
+
+# Tabela equivalente à cadeia if/elif original de ``FeedbackEngine``.
+# Cada regra vale se QUALQUER cláusula de ``when`` valer; uma cláusula exige TODAS as
+# suas condições ``variável: [[op, limite], ...]``. A primeira regra satisfeita decide.
+DEFAULT_FEEDBACK_RULES: Dict[str, Any] = {
+    "defaults": {"fatigue": 5, "soreness": 5},
+    "rules": [
+        {
+            "name": "strong_reduction",
+            "when": [{"adherence": [["<", 0.6]]}, {"fatigue": [[">=", 8]]}, {"soreness": [[">=", 8]]}],
+            "volume_factor": 0.8,
+            "quality_bias": 0.7,
+            "comment": "Redução forte por baixa adesão ou fadiga/dor alta.",
+        },
+        {
+            "name": "moderate_reduction",
+            "when": [{"adherence": [["<", 0.9]]}, {"fatigue": [[">=", 7]]}],
+            "volume_factor": 0.9,
+            "quality_bias": 0.85,
+            "comment": "Redução moderada de volume e qualidade.",
+        },
+        {
+            "name": "keep",
+            "when": [{
+                "adherence": [[">=", 0.9], ["<=", 1.1]],
+                "fatigue": [["<=", 6]],
+                "soreness": [["<=", 6]],
+            }],
+            "volume_factor": 1.0,
+            "quality_bias": 1.0,
+            "comment": "Manter progressão planejada.",
+        },
+        {
+            "name": "increase",
+            "when": [{"adherence": [[">", 1.1]], "fatigue": [["<=", 5]], "soreness": [["<=", 5]]}],
+            "volume_factor": 1.05,
+            "quality_bias": 1.05,
+            "comment": "Atleta suportando bem — leve aumento permitido.",
+        },
+    ],
+    "otherwise": {
+        "name": "intermediate",
+        "volume_factor": 1.0,
+        "quality_bias": 1.0,
+        "comment": "Situação intermediária — manter plano.",
+    },
+}
+
+
+class FeedbackRuleSet:
+    """
+    Regras de ajuste declarativas (ver ``DEFAULT_FEEDBACK_RULES``) compiladas em arrays.
+
+    A compilação gera uma tabela de condições atômicas ``(variável, operador, limite)`` e
+    matrizes de incidência condição→cláusula e cláusula→regra; avaliar ``n`` atletas é
+    uma comparação vetorizada por operador mais dois produtos de matrizes, seja qual for a
+    tabela. Valores ausentes (``NaN``) recebem ``defaults``; sem default, a condição é falsa.
+    """
+
+    def __init__(self, spec: Mapping[str, Any]):
+        self.spec = spec
+        rules = list(spec.get("rules", []))
+        otherwise = dict(spec.get("otherwise", {}))
+        self.names: List[str] = [r.get("name", f"rule_{i}") for i, r in enumerate(rules)]
+        self.names.append(otherwise.get("name", "otherwise"))
+        self.comments: List[str] = [r.get("comment", "") for r in rules] + [otherwise.get("comment", "")]
+        self.volume_factor = np.array(
+            [float(r["volume_factor"]) for r in rules] + [float(otherwise.get("volume_factor", 1.0))]
+        )
+        self.quality_bias = np.array(
+            [float(r["quality_bias"]) for r in rules] + [float(otherwise.get("quality_bias", 1.0))]
+        )
+        self.defaults = np.array(
+            [float(spec.get("defaults", {}).get(v, np.nan)) for v in FEEDBACK_VARIABLES]
+        )
+
+        atoms: List[Tuple[int, int, float]] = []
+        atom_clause: List[int] = []
+        clause_rule: List[int] = []
+        for r, rule in enumerate(rules):
+            clauses = rule.get("when", [])
+            if not clauses:
+                raise ValueError(f"Regra {self.names[r]!r} sem cláusulas em 'when'.")
+            for clause in clauses:
+                c = len(clause_rule)
+                clause_rule.append(r)
+                for variable, conditions in clause.items():
+                    if variable not in FEEDBACK_VARIABLES:
+                        raise ValueError(f"Variável desconhecida {variable!r} (use {FEEDBACK_VARIABLES}).")
+                    for op, limit in conditions:
+                        if op not in _OPS:
+                            raise ValueError(f"Operador inválido {op!r} (use {_OPS}).")
+                        atoms.append((FEEDBACK_VARIABLES.index(variable), _OPS.index(op), float(limit)))
+                        atom_clause.append(c)
+
+        self._atom_var = np.array([a[0] for a in atoms], dtype=np.intp)
+        self._atom_op = np.array([a[1] for a in atoms], dtype=np.intp)
+        self._atom_limit = np.array([a[2] for a in atoms], dtype=np.float64)
+        self._atoms_by_op = [np.flatnonzero(self._atom_op == k) for k in range(len(_OPS))]
+        self._clause_atoms = np.zeros((len(atoms), len(clause_rule)), dtype=np.int32)
+        self._clause_atoms[np.arange(len(atoms)), atom_clause] = 1
+        self._clause_size = self._clause_atoms.sum(axis=0)
+        self._rule_clauses = np.zeros((len(clause_rule), len(rules)), dtype=np.int32)
+        self._rule_clauses[np.arange(len(clause_rule)), clause_rule] = 1
+
+    @classmethod
+    def from_json(cls, path: Union[str, Path]) -> "FeedbackRuleSet":
+        return cls(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    @classmethod
+    def default(cls) -> "FeedbackRuleSet":
+        return cls(DEFAULT_FEEDBACK_RULES)
+
+    def __reduce__(self):
+        # recompila do spec ao ser enviado para outros processos
+        return (type(self), (self.spec,))
+
+    def _matrix(self, adherence, fatigue, soreness, rpe, missed_workouts) -> np.ndarray:
+        n = np.broadcast(*(np.asarray(v) for v in (adherence, fatigue, soreness))).shape
+        columns = []
+        for value, default in zip((adherence, fatigue, soreness, rpe, missed_workouts), self.defaults):
+            col = np.full(n, np.nan) if value is None else np.broadcast_to(np.asarray(value, dtype=np.float64), n)
+            columns.append(np.where(np.isnan(col), default, col))
+        return np.stack(columns, axis=-1).reshape(-1, len(FEEDBACK_VARIABLES))
+
+    def decide(
+        self,
+        adherence: ArrayLike,
+        fatigue: ArrayLike,
+        soreness: ArrayLike,
+        rpe: Optional[ArrayLike] = None,
+        missed_workouts: Optional[ArrayLike] = None,
+    ) -> np.ndarray:
+        """Índice da regra vencedora de cada atleta (``len(rules)`` = ``otherwise``)."""
+        shape = np.broadcast(*(np.asarray(v) for v in (adherence, fatigue, soreness))).shape
+        x = self._matrix(adherence, fatigue, soreness, rpe, missed_workouts)
+        values = x[:, self._atom_var]
+        truth = np.zeros(values.shape, dtype=np.int32)
+        with np.errstate(invalid="ignore"):
+            for k, idx in enumerate(self._atoms_by_op):
+                if not len(idx):
+                    continue
+                v, lim = values[:, idx], self._atom_limit[idx]
+                if k == 0:
+                    truth[:, idx] = v < lim
+                elif k == 1:
+                    truth[:, idx] = v <= lim
+                elif k == 2:
+                    truth[:, idx] = v > lim
+                elif k == 3:
+                    truth[:, idx] = v >= lim
+                elif k == 4:
+                    truth[:, idx] = v == lim
+                else:
+                    truth[:, idx] = v != lim
+        clause_true = (truth @ self._clause_atoms) == self._clause_size
+        rule_true = (clause_true.astype(np.int32) @ self._rule_clauses) > 0
+        n_rules = rule_true.shape[1]
+        if n_rules == 0:
+            return np.zeros(shape, dtype=np.intp)
+        any_true = rule_true.any(axis=1)
+        winner = np.where(any_true, rule_true.argmax(axis=1), n_rules)
+        return winner.reshape(shape)
+
+    def __call__(
+        self,
+        adherence: ArrayLike,
+        fatigue: ArrayLike,
+        soreness: ArrayLike,
+        rpe: Optional[ArrayLike] = None,
+        missed_workouts: Optional[ArrayLike] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """``(volume_factor, quality_bias, índice da regra)`` para cada atleta."""
+        winner = self.decide(adherence, fatigue, soreness, rpe, missed_workouts)
+        return self.volume_factor[winner], self.quality_bias[winner], winner
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Union
+
+import numpy as np
+
+from .sessions import SessionTemplate, Workout
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .plan import WeeklyPlan
+
+# Hashes de conteúdo: BLAKE2b de 128 bits sobre uma codificação canônica (JSON com
+# chaves ordenadas, sem espaços, floats por repr). A ``person`` versiona o esquema:
+# mudar a codificação exige trocá-la para não misturar hashes antigos e novos.
+HASH_DIGEST_SIZE = 16
+HASH_PERSON = b"d5k-content-v1"
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Valor não serializável para hash: {type(value).__name__}")
+
+
+def canonical_bytes(obj: Any) -> bytes:
+    """Codificação canônica de dados JSON-compatíveis usada em todos os hashes."""
+    return json.dumps(
+        obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=_default
+    ).encode("utf-8")
+
+
+def _hasher() -> "hashlib.blake2b":
+    return hashlib.blake2b(digest_size=HASH_DIGEST_SIZE, person=HASH_PERSON)
+
+
+def content_hash(obj: Any) -> str:
+    """Hash hexadecimal estável de um objeto JSON-compatível."""
+    h = _hasher()
+    h.update(canonical_bytes(obj))
+    return h.hexdigest()
+
+
+def template_hash(tpl: SessionTemplate) -> str:
+    """
+    Hash da definição do template (fase + campos declarativos de ``template_to_dict``).
+
+    Ritmos anotados nos segmentos não entram. Nada fica guardado no objeto: templates e
+    segmentos são mutáveis, então quem precisa reutilizar o hash guarda-o pelo tempo de
+    uma operação (ver ``weekly_plan_hash`` e ``WorkoutFileExporter``).
+    """
+    from .session_data import template_to_dict
+
+    return content_hash({"phase": tpl.phase, **template_to_dict(tpl)})
+
+
+def workout_hash(w: Workout) -> str:
+    """Hash de todos os campos do workout (inclusive ``segments``), no estado atual."""
+    from .serialize import workout_to_record
+
+    return content_hash(workout_to_record(w))
+
+
+def library_hash(session_lib: Dict[str, List[SessionTemplate]]) -> str:
+    """Versão da biblioteca: muda se qualquer template, fase ou a ordem deles mudar."""
+    h = _hasher()
+    for phase, templates in session_lib.items():
+        h.update(canonical_bytes(phase))
+        h.update(b"\x00")
+        for tpl in templates:
+            h.update(bytes.fromhex(template_hash(tpl)))
+        h.update(b"\x01")
+    return h.hexdigest()
+
+
+def weekly_plan_hash(plan: WeeklyPlan) -> str:
+    """
+    Hash de um ``WeeklyPlan``: fases, semanas, dias, templates e distâncias planejadas.
+
+    Os hashes dos templates usados são calculados uma vez por chamada, reunidos em uma
+    matriz e indexados por ``template_idx``, então o custo por slot é só a cópia dos bytes.
+    """
+    used, slot_pos = np.unique(plan.template_idx, return_inverse=True)
+    table = np.frombuffer(
+        b"".join(bytes.fromhex(template_hash(plan.templates[t])) for t in used.tolist()), dtype=np.uint8
+    ).reshape(len(used), HASH_DIGEST_SIZE)
+    h = _hasher()
+    h.update(canonical_bytes({"first_week": plan.first_week, "phases": plan.phases}))
+    h.update(np.ascontiguousarray(plan.week_offsets, dtype="<i8").tobytes())
+    h.update(np.ascontiguousarray(plan.day_of_week, dtype="i1").tobytes())
+    h.update(table[slot_pos.ravel()].tobytes())
+    h.update(np.ascontiguousarray(plan.planned_distance_km, dtype="<f8").tobytes())
+    return h.hexdigest()
+
+
+def workouts_hash(workouts: Iterable[Workout]) -> str:
+    """Hash de uma lista de workouts, independente da ordem em que foram gerados."""
+    h = _hasher()
+    for digest in sorted(workout_hash(w) for w in workouts):
+        h.update(bytes.fromhex(digest))
+    return h.hexdigest()
+
+
+def dataframe_hash(df: pd.DataFrame) -> str:
+    """Hash de um plano em DataFrame (colunas, em ordem, e valores; o índice é ignorado)."""
+    import pandas as pd
+
+    h = _hasher()
+    h.update(canonical_bytes([str(c) for c in df.columns]))
+    for col in df.columns:
+        h.update(pd.util.hash_pandas_object(df[col], index=False).to_numpy().astype("<u8").tobytes())
+    return h.hexdigest()
+
+
+def plan_hash(plan: Union[WeeklyPlan, pd.DataFrame, Iterable[Workout]]) -> str:
+    """Hash de um plano inteiro em qualquer das representações do pacote."""
+    if hasattr(plan, "template_idx"):
+        return weekly_plan_hash(plan)
+    if hasattr(plan, "columns"):
+        return dataframe_hash(plan)
+    return workouts_hash(plan)
@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, TextIO, Tuple, Union
+
+from .hashing import canonical_bytes
+from .render import DEFAULT_CHUNK_SIZE, _ChunkedWriter
+from .sessions import Workout
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+PlanRows = Union["pd.DataFrame", Sequence[Mapping[str, Any]], Iterable[Workout]]
+StartDate = Union[date, Mapping[str, date]]
+
+ICS_PRODID = "-//daniels-5k-planner//ICS//PT"
+UID_DOMAIN = "daniels-5k-planner"
+ICS_STATE_VERSION = 1
+
+_EVENT_FIELDS = ("athlete", "week", "day_of_week", "session_name", "session_code",
+                 "main_zones", "planned_distance_km", "description")
+
+
+def _iter_rows(plan: PlanRows) -> Iterator[Tuple[Any, ...]]:
+    """Linhas como tuplas na ordem de ``_EVENT_FIELDS``, sem materializar o plano."""
+    if hasattr(plan, "columns"):
+        yield from plan[list(_EVENT_FIELDS)].itertuples(index=False, name=None)
+        return
+    for row in plan:
+        if isinstance(row, Workout):
+            yield (row.athlete_name, row.week, row.day_of_week, row.session_name, row.session_code,
+                   "/".join(row.main_zones), row.planned_distance_km, row.description)
+        else:
+            yield tuple(row[f] for f in _EVENT_FIELDS)
+
+
+def _escape(text: str) -> str:
+    return (
+        str(text).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Dobra a linha em até 75 octetos (RFC 5545), sem partir caracteres UTF-8."""
+    if len(line) <= 75 and line.isascii():
+        return line + "\r\n"
+    parts: List[str] = []
+    current: List[str] = []
+    size = 0
+    limit = 75
+    for ch in line:
+        n = len(ch.encode("utf-8"))
+        if size + n > limit:
+            parts.append("".join(current))
+            current, size, limit = [], 0, 74  # linhas de continuação começam com espaço
+        current.append(ch)
+        size += n
+    parts.append("".join(current))
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _slug(text: str) -> str:
+    ascii_text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^A-Za-z0-9_-]+", "-", ascii_text).strip("-").lower() or "athlete"
+
+
+def athlete_key(athlete: str) -> str:
+    """
+    Identificador do atleta em UIDs e nomes de arquivo: slug ASCII legível mais um hash
+    curto do nome exato, para que nomes que só diferem em acentos ou símbolos
+    ("Zé" e "Zá") não colidam.
+    """
+    digest = hashlib.blake2b(str(athlete).encode("utf-8"), digest_size=4).hexdigest()
+    return f"{_slug(athlete)}-{digest}"
+
+
+def event_uid(athlete: str, week: int, day_of_week: int) -> str:
+    """UID estável de um evento: o mesmo atleta/semana/dia gera sempre o mesmo UID."""
+    return f"{athlete_key(athlete)}-w{int(week)}-d{int(day_of_week)}@{UID_DOMAIN}"
+
+
+@dataclass
+class IcsExportResult:
+    """
+    Resumo de uma exportação: sessões escritas, UIDs novos/alterados e UIDs que sumiram
+    (cada um destes sai como um VEVENT ``STATUS:CANCELLED``, fora da contagem de ``events``).
+    """
+
+    events: int = 0
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+
+class IcsCalendarExporter:
+    """
+    Exporta planos como iCalendar (um VEVENT de dia inteiro por sessão), em streaming.
+
+    ``start_date`` (ou um dict atleta → data) define a semana 1: ``day_of_week=1`` é a
+    segunda-feira da semana que contém a data. As linhas são lidas uma a uma e o texto é
+    gravado em blocos, então a memória não cresce com o tamanho do elenco.
+
+    O exportador guarda, por UID, só um digest do conteúdo, o ``SEQUENCE`` e o
+    ``DTSTAMP`` do evento: numa nova exportação os eventos inalterados saem idênticos
+    aos anteriores e os alterados ganham ``SEQUENCE`` incrementado. Cada UID exportado
+    antes que deixou de existir sai como um evento ``STATUS:CANCELLED`` (com ou sem
+    ``only_changed``), para que clientes que já importaram o evento o removam. Com
+    ``only_changed=True`` só os eventos novos/alterados e os cancelamentos são escritos.
+
+    Uma exportação cobre os atletas presentes no plano mais os passados em ``athletes``;
+    um atleta de ``athletes`` sem linhas tem todos os seus eventos cancelados e sai do
+    estado. Só os atletas cobertos são podados; os demais ficam intocados.
+
+    Esse estado é um dict JSON-compatível (``get_state``/``set_state``, ou
+    ``save_state``/``load_state`` para arquivo, ou ``state=`` no construtor), para que
+    um job que roda em um processo novo a cada dia continue gerando deltas reais.
+    """
+
+    def __init__(
+        self,
+        start_date: StartDate,
+        prodid: str = ICS_PRODID,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        state: Optional[Mapping[str, Any]] = None,
+    ):
+        self.start_date = start_date
+        self.prodid = prodid
+        self.chunk_size = chunk_size
+        self._events: Dict[str, Tuple[bytes, int, str]] = {}
+        self._uids_by_athlete: Dict[str, set] = {}
+        if state is not None:
+            self.set_state(state)
+
+    def get_state(self) -> Dict[str, Any]:
+        """Estado das exportações anteriores (UID → digest, SEQUENCE, DTSTAMP) em JSON puro."""
+        return {
+            "version": ICS_STATE_VERSION,
+            "events": {uid: [d.hex(), seq, stamp] for uid, (d, seq, stamp) in sorted(self._events.items())},
+            "athletes": {a: sorted(uids) for a, uids in sorted(self._uids_by_athlete.items())},
+        }
+
+    def set_state(self, state: Mapping[str, Any]) -> None:
+        if state.get("version") != ICS_STATE_VERSION:
+            raise ValueError(f"Versão de estado ICS não suportada: {state.get('version')!r}.")
+        self._events = {
+            uid: (bytes.fromhex(d), int(seq), str(stamp)) for uid, (d, seq, stamp) in state["events"].items()
+        }
+        self._uids_by_athlete = {a: set(uids) for a, uids in state["athletes"].items()}
+
+    def save_state(self, path: Union[str, Path]) -> None:
+        """Grava ``get_state()`` em JSON (escrita atômica: arquivo temporário + rename)."""
+        path = Path(path)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.get_state(), ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+
+    def load_state(self, path: Union[str, Path]) -> None:
+        self.set_state(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def _monday(self, athlete: str) -> date:
+        start = self.start_date.get(athlete) if isinstance(self.start_date, Mapping) else self.start_date
+        if start is None:
+            raise ValueError(f"Sem data de início para o atleta {athlete!r}.")
+        return start - timedelta(days=start.weekday())
+
+    @staticmethod
+    def _digest(row: tuple) -> bytes:
+        # codificação canônica: o mesmo conteúdo gera o mesmo digest vindo de DataFrame
+        # (tipos NumPy) ou de Workout, e entre processos
+        return hashlib.blake2b(canonical_bytes(list(row)), digest_size=12).digest()
+
+    def _render_event(self, uid: str, row: tuple, sequence: int, dtstamp: str) -> str:
+        athlete, week, day, name, code, zones, distance, description = row
+        day_date = self._monday(athlete) + timedelta(weeks=int(week) - 1, days=int(day) - 1)
+        end_date = day_date + timedelta(days=1)
+        summary = f"{name} ({code}) · {float(distance):.1f} km"
+        lines = (
+            "BEGIN:VEVENT",
+            f"UID:{uid}",
+            f"DTSTAMP:{dtstamp}",
+            f"SEQUENCE:{sequence}",
+            f"DTSTART;VALUE=DATE:{day_date:%Y%m%d}",
+            f"DTEND;VALUE=DATE:{end_date:%Y%m%d}",
+            f"SUMMARY:{_escape(summary)}",
+            f"DESCRIPTION:{_escape(description)}",
+            f"CATEGORIES:{_escape(zones)}",
+            "TRANSP:TRANSPARENT",
+            "END:VEVENT",
+        )
+        return "".join(_fold(line) for line in lines)
+
+    def _cancel_event(self, uid: str, dtstamp: str) -> str:
+        _, sequence, _ = self._events.pop(uid)
+        lines = (
+            "BEGIN:VEVENT", f"UID:{uid}", f"DTSTAMP:{dtstamp}", f"SEQUENCE:{sequence + 1}",
+            "STATUS:CANCELLED", "END:VEVENT",
+        )
+        return "".join(_fold(line) for line in lines)
+
+    def _close_athlete(
+        self, athlete: str, uids: set, dtstamp: str, result: IcsExportResult
+    ) -> Iterator[Tuple[str, str]]:
+        """Cancela os UIDs do atleta ausentes desta exportação e guarda os atuais no estado."""
+        gone = sorted(self._uids_by_athlete.pop(athlete, set()) - uids)
+        if uids:
+            self._uids_by_athlete[athlete] = uids
+        result.removed.extend(gone)
+        for uid in gone:
+            yield athlete, self._cancel_event(uid, dtstamp)
+
+    def iter_events(
+        self,
+        plan: PlanRows,
+        result: Optional[IcsExportResult] = None,
+        only_changed: bool = False,
+        athletes: Iterable[str] = (),
+        grouped: bool = False,
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Gera ``(atleta, texto do VEVENT)`` para cada linha do plano, sob demanda, e os
+        cancelamentos dos atletas cobertos (ver a classe). Com ``grouped=True`` as linhas de
+        cada atleta precisam vir contíguas e os cancelamentos dele saem logo depois delas.
+        """
+        dtstamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        result = result if result is not None else IcsExportResult()
+        seen: Dict[str, set] = {}
+        current: Optional[str] = None
+        for row in _iter_rows(plan):
+            athlete = row[0]
+            if grouped and athlete != current:
+                if current is not None:
+                    yield from self._close_athlete(current, seen[current], dtstamp, result)
+                if athlete in seen:
+                    raise ValueError(f"Linhas do atleta {athlete!r} não estão agrupadas.")
+                current = athlete
+            uid = event_uid(athlete, row[1], row[2])
+            seen.setdefault(athlete, set()).add(uid)
+            digest = self._digest(row)
+            previous = self._events.get(uid)
+            if previous is not None and previous[0] == digest:
+                if only_changed:
+                    continue
+                _, sequence, stamp = previous
+            else:
+                sequence = previous[1] + 1 if previous is not None else 0
+                stamp = dtstamp
+                self._events[uid] = (digest, sequence, stamp)
+                result.changed.append(uid)
+            result.events += 1
+            yield athlete, self._render_event(uid, row, sequence, stamp)
+        if grouped:
+            pending = [current] if current is not None else []
+        else:
+            pending = list(seen)
+        pending.extend(a for a in dict.fromkeys(athletes) if a not in seen)
+        for athlete in pending:
+            yield from self._close_athlete(athlete, seen.get(athlete, set()), dtstamp, result)
+
+    def _header(self, name: Optional[str]) -> str:
+        lines = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{self.prodid}", "CALSCALE:GREGORIAN"]
+        if name:
+            lines.append(f"X-WR-CALNAME:{_escape(name)}")
+        return "".join(_fold(line) for line in lines)
+
+    def write(
+        self,
+        plan: PlanRows,
+        out: TextIO,
+        calendar_name: Optional[str] = None,
+        only_changed: bool = False,
+        athletes: Iterable[str] = (),
+    ) -> IcsExportResult:
+        """Escreve um único VCALENDAR com as sessões (ou só as mudanças) em ``out``."""
+        result = IcsExportResult()
+        writer = _ChunkedWriter(out, self.chunk_size)
+        writer.write(self._header(calendar_name))
+        for _, text in self.iter_events(plan, result, only_changed, athletes):
+            writer.write(text)
+        writer.write("END:VCALENDAR\r\n")
+        writer.flush()
+        return result
+
+    def write_per_athlete(
+        self, plan: PlanRows, dest_dir: Union[str, Path], athletes: Iterable[str] = ()
+    ) -> IcsExportResult:
+        """
+        Um arquivo ``<athlete_key(atleta)>.ics`` por atleta em ``dest_dir``.
+
+        As linhas de cada atleta devem vir agrupadas (como na concatenação de
+        ``workouts_to_dataframe`` por atleta); só um arquivo fica aberto por vez. Um atleta
+        de ``athletes`` sem linhas recebe um arquivo só com os cancelamentos.
+        """
+        dest = Path(dest_dir)
+        dest.mkdir(parents=True, exist_ok=True)
+        result = IcsExportResult()
+        current: Optional[str] = None
+        fh: Optional[TextIO] = None
+        writer: Optional[_ChunkedWriter] = None
+        paths: Dict[Path, str] = {}
+        try:
+            for athlete, text in self.iter_events(plan, result, athletes=athletes, grouped=True):
+                if athlete != current:
+                    if writer is not None:
+                        writer.write("END:VCALENDAR\r\n")
+                        writer.flush()
+                        fh.close()
+                    current = athlete
+                    path = dest / f"{athlete_key(athlete)}.ics"
+                    other = paths.setdefault(path, athlete)
+                    if other != athlete:
+                        raise ValueError(f"Atletas {other!r} e {athlete!r} gerariam o mesmo arquivo {path.name}.")
+                    fh = open(path, "w", encoding="utf-8", newline="")
+                    writer = _ChunkedWriter(fh, self.chunk_size)
+                    writer.write(self._header(str(athlete)))
+                writer.write(text)
+            if writer is not None:
+                writer.write("END:VCALENDAR\r\n")
+                writer.flush()
+        finally:
+            if fh is not None:
+                fh.close()
+        return result
+
+
+def write_plan_ics(
+    plan: PlanRows,
+    dest: Union[str, Path, TextIO],
+    start_date: StartDate,
+    calendar_name: Optional[str] = None,
+    state_path: Union[str, Path, None] = None,
+    only_changed: bool = False,
+    athletes: Iterable[str] = (),
+) -> IcsExportResult:
+    """
+    Atalho: exporta o plano para um arquivo ``.ics`` (caminho ou stream de texto).
+
+    Com ``state_path``, o estado da exportação anterior é lido desse arquivo (se existir)
+    e o novo estado é gravado nele ao final, então execuções em processos separados
+    mantêm ``SEQUENCE``/``DTSTAMP`` e ``only_changed`` gera deltas reais.
+    """
+    exporter = IcsCalendarExporter(start_date)
+    if state_path is not None and Path(state_path).exists():
+        exporter.load_state(state_path)
+    if isinstance(dest, (str, Path)):
+        with open(dest, "w", encoding="utf-8", newline="") as fh:
+            result = exporter.write(plan, fh, calendar_name, only_changed, athletes)
+    else:
+        result = exporter.write(plan, dest, calendar_name, only_changed, athletes)
+    if state_path is not None:
+        exporter.save_state(state_path)
+    return result
@@ -0,0 +1,183 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .sessions import SessionTemplate, ZoneCode
+from .plan import flatten_session_library
+
+
+class SessionLibraryIndex:
+    """
+    Índice sobre a biblioteca de sessões.
+
+    Mantém a tabela plana de templates (mesma ordem de ``flatten_session_library``),
+    índices invertidos por fase, zona principal, combinação exata de zonas e tag, e
+    listas ordenadas por ``base_distance_km`` (global e por fase). As consultas fazem
+    busca binária no intervalo de distância e devolvem posições na tabela.
+
+    O índice é um retrato da biblioteca no momento da construção: todas as tabelas acima
+    são montadas no ``__init__`` e não acompanham edições in-place nos templates
+    (reconstrua o índice depois de editá-los). ``version`` e ``positions_of`` dependem do
+    conteúdo dos templates e recalculam os hashes a cada chamada.
+    """
+
+    def __init__(self, session_lib: Dict[str, List[SessionTemplate]]):
+        self.session_lib = session_lib
+        self.templates, self.phase_offset = flatten_session_library(session_lib)
+        self.by_phase: Dict[str, List[int]] = {}
+        self.by_zone: Dict[str, Set[int]] = {}
+        self.by_zone_signature: Dict[Tuple[str, ...], List[int]] = {}
+        self.by_tag: Dict[str, Set[int]] = {}
+        for pos, tpl in enumerate(self.templates):
+            self.by_phase.setdefault(tpl.phase, []).append(pos)
+            for z in tpl.main_zones:
+                self.by_zone.setdefault(z, set()).add(pos)
+            self.by_zone_signature.setdefault(tuple(tpl.main_zones), []).append(pos)
+            for tag in tpl.tags:
+                self.by_tag.setdefault(tag, set()).add(pos)
+        self._sorted: Dict[Optional[str], Tuple[List[float], List[int]]] = {
+            None: self._sorted_by_distance(range(len(self.templates)))
+        }
+        for phase, positions in self.by_phase.items():
+            self._sorted[phase] = self._sorted_by_distance(positions)
+        self._bucket_cache: Dict[Tuple[Tuple[int, ...], float], List[Tuple[int, List[int]]]] = {}
+        self._variants = self._build_variant_table()
+        # ``SessionTemplate.is_quality`` de cada posição da tabela
+        self.quality_mask = np.array([tpl.is_quality for tpl in self.templates], dtype=bool)
+
+    def _sorted_by_distance(self, positions: Iterable[int]) -> Tuple[List[float], List[int]]:
+        order = sorted(positions, key=lambda p: (self.templates[p].base_distance_km, p))
+        return [self.templates[p].base_distance_km for p in order], order
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    @property
+    def version(self) -> str:
+        """Hash de conteúdo da biblioteca indexada (ver ``hashing.library_hash``), recalculado a cada acesso."""
+        from .hashing import library_hash
+
+        return library_hash(self.session_lib)
+
+    def query(
+        self,
+        phase: Optional[str] = None,
+        zone: Optional[ZoneCode] = None,
+        main_zones: Optional[Sequence[ZoneCode]] = None,
+        tags: Optional[Sequence[str]] = None,
+        min_km: Optional[float] = None,
+        max_km: Optional[float] = None,
+    ) -> List[int]:
+        """
+        Posições dos templates que atendem a todos os filtros, ordenadas por distância-base.
+
+        ``zone`` exige a zona entre as principais; ``main_zones`` exige a combinação exata;
+        ``tags`` exige todas as tags; ``min_km``/``max_km`` delimitam ``base_distance_km``
+        (inclusivo).
+        """
+        if phase is not None and phase not in self._sorted:
+            return []
+        distances, order = self._sorted[phase]
+        lo = 0 if min_km is None else bisect_left(distances, min_km)
+        hi = len(order) if max_km is None else bisect_right(distances, max_km)
+        candidates = order[lo:hi]
+        filters: List[Set[int]] = []
+        if zone is not None:
+            filters.append(self.by_zone.get(zone, set()))
+        if main_zones is not None:
+            filters.append(set(self.by_zone_signature.get(tuple(main_zones), ())))
+        for tag in tags or ():
+            filters.append(self.by_tag.get(tag, set()))
+        if not filters:
+            return candidates
+        return [p for p in candidates if all(p in f for f in filters)]
+
+    def nearest(self, phase: Optional[str], target_km: float) -> Optional[int]:
+        """Posição do template (da fase) com distância-base mais próxima de ``target_km``."""
+        if phase not in self._sorted:
+            return None
+        distances, order = self._sorted[phase]
+        if not order:
+            return None
+        i = bisect_left(distances, target_km)
+        if i == len(order):
+            return order[-1]
+        if i > 0 and target_km - distances[i - 1] <= distances[i] - target_km:
+            return order[i - 1]
+        return order[i]
+
+    def distance_buckets(self, positions: Sequence[int], bucket_km: float) -> List[Tuple[int, List[int]]]:
+        """
+        Agrupa ``positions`` em faixas de ``bucket_km`` pela distância-base.
+
+        Retorna ``[(bucket, [posições em ordem de biblioteca]), ...]`` ordenado por bucket,
+        onde a distância representativa do bucket é ``bucket * bucket_km``.
+        """
+        key = (tuple(positions), bucket_km)
+        groups = self._bucket_cache.get(key)
+        if groups is None:
+            by_bucket: Dict[int, List[int]] = {}
+            for p in positions:
+                by_bucket.setdefault(round(self.templates[p].base_distance_km / bucket_km), []).append(p)
+            groups = sorted(by_bucket.items())
+            self._bucket_cache[key] = groups
+        return groups
+
+    def _build_variant_table(self) -> Tuple[np.ndarray, List[Tuple[np.ndarray, np.ndarray]]]:
+        """Grupo (fase, zonas principais) de cada posição e os membros de cada grupo por distância."""
+        group_of: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+        group = np.empty(len(self.templates), dtype=np.intp)
+        for pos, tpl in enumerate(self.templates):
+            group[pos] = group_of.setdefault((tpl.phase, tuple(tpl.main_zones)), len(group_of))
+        members = []
+        for g in range(len(group_of)):
+            distances, order = self._sorted_by_distance(np.flatnonzero(group == g).tolist())
+            members.append((np.array(distances, dtype=np.float64), np.array(order, dtype=np.intp)))
+        return group, members
+
+    def nearest_variants(self, positions: Sequence[int], target_km: Sequence[float]) -> np.ndarray:
+        """
+        Para cada posição, o template da mesma fase e mesma combinação de zonas com
+        distância-base mais próxima de ``target_km`` (vetorizado, uma busca binária por grupo).
+
+        Empates ficam com o mais curto, como em ``nearest``.
+        """
+        positions = np.asarray(positions, dtype=np.intp)
+        target = np.broadcast_to(np.asarray(target_km, dtype=np.float64), positions.shape)
+        group, members = self._variants
+        out = positions.copy()
+        slot_group = group[positions]
+        for g in np.unique(slot_group):
+            rows = np.flatnonzero(slot_group == g)
+            distances, order = members[g]
+            t = target[rows]
+            hi = np.minimum(np.searchsorted(distances, t), len(order) - 1)
+            lo = np.maximum(hi - 1, 0)
+            take_lo = np.abs(t - distances[lo]) <= np.abs(distances[hi] - t)
+            out[rows] = order[np.where(take_lo, lo, hi)]
+        return out
+
+    def positions_of(self, templates: Sequence[SessionTemplate]) -> np.ndarray:
+        """
+        Posição no índice de cada template, comparando pelo conteúdo (``content_hash``).
+
+        Serve para tabelas que não são ``self.templates`` (planos desserializados, vindos de
+        outro processo ou concatenados). Os hashes são recalculados a cada chamada. Levanta
+        ``ValueError`` se algum não estiver no índice.
+        """
+        if templates is self.templates:
+            return np.arange(len(self.templates), dtype=np.intp)
+        by_hash: Dict[str, int] = {}
+        for pos, tpl in enumerate(self.templates):
+            by_hash.setdefault(tpl.content_hash, pos)
+        out = np.empty(len(templates), dtype=np.intp)
+        for i, tpl in enumerate(templates):
+            pos = by_hash.get(tpl.content_hash)
+            if pos is None:
+                raise ValueError(f"Template {tpl.code!r} não existe na biblioteca indexada.")
+            out[i] = pos
+        return out
+
+    def get(self, positions: Iterable[int]) -> List[SessionTemplate]:
+        return [self.templates[p] for p in positions]
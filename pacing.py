@@ -1,22 +1,55 @@
 
-from typing import Dict, Any, List
-import pandas as pd
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Any, List, Mapping, Sequence, Union
 from .sessions import ContinuousSegment, IntervalBlock, SessionTemplate, Workout
 from .athlete import AthleteConfig
+from .plan import WeeklyPlan
+from .zones import pace_code, pace_str
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+ZonesInput = Union["pd.DataFrame", Sequence[Mapping[str, Any]]]
+
+PLAN_COLUMNS = [
+    "athlete", "week", "day_of_week", "weekday", "phase",
+    "session_code", "session_name", "main_zones", "is_quality",
+    "planned_distance_km", "description",
+]
+
+
+def _zone_records(zones: ZonesInput) -> List[Mapping[str, Any]]:
+    if hasattr(zones, "to_dict"):
+        return zones.to_dict("records")
+    return list(zones)
 
 
 class WorkoutPaceAnnotator:
-    def __init__(self, zones_df: pd.DataFrame):
-        self.zones_df = zones_df.set_index("zone")
+    """
+    Anota ritmos nos segmentos a partir das zonas de ``DanielsZones``.
+
+    Aceita o DataFrame de ``build_dataframe`` ou os registros de ``build_records``.
+    """
+
+    def __init__(self, zones_df: ZonesInput):
+        self.zone_paces: Dict[str, Dict[str, Any]] = {}
+        for row in _zone_records(zones_df):
+            slow_code = row.get("pace_slow_code", pace_code(row["pace_slow_min_km_raw"]))
+            fast_code = row.get("pace_fast_code", pace_code(row["pace_fast_min_km_raw"]))
+            self.zone_paces[row["zone"]] = {
+                "slow_raw": row["pace_slow_min_km_raw"],
+                "fast_raw": row["pace_fast_min_km_raw"],
+                "slow_code": int(slow_code),
+                "fast_code": int(fast_code),
+                # strings internadas: todos os segmentos apontam para o mesmo objeto
+                "slow_str": pace_str(int(slow_code)),
+                "fast_str": pace_str(int(fast_code)),
+            }
 
     def _get_zone_paces(self, zone: str) -> Dict[str, Any]:
-        row = self.zones_df.loc[zone]
-        return {
-            "slow_raw": row["pace_slow_min_km_raw"],
-            "fast_raw": row["pace_fast_min_km_raw"],
-            "slow_str": row["pace_slow_min_km_str"],
-            "fast_str": row["pace_fast_min_km_str"],
-        }
+        return self.zone_paces[zone]
 
     def annotate_continuous(self, seg: ContinuousSegment) -> ContinuousSegment:
         p = self._get_zone_paces(seg.zone)
@@ -24,6 +57,8 @@ class WorkoutPaceAnnotator:
         seg.pace_fast_min_km = p["fast_raw"]
         seg.pace_slow_str = p["slow_str"]
         seg.pace_fast_str = p["fast_str"]
+        seg.pace_slow_code = p["slow_code"]
+        seg.pace_fast_code = p["fast_code"]
         return seg
 
     def annotate_interval_block(self, block: IntervalBlock) -> IntervalBlock:
@@ -32,11 +67,15 @@ class WorkoutPaceAnnotator:
         block.work_pace_fast_min_km = p_work["fast_raw"]
         block.work_pace_slow_str = p_work["slow_str"]
         block.work_pace_fast_str = p_work["fast_str"]
+        block.work_pace_slow_code = p_work["slow_code"]
+        block.work_pace_fast_code = p_work["fast_code"]
         p_rec = self._get_zone_paces(block.recovery_zone)
         block.rec_pace_slow_min_km = p_rec["slow_raw"]
         block.rec_pace_fast_min_km = p_rec["fast_raw"]
         block.rec_pace_slow_str = p_rec["slow_str"]
         block.rec_pace_fast_str = p_rec["fast_str"]
+        block.rec_pace_slow_code = p_rec["slow_code"]
+        block.rec_pace_fast_code = p_rec["fast_code"]
         return block
 
     def annotate_session(self, template: SessionTemplate) -> SessionTemplate:
@@ -53,6 +92,63 @@ class WorkoutPaceAnnotator:
                 self.annotate_continuous(seg)
         return template
 
+    def structure_session(self, template: SessionTemplate) -> List[Dict[str, Any]]:
+        """Segmentos anotados como dicts (zona, ritmos, reps, distâncias), na ordem da sessão."""
+        def continuous(seg: ContinuousSegment, part: str) -> Dict[str, Any]:
+            return {
+                "part": part,
+                "type": "continuous",
+                "zone": seg.zone,
+                "distance_km": seg.distance_km,
+                "duration_min": seg.duration_min,
+                "pace_slow_min_km": seg.pace_slow_min_km,
+                "pace_fast_min_km": seg.pace_fast_min_km,
+                "pace_slow": seg.pace_slow_str,
+                "pace_fast": seg.pace_fast_str,
+                "pace_slow_code": seg.pace_slow_code,
+                "pace_fast_code": seg.pace_fast_code,
+                "description": seg.description,
+            }
+
+        def interval(block: IntervalBlock, part: str) -> Dict[str, Any]:
+            return {
+                "part": part,
+                "type": "interval",
+                "reps": block.reps,
+                "work": {
+                    "zone": block.work_zone,
+                    "distance_m": block.work_distance_m,
+                    "duration_min": block.work_duration_min,
+                    "pace_slow_min_km": block.work_pace_slow_min_km,
+                    "pace_fast_min_km": block.work_pace_fast_min_km,
+                    "pace_slow": block.work_pace_slow_str,
+                    "pace_fast": block.work_pace_fast_str,
+                    "pace_slow_code": block.work_pace_slow_code,
+                    "pace_fast_code": block.work_pace_fast_code,
+                },
+                "recovery": {
+                    "zone": block.recovery_zone,
+                    "distance_m": block.recovery_distance_m,
+                    "duration_min": block.recovery_duration_min,
+                    "pace_slow_min_km": block.rec_pace_slow_min_km,
+                    "pace_fast_min_km": block.rec_pace_fast_min_km,
+                    "pace_slow": block.rec_pace_slow_str,
+                    "pace_fast": block.rec_pace_fast_str,
+                    "pace_slow_code": block.rec_pace_slow_code,
+                    "pace_fast_code": block.rec_pace_fast_code,
+                },
+                "description": block.description,
+            }
+
+        segments = []
+        for part in ("warmup", "main", "cooldown"):
+            for item in getattr(template, part):
+                if isinstance(item, ContinuousSegment):
+                    segments.append(continuous(item, part))
+                elif isinstance(item, IntervalBlock):
+                    segments.append(interval(item, part))
+        return segments
+
     def describe_session(self, template: SessionTemplate) -> str:
         def format_continuous(seg: ContinuousSegment) -> str:
             base = (
@@ -111,40 +207,55 @@ def weekday_name_from_int(d: int) -> str:
     return mapping.get(d, f"Dia{d}")
 
 
-def weekly_plan_to_workouts(weekly_plan_with_vol: List[dict], athlete: AthleteConfig, zones_df: pd.DataFrame) -> List[Workout]:
-    annotator = WorkoutPaceAnnotator(zones_df)
-    workouts: List[Workout] = []
+def _iter_plan_sessions(weekly_plan_with_vol: Union[WeeklyPlan, List[dict]]):
+    if isinstance(weekly_plan_with_vol, WeeklyPlan):
+        yield from weekly_plan_with_vol.iter_sessions()
+        return
     for week_data in weekly_plan_with_vol:
-        week = week_data["week"]
-        phase = week_data["phase"]
         for s in week_data["sessions"]:
-            day = s["day_of_week"]
-            tpl = s["template"]
-            planned_dist = s["planned_distance_km"]
+            yield week_data["week"], week_data["phase"], s["day_of_week"], s["template"], s["planned_distance_km"]
+
+
+def _make_workout(
+    athlete: AthleteConfig, week: int, phase: str, day: int, tpl: SessionTemplate,
+    planned_dist: float, desc: str, segments: List[Dict[str, Any]],
+) -> Workout:
+    return Workout(
+        athlete_name=athlete.name,
+        week=week,
+        day_of_week=day,
+        weekday_name=weekday_name_from_int(day),
+        phase=phase,
+        session_code=tpl.code,
+        session_name=tpl.name,
+        main_zones=tpl.main_zones,
+        is_quality=tpl.is_quality,
+        planned_distance_km=planned_dist,
+        description=desc,
+        segments=segments,
+    )
+
+
+def weekly_plan_to_workouts(
+    weekly_plan_with_vol: Union[WeeklyPlan, List[dict]], athlete: AthleteConfig, zones_df: ZonesInput
+) -> List[Workout]:
+    annotator = WorkoutPaceAnnotator(zones_df)
+    workouts: List[Workout] = []
+    # descrição e segmentos só dependem do template e das zonas: calcula uma vez por template
+    rendered: Dict[int, tuple] = {}
+    for week, phase, day, tpl, planned_dist in _iter_plan_sessions(weekly_plan_with_vol):
+        cached = rendered.get(id(tpl))
+        if cached is None:
             annotator.annotate_session(tpl)
-            desc = annotator.describe_session(tpl)
-            is_quality = any(z in ("T", "I", "R") for z in tpl.main_zones)
-            weekday_name = weekday_name_from_int(day)
-            w = Workout(
-                athlete_name=athlete.name,
-                week=week,
-                day_of_week=day,
-                weekday_name=weekday_name,
-                phase=phase,
-                session_code=tpl.code,
-                session_name=tpl.name,
-                main_zones=tpl.main_zones,
-                is_quality=is_quality,
-                planned_distance_km=planned_dist,
-                description=desc,
-            )
-            workouts.append(w)
+            cached = rendered[id(tpl)] = (annotator.describe_session(tpl), annotator.structure_session(tpl))
+        workouts.append(_make_workout(athlete, week, phase, day, tpl, planned_dist, *cached))
     return workouts
 
 
-def workouts_to_dataframe(workouts: List[Workout]) -> pd.DataFrame:
+def workouts_to_records(workouts: List[Workout]) -> List[Dict[str, Any]]:
+    """Linhas do plano como dicts simples (colunas de ``PLAN_COLUMNS``), ordenadas por semana/dia."""
     rows = []
-    for w in workouts:
+    for w in sorted(workouts, key=lambda w: (w.week, w.day_of_week)):
         rows.append({
             "athlete": w.athlete_name,
             "week": w.week,
@@ -158,52 +269,40 @@ def workouts_to_dataframe(workouts: List[Workout]) -> pd.DataFrame:
             "planned_distance_km": w.planned_distance_km,
             "description": w.description,
         })
-    df = pd.DataFrame(rows)
-    df = df.sort_values(["week", "day_of_week"]).reset_index(drop=True)
-    cols = [
-        "athlete", "week", "day_of_week", "weekday", "phase",
-        "session_code", "session_name", "main_zones", "is_quality",
-        "planned_distance_km", "description",
-    ]
-    return df[cols]
+    return rows
 
 
-def format_plan_for_console(plan_df: pd.DataFrame) -> str:
-    """Formata um DataFrame de plano semanal em blocos legíveis no console."""
+def workouts_to_structured_array(workouts: List[Workout]) -> np.ndarray:
+    """Linhas do plano como array estruturado do NumPy (strings com largura fixa)."""
+    import numpy as np
 
-    if plan_df.empty:
-        return "Nenhuma sessão encontrada para o período informado."
+    rows = workouts_to_records(workouts)
+    str_cols = ("athlete", "weekday", "phase", "session_code", "session_name", "main_zones", "description")
+    dtype = []
+    for col in PLAN_COLUMNS:
+        if col in str_cols:
+            width = max((len(r[col]) for r in rows), default=1)
+            dtype.append((col, f"U{max(width, 1)}"))
+        elif col == "is_quality":
+            dtype.append((col, "?"))
+        elif col == "planned_distance_km":
+            dtype.append((col, "f8"))
+        else:
+            dtype.append((col, "i4"))
+    return np.array([tuple(r[c] for c in PLAN_COLUMNS) for r in rows], dtype=dtype)
 
-    lines: List[str] = []
-    last_phase: str | None = None
-    sorted_plan = plan_df.sort_values(["week", "day_of_week"])
 
-    for week, week_df in sorted_plan.groupby("week"):
-        phases = week_df["phase"].unique()
-        phase_label = "/".join(phases)
+def workouts_to_dataframe(workouts: List[Workout]) -> pd.DataFrame:
+    import pandas as pd
 
-        if phase_label != last_phase:
-            if last_phase is not None:
-                lines.append("")
-            lines.append(f"🏁 Fase: {phase_label}")
-            last_phase = phase_label
+    return pd.DataFrame(workouts_to_records(workouts), columns=PLAN_COLUMNS)
 
-        lines.append(f"📅 Semana {week}")
 
-        for _, row in week_df.sort_values("day_of_week").iterrows():
-            flag = "🔥" if row["is_quality"] else "🌿"
-            dist = f"{row['planned_distance_km']:.1f} km"
-            lines.append(
-                f"  {flag} {row['weekday']}: {row['session_name']} ({row['session_code']})"
-            )
-            lines.append(
-                f"     → Zonas {row['main_zones']} · Distância alvo: {dist}"
-            )
-            for desc_line in str(row["description"]).splitlines():
-                lines.append(f"     ↳ {desc_line}")
+def format_plan_for_console(plan_df: pd.DataFrame) -> str:
+    """Formata um DataFrame de plano semanal em blocos legíveis no console."""
+    from .render import render_plan_console_to_string
 
-    lines.append("")
-    return "\n".join(lines)
+    return render_plan_console_to_string(plan_df)
 
 
 def format_plan_as_table(plan_df: pd.DataFrame, columns: List[str] | None = None) -> str:
@@ -221,10 +320,13 @@ def format_plan_as_table(plan_df: pd.DataFrame, columns: List[str] | None = None
     if plan_df.empty:
         return "Nenhuma sessão encontrada para o período informado."
 
+    import pandas as pd
+
     cols = columns if columns is not None else list(plan_df.columns)
 
     # Evita que quebras de linha no texto da descrição baguncem a tabela, mas mantém o conteúdo.
-    df_clean = plan_df.copy()
+    # Copia só as colunas exibidas.
+    df_clean = plan_df[cols].copy()
     if "description" in df_clean.columns:
         df_clean["description"] = df_clean["description"].astype(str).str.replace("\n", " | ")
 
@@ -233,7 +335,7 @@ def format_plan_as_table(plan_df: pd.DataFrame, columns: List[str] | None = None
         # fixo de caracteres, o que poderia cortar visualmente a coluna de
         # descrição em terminais estreitos. ``max_colwidth=None`` garante que
         # o texto não seja truncado com reticências.
-        return df_clean[cols].to_string(index=False, line_width=None, max_colwidth=None)
+        return df_clean.to_string(index=False, line_width=None, max_colwidth=None)
 
 
 def print_plan(plan_df: pd.DataFrame) -> None:
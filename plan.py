@@ -0,0 +1,183 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Iterator, Optional, Tuple
+import numpy as np
+
+from .sessions import SessionTemplate
+
+
+def flatten_session_library(session_lib: Dict[str, List[SessionTemplate]]) -> Tuple[List[SessionTemplate], Dict[str, int]]:
+    """Achata a biblioteca em uma tabela única e devolve o offset de cada fase."""
+    templates: List[SessionTemplate] = []
+    phase_offset: Dict[str, int] = {}
+    for phase, phase_templates in session_lib.items():
+        phase_offset[phase] = len(templates)
+        templates.extend(phase_templates)
+    return templates, phase_offset
+
+
+@dataclass
+class WeeklyPlan:
+    """
+    Plano semanal compacto: um slot por sessão em arrays planos, com offsets por semana.
+
+    A semana ``w`` (0-based) ocupa os slots ``week_offsets[w]:week_offsets[w + 1]``.
+    ``template_idx`` aponta para ``templates``; ``planned_distance_km`` é preenchido
+    in-place por ``WeeklyVolumePlanner.apply_volume_to_plan``. ``first_week`` é o número
+    (1-based) da primeira semana, diferente de 1 quando o plano é um trecho de outro.
+    """
+
+    templates: List[SessionTemplate]
+    phases: List[str]
+    week_offsets: np.ndarray
+    day_of_week: np.ndarray
+    template_idx: np.ndarray
+    planned_distance_km: np.ndarray
+    first_week: int = 1
+    _template_base_km: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_slots(
+        cls,
+        templates: List[SessionTemplate],
+        phases: List[str],
+        sessions_per_week: List[int],
+        days: List[int],
+        template_idx: List[int],
+        first_week: int = 1,
+    ) -> "WeeklyPlan":
+        offsets = np.zeros(len(phases) + 1, dtype=np.int64)
+        np.cumsum(sessions_per_week, out=offsets[1:])
+        tidx = np.asarray(template_idx, dtype=np.int32)
+        plan = cls(
+            templates=templates,
+            phases=list(phases),
+            week_offsets=offsets,
+            day_of_week=np.asarray(days, dtype=np.int8),
+            template_idx=tidx,
+            planned_distance_km=np.empty(len(tidx), dtype=np.float64),
+            first_week=first_week,
+        )
+        plan.planned_distance_km[:] = plan.base_distance_km()
+        return plan
+
+    @classmethod
+    def from_dicts(cls, weekly_plan: List[Dict]) -> "WeeklyPlan":
+        templates: List[SessionTemplate] = []
+        positions: Dict[int, int] = {}
+        phases, counts, days, tidx, planned = [], [], [], [], []
+        for week_data in weekly_plan:
+            phases.append(week_data["phase"])
+            counts.append(len(week_data["sessions"]))
+            for s in week_data["sessions"]:
+                tpl = s["template"]
+                pos = positions.get(id(tpl))
+                if pos is None:
+                    pos = positions[id(tpl)] = len(templates)
+                    templates.append(tpl)
+                days.append(s["day_of_week"])
+                tidx.append(pos)
+                planned.append(s.get("planned_distance_km", tpl.base_distance_km))
+        plan = cls.from_slots(templates, phases, counts, days, tidx)
+        plan.planned_distance_km[:] = planned
+        return plan
+
+    @classmethod
+    def concat(cls, parts: List["WeeklyPlan"]) -> "WeeklyPlan":
+        """
+        Junta trechos consecutivos de um plano (ex.: gerados em processos diferentes).
+
+        As tabelas ``templates`` são comparadas pelo conteúdo (``SessionTemplate.content_hash``),
+        não pela identidade: trechos desserializados ou vindos de outro processo são aceitos,
+        e o ``template_idx`` deles é remapeado para a tabela do primeiro trecho. Templates
+        que não existem nela são acrescentados ao final da tabela resultante.
+        """
+        if not parts:
+            raise ValueError("Nenhum trecho de plano para concatenar.")
+        first = parts[0]
+        expected = first.first_week
+        for part in parts:
+            if part.first_week != expected:
+                raise ValueError(f"Trecho começa na semana {part.first_week}, esperado {expected}.")
+            expected += part.n_weeks
+        templates = first.templates
+        positions: Optional[Dict[str, int]] = None
+        template_idx = []
+        for part in parts:
+            if part.templates is first.templates:
+                template_idx.append(part.template_idx)
+                continue
+            if positions is None:
+                positions = {}
+                for pos, tpl in enumerate(first.templates):
+                    positions.setdefault(tpl.content_hash, pos)
+            lookup = np.empty(len(part.templates), dtype=np.int64)
+            for i, tpl in enumerate(part.templates):
+                key = tpl.content_hash
+                pos = positions.get(key)
+                if pos is None:
+                    if templates is first.templates:
+                        templates = list(first.templates)
+                    pos = positions[key] = len(templates)
+                    templates.append(tpl)
+                lookup[i] = pos
+            template_idx.append(lookup[part.template_idx].astype(part.template_idx.dtype))
+        counts = np.concatenate([np.diff(p.week_offsets) for p in parts])
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return cls(
+            templates=templates,
+            phases=[phase for p in parts for phase in p.phases],
+            week_offsets=offsets,
+            day_of_week=np.concatenate([p.day_of_week for p in parts]),
+            template_idx=np.concatenate(template_idx),
+            planned_distance_km=np.concatenate([p.planned_distance_km for p in parts]),
+            first_week=first.first_week,
+        )
+
+    @property
+    def n_weeks(self) -> int:
+        return len(self.phases)
+
+    @property
+    def n_sessions(self) -> int:
+        return len(self.template_idx)
+
+    def week_slice(self, week_idx: int) -> slice:
+        return slice(int(self.week_offsets[week_idx]), int(self.week_offsets[week_idx + 1]))
+
+    def week_of_slot(self) -> np.ndarray:
+        """Índice (0-based) da semana de cada slot."""
+        return np.repeat(np.arange(self.n_weeks), np.diff(self.week_offsets))
+
+    def base_distance_km(self) -> np.ndarray:
+        """Distância-base do template de cada slot."""
+        if self._template_base_km is None or len(self._template_base_km) != len(self.templates):
+            self._template_base_km = np.array([t.base_distance_km for t in self.templates], dtype=np.float64)
+        return self._template_base_km[self.template_idx]
+
+    def iter_sessions(self) -> Iterator[Tuple[int, str, int, SessionTemplate, float]]:
+        """Itera ``(week, phase, day_of_week, template, planned_distance_km)`` em ordem."""
+        days = self.day_of_week.tolist()
+        tidx = self.template_idx.tolist()
+        planned = self.planned_distance_km.tolist()
+        for w, phase in enumerate(self.phases):
+            for i in range(int(self.week_offsets[w]), int(self.week_offsets[w + 1])):
+                yield self.first_week + w, phase, days[i], self.templates[tidx[i]], planned[i]
+
+    def content_hash(self) -> str:
+        """Hash BLAKE2 estável do plano (ver ``hashing.weekly_plan_hash``)."""
+        from .hashing import weekly_plan_hash
+
+        return weekly_plan_hash(self)
+
+    def to_dicts(self, with_volume: bool = False) -> List[Dict]:
+        """Formato legado (lista de dicts por semana) usado por ``build_weekly_plan``."""
+        plan = []
+        for w, phase in enumerate(self.phases):
+            plan.append({"week": self.first_week + w, "phase": phase, "sessions": []})
+        for week, _, day, tpl, planned in self.iter_sessions():
+            s = {"day_of_week": day, "template": tpl}
+            if with_volume:
+                s["planned_distance_km"] = planned
+            plan[week - self.first_week]["sessions"].append(s)
+        return plan
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from .athlete import AthleteConfig
+from .pacing import WorkoutPaceAnnotator, _iter_plan_sessions, _make_workout
+from .plan import WeeklyPlan
+from .sessions import Workout
+from .zones import zone_records_for_vdots
+
+PlanInput = Union[WeeklyPlan, List[dict]]
+
+
+def vdot_trajectory(
+    base_vdot: float,
+    phase_sequence: Sequence[str],
+    gain_per_phase: Optional[Mapping[str, float]] = None,
+    retests: Optional[Mapping[int, float]] = None,
+    resolution: Optional[float] = None,
+) -> np.ndarray:
+    """
+    VDOT esperado em cada semana do plano (array com uma posição por semana).
+
+    ``gain_per_phase`` é o ganho total de VDOT de cada fase, dividido igualmente entre as
+    semanas dela e contabilizado ao fim de cada semana (a semana 1 usa ``base_vdot``).
+    ``retests`` mapeia semana (1-based) para o VDOT medido: vale a partir dessa semana e os
+    ganhos seguintes somam sobre ele. ``resolution`` arredonda o VDOT (p.ex. ``0.5``), o que
+    faz semanas próximas compartilharem as mesmas zonas.
+    """
+    n = len(phase_sequence)
+    phases = np.asarray(phase_sequence, dtype=object)
+    weekly_gain = np.zeros(n, dtype=np.float64)
+    for phase, gain in (gain_per_phase or {}).items():
+        mask = phases == phase
+        n_phase = int(mask.sum())
+        if n_phase:
+            weekly_gain[mask] = gain / n_phase
+    gained = np.zeros(n, dtype=np.float64)
+    np.cumsum(weekly_gain[:-1], out=gained[1:])
+    trajectory = base_vdot + gained
+    for week in sorted(retests or {}):
+        if not 1 <= week <= n:
+            raise ValueError(f"Semana de reteste fora do plano: {week} (1..{n}).")
+        i = week - 1
+        trajectory[i:] = retests[week] + (gained[i:] - gained[i])
+    if resolution is not None:
+        if resolution <= 0:
+            raise ValueError("resolution deve ser positiva.")
+        trajectory = np.round(trajectory / resolution) * resolution
+    if np.any(trajectory <= 0):
+        raise ValueError("Trajetória de VDOT com valores não positivos.")
+    return trajectory
+
+
+def _week_numbers(plan: PlanInput) -> List[int]:
+    if isinstance(plan, WeeklyPlan):
+        return list(range(plan.first_week, plan.first_week + plan.n_weeks))
+    return [week_data["week"] for week_data in plan]
+
+
+def weekly_plan_to_workouts_progressive(
+    plan: PlanInput,
+    athlete: AthleteConfig,
+    vdot_by_week: Union[Sequence[float], np.ndarray],
+    weeks: Optional[Iterable[int]] = None,
+) -> List[Workout]:
+    """
+    Como ``weekly_plan_to_workouts``, mas com um VDOT por semana (ex.: ``vdot_trajectory``).
+
+    As zonas de todos os VDOTs distintos saem de uma única ``zone_pace_table`` e cada
+    template é anotado uma vez por VDOT distinto; semanas com o mesmo VDOT compartilham
+    descrição e segmentos. ``weeks`` (números 1-based) limita a geração a essas semanas.
+    """
+    numbers = _week_numbers(plan)
+    vdots = np.asarray(vdot_by_week, dtype=np.float64)
+    if vdots.shape != (len(numbers),):
+        raise ValueError(f"vdot_by_week deve ter uma posição por semana ({len(numbers)}).")
+    unique, inverse = np.unique(vdots, return_inverse=True)
+    zone_set = dict(zip(numbers, inverse.tolist()))
+    wanted = set(weeks) if weeks is not None else None
+    if wanted is not None:
+        unique_needed = sorted({zone_set[w] for w in wanted if w in zone_set})
+    else:
+        unique_needed = sorted(set(zone_set.values()))
+    records = zone_records_for_vdots(unique[unique_needed])
+    annotators = {u: WorkoutPaceAnnotator(r) for u, r in zip(unique_needed, records)}
+
+    workouts: List[Workout] = []
+    rendered: Dict[tuple, tuple] = {}
+    for week, phase, day, tpl, planned_dist in _iter_plan_sessions(plan):
+        if wanted is not None and week not in wanted:
+            continue
+        u = zone_set[week]
+        cached = rendered.get((u, id(tpl)))
+        if cached is None:
+            annotator = annotators[u]
+            annotator.annotate_session(tpl)
+            cached = rendered[(u, id(tpl))] = (annotator.describe_session(tpl), annotator.structure_session(tpl))
+        workouts.append(_make_workout(athlete, week, phase, day, tpl, planned_dist, *cached))
+    return workouts
+
+
+def update_workouts_vdot(
+    workouts: List[Workout],
+    plan: PlanInput,
+    athlete: AthleteConfig,
+    old_vdot_by_week: Union[Sequence[float], np.ndarray],
+    new_vdot_by_week: Union[Sequence[float], np.ndarray],
+) -> List[Workout]:
+    """
+    Atualiza os workouts para uma nova trajetória de VDOT (ex.: após um reteste).
+
+    Só as semanas cujo VDOT mudou são reanotadas; os demais ``Workout`` são reaproveitados
+    como estão. Retorna a lista nova, na mesma ordem de ``weekly_plan_to_workouts``.
+    """
+    numbers = np.asarray(_week_numbers(plan))
+    old = np.asarray(old_vdot_by_week, dtype=np.float64)
+    new = np.asarray(new_vdot_by_week, dtype=np.float64)
+    if old.shape != new.shape or old.shape != numbers.shape:
+        raise ValueError(f"Trajetórias devem ter uma posição por semana ({len(numbers)}).")
+    changed = set(numbers[old != new].tolist())
+    if not changed:
+        return list(workouts)
+    fresh = iter(weekly_plan_to_workouts_progressive(plan, athlete, new, weeks=changed))
+    return [next(fresh) if w.week in changed else w for w in workouts]
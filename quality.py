@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from typing import List, Sequence, Union
+
+import numpy as np
+
+from .library import SessionLibraryIndex
+from .plan import WeeklyPlan
+
+
+def apply_quality_bias(
+    plans: Union[WeeklyPlan, Sequence[WeeklyPlan]],
+    quality_bias: Union[float, Sequence[float]],
+    from_week_exclusive: Union[int, Sequence[int]],
+    index: SessionLibraryIndex,
+    swap_variants: bool = True,
+) -> List[WeeklyPlan]:
+    """
+    Aplica ``FeedbackAdjustment.quality_bias`` às sessões de qualidade das semanas
+    seguintes a ``from_week_exclusive`` (número de semana 1-based, como em
+    ``FeedbackEngine.apply_adjustment_to_targets``).
+
+    Em cada sessão afetada, ``planned_distance_km`` é multiplicado pelo bias e, com
+    ``swap_variants``, o template é trocado pela variante da mesma fase e mesma combinação
+    de zonas cuja distância-base fica mais perto de ``base * bias`` (ex.: ``I_8x800`` →
+    ``I_6x800`` com bias 0.85). ``quality_bias`` e ``from_week_exclusive`` podem ser um
+    valor por plano (um plano por atleta). Todos os slots afetados são resolvidos de uma
+    vez: uma busca por par distinto (template, bias) no índice.
+
+    Os planos são ALTERADOS IN-PLACE (``planned_distance_km`` e ``template_idx``) e a mesma
+    lista é devolvida; use ``copy.deepcopy`` antes para preservar os originais. Um plano
+    cuja tabela de templates não é ``index.templates`` (desserializado, de outro processo,
+    concatenado) é casado com o índice pelo conteúdo dos templates e passa a usar
+    ``index.templates``; templates ausentes do índice levantam ``ValueError``.
+    """
+    plans = [plans] if isinstance(plans, WeeklyPlan) else list(plans)
+    bias = np.broadcast_to(np.asarray(quality_bias, dtype=np.float64), (len(plans),))
+    from_week = np.broadcast_to(np.asarray(from_week_exclusive, dtype=np.int64), (len(plans),))
+    if np.any(bias <= 0):
+        raise ValueError("quality_bias deve ser positivo.")
+    is_quality = index.quality_mask
+
+    slot_rows, slot_bias = [], []
+    for p, plan in enumerate(plans):
+        if plan.templates is not index.templates:
+            lookup = index.positions_of(plan.templates)
+            plan.template_idx = lookup[plan.template_idx].astype(plan.template_idx.dtype)
+            plan.templates = index.templates
+            plan._template_base_km = None
+        week = plan.first_week + plan.week_of_slot()
+        rows = np.flatnonzero((week > from_week[p]) & is_quality[plan.template_idx])
+        if bias[p] != 1.0 and len(rows):
+            plan.planned_distance_km[rows] *= bias[p]
+            slot_rows.append((p, rows))
+            slot_bias.append(np.full(len(rows), bias[p]))
+    if not swap_variants or not slot_rows:
+        return plans
+
+    current = np.concatenate([plans[p].template_idx[rows] for p, rows in slot_rows]).astype(np.intp)
+    biases = np.concatenate(slot_bias)
+    pairs, inverse = np.unique(np.stack([current, biases]), axis=1, return_inverse=True)
+    pair_tpl = pairs[0].astype(np.intp)
+    base = np.array([index.templates[t].base_distance_km for t in pair_tpl], dtype=np.float64)
+    target = base * pairs[1]
+    chosen = index.nearest_variants(pair_tpl, target)
+    chosen_base = np.array([index.templates[t].base_distance_km for t in chosen], dtype=np.float64)
+    # só troca quando a variante fica estritamente mais perto do alvo
+    chosen = np.where(np.abs(chosen_base - target) < np.abs(base - target), chosen, pair_tpl)
+    replacement = chosen[inverse.ravel()]
+
+    start = 0
+    for p, rows in slot_rows:
+        tidx = plans[p].template_idx
+        tidx[rows] = replacement[start:start + len(rows)].astype(tidx.dtype)
+        start += len(rows)
+    return plans
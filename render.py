@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import io
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, TextIO, Tuple, Union
+
+from .pacing import PLAN_COLUMNS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+PlanInput = Union["pd.DataFrame", Sequence[Mapping[str, Any]]]
+
+EMPTY_PLAN_MESSAGE = "Nenhuma sessão encontrada para o período informado."
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+def plan_columns(plan: PlanInput, columns: Sequence[str]) -> Dict[str, List[Any]]:
+    """Extrai as colunas do plano (DataFrame ou registros) como listas Python."""
+    if hasattr(plan, "columns"):
+        return {c: plan[c].tolist() for c in columns if c in plan.columns}
+    if not plan:
+        return {c: [] for c in columns}
+    return {c: [row[c] for row in plan] for c in columns if c in plan[0]}
+
+
+def _row_order(cols: Dict[str, List[Any]], keys: Sequence[str], weeks: Optional[Tuple[int, int]]) -> List[int]:
+    week = cols["week"]
+    n = len(week)
+    rows = range(n)
+    if weeks is not None:
+        start, end = weeks
+        rows = [i for i in rows if start <= week[i] <= end]
+    key_cols = [cols[k] for k in keys]
+    return sorted(rows, key=lambda i: tuple(c[i] for c in key_cols))
+
+
+class _ChunkedWriter:
+    def __init__(self, out: TextIO, chunk_size: int):
+        self.out = out
+        self.chunk_size = chunk_size
+        self.parts: List[str] = []
+        self.size = 0
+
+    def write(self, text: str) -> None:
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.parts:
+            self.out.write("".join(self.parts))
+            self.parts.clear()
+            self.size = 0
+
+
+def render_plan_console(
+    plan: PlanInput,
+    out: TextIO,
+    weeks: Optional[Tuple[int, int]] = None,
+    by_athlete: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> None:
+    """
+    Escreve o plano em blocos legíveis (mesmo formato de ``format_plan_for_console``) em ``out``.
+
+    Trabalha sobre as colunas como listas, reaproveita os fragmentos de texto repetidos
+    (linhas de descrição e de sessão) e grava em blocos de ~``chunk_size`` caracteres.
+    ``weeks=(inicio, fim)`` limita a saída a um intervalo de semanas (inclusivo);
+    ``by_athlete=True`` agrupa por atleta antes das semanas.
+    """
+    cols = plan_columns(plan, PLAN_COLUMNS)
+    if not cols.get("week"):
+        out.write(EMPTY_PLAN_MESSAGE)
+        return
+    keys = ["athlete", "week", "day_of_week"] if by_athlete else ["week", "day_of_week"]
+    order = _row_order(cols, keys, weeks)
+    if not order:
+        out.write(EMPTY_PLAN_MESSAGE)
+        return
+
+    writer = _ChunkedWriter(out, chunk_size)
+    athlete, week, phase = cols["athlete"], cols["week"], cols["phase"]
+    session_frag: Dict[tuple, str] = {}
+    desc_frag: Dict[str, str] = {}
+
+    # agrupa as linhas ordenadas por (atleta, semana)
+    groups: List[Tuple[Any, Any, List[int]]] = []
+    for i in order:
+        group_athlete = athlete[i] if by_athlete else None
+        if groups and groups[-1][0] == group_athlete and groups[-1][1] == week[i]:
+            groups[-1][2].append(i)
+        else:
+            groups.append((group_athlete, week[i], [i]))
+
+    last_athlete: Any = object()
+    last_phase: Optional[str] = None
+    for group_athlete, w, rows in groups:
+        if by_athlete and group_athlete != last_athlete:
+            if last_phase is not None:
+                writer.write("\n")
+            writer.write(f"👤 Atleta: {group_athlete}\n")
+            last_athlete = group_athlete
+            last_phase = None
+        phase_label = "/".join(dict.fromkeys(phase[i] for i in rows))
+        if phase_label != last_phase:
+            if last_phase is not None:
+                writer.write("\n")
+            writer.write(f"🏁 Fase: {phase_label}\n")
+            last_phase = phase_label
+        writer.write(f"📅 Semana {w}\n")
+        for i in rows:
+            key = (
+                cols["is_quality"][i], cols["weekday"][i], cols["session_name"][i],
+                cols["session_code"][i], cols["main_zones"][i],
+            )
+            frag = session_frag.get(key)
+            if frag is None:
+                flag = "🔥" if key[0] else "🌿"
+                frag = session_frag[key] = (
+                    f"  {flag} {key[1]}: {key[2]} ({key[3]})\n     → Zonas {key[4]} · Distância alvo: "
+                )
+            writer.write(f"{frag}{cols['planned_distance_km'][i]:.1f} km\n")
+            desc = cols["description"][i]
+            dfrag = desc_frag.get(desc)
+            if dfrag is None:
+                dfrag = desc_frag[desc] = "".join(f"     ↳ {line}\n" for line in str(desc).splitlines())
+            writer.write(dfrag)
+    writer.flush()
+
+
+def _format_cell(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value).replace("\n", " | ")
+
+
+def render_plan_table(
+    plan: PlanInput,
+    out: TextIO,
+    columns: Optional[Sequence[str]] = None,
+    weeks: Optional[Tuple[int, int]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> None:
+    """
+    Escreve uma tabela de largura fixa, sem truncar a descrição, em ``out``.
+
+    Números ficam alinhados à direita e textos à esquerda; floats com 2 casas.
+    As larguras saem de uma passada sobre as colunas já formatadas.
+    """
+    names = list(columns) if columns is not None else list(PLAN_COLUMNS)
+    cols = plan_columns(plan, list(dict.fromkeys(names + ["week", "day_of_week"])))
+    if not cols.get("week"):
+        out.write(EMPTY_PLAN_MESSAGE)
+        return
+    order = _row_order(cols, ["week", "day_of_week"], weeks)
+    if not order:
+        out.write(EMPTY_PLAN_MESSAGE)
+        return
+    names = [c for c in names if c in cols]
+    cells = {c: [_format_cell(cols[c][i]) for i in order] for c in names}
+    numeric = {c: isinstance(cols[c][order[0]], (int, float)) for c in names}
+    widths = {c: max(len(c), max(len(v) for v in cells[c])) for c in names}
+
+    def line(values: List[str]) -> str:
+        parts = [
+            v.rjust(widths[c]) if numeric[c] else v.ljust(widths[c])
+            for c, v in zip(names, values)
+        ]
+        return " ".join(parts).rstrip() + "\n"
+
+    writer = _ChunkedWriter(out, chunk_size)
+    writer.write(line(names))
+    for r in range(len(order)):
+        writer.write(line([cells[c][r] for c in names]))
+    writer.flush()
+
+
+def render_plan_console_to_string(plan: PlanInput, **kwargs: Any) -> str:
+    buf = io.StringIO()
+    render_plan_console(plan, buf, **kwargs)
+    return buf.getvalue()
@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple
+
+QUALITY_PREFERRED_DAYS = (3, 5, 7, 2, 4, 6, 1)
+ALL_DAYS = (1, 2, 3, 4, 5, 6, 7)
+
+
+@dataclass(frozen=True)
+class SchedulingConstraints:
+    """
+    Restrições de agenda de um atleta.
+
+    ``available_days``: dias (1=Seg … 7=Dom) em que o atleta pode treinar.
+    ``no_back_to_back_quality``: proíbe sessões de qualidade em dias consecutivos
+    (incluindo Dom → Seg quando ``wrap_week`` é verdadeiro).
+    ``long_run_days``: dias aceitos para o longão (sessão easy mais longa da semana);
+    vazio desativa a regra.
+    """
+
+    available_days: Tuple[int, ...] = ALL_DAYS
+    no_back_to_back_quality: bool = True
+    long_run_days: Tuple[int, ...] = (6, 7)
+    wrap_week: bool = True
+
+    def __post_init__(self):
+        for d in tuple(self.available_days) + tuple(self.long_run_days):
+            if d not in ALL_DAYS:
+                raise ValueError(f"SchedulingConstraints: dia inválido {d} (use 1..7).")
+        object.__setattr__(self, "available_days", tuple(sorted(set(self.available_days))))
+        object.__setattr__(self, "long_run_days", tuple(sorted(set(self.long_run_days))))
+
+
+def days_to_mask(days: Iterable[int]) -> int:
+    mask = 0
+    for d in days:
+        mask |= 1 << (d - 1)
+    return mask
+
+
+def mask_to_days(mask: int) -> Tuple[int, ...]:
+    return tuple(d for d in ALL_DAYS if mask >> (d - 1) & 1)
+
+
+def _iter_submasks(mask: int, size: int):
+    sub = mask
+    while True:
+        if bin(sub).count("1") == size:
+            yield sub
+        if sub == 0:
+            return
+        sub = (sub - 1) & mask
+
+
+def _adjacent_pairs(mask: int, wrap: bool) -> int:
+    pairs = bin(mask & (mask >> 1)).count("1")
+    if wrap and mask & 1 and mask >> 6 & 1:
+        pairs += 1
+    return pairs
+
+
+_QUALITY_RANK = {d: r for r, d in enumerate(QUALITY_PREFERRED_DAYS)}
+
+
+@lru_cache(maxsize=None)
+def solve_week_layout(
+    constraints: SchedulingConstraints,
+    preferred_days: Tuple[int, ...],
+    n_quality: int,
+    n_easy: int,
+) -> Tuple[Tuple[int, bool, int], ...]:
+    """
+    Resolve a distribuição de uma semana sob ``constraints``.
+
+    Percorre as máscaras de 7 bits dos dias disponíveis e escolhe a de menor custo,
+    em ordem lexicográfica: qualidade rebaixada para easy, longão fora do fim de semana,
+    desvio dos dias padrão (``preferred_days``), treinos em dias seguidos e preferência
+    de dias de qualidade. Sessões que não cabem nos dias disponíveis são descartadas e
+    sessões de qualidade que violariam o espaçamento viram easy.
+
+    Retorna ``((day_of_week, is_quality, slot), ...)`` ordenado por dia, no mesmo formato
+    do layout padrão do seletor. Quando há regra de longão, o slot easy 0 fica no dia do longão.
+    O resultado é memoizado pela assinatura das restrições.
+    """
+    avail = days_to_mask(constraints.available_days)
+    preferred = days_to_mask(preferred_days)
+    long_mask = days_to_mask(constraints.long_run_days)
+    n_days = min(n_quality + n_easy, bin(avail).count("1"))
+    wrap = constraints.wrap_week
+
+    best_cost: Optional[tuple] = None
+    best: Optional[Tuple[int, int, int]] = None
+    for train in _iter_submasks(avail, n_days):
+        deviation = bin(train & ~preferred).count("1")
+        spread = _adjacent_pairs(train, wrap)
+        for q_count in range(min(n_quality, n_days), -1, -1):
+            found = False
+            for quality in _iter_submasks(train, q_count):
+                if constraints.no_back_to_back_quality and _adjacent_pairs(quality, wrap):
+                    continue
+                easy = train & ~quality
+                long_day = 0
+                if long_mask and easy:
+                    candidates = easy & long_mask
+                    # longão no último dia elegível (Dom antes de Sáb)
+                    long_day = candidates.bit_length() if candidates else 0
+                long_miss = int(bool(long_mask) and bool(easy) and not long_day)
+                rank = sum(_QUALITY_RANK[d] for d in mask_to_days(quality))
+                cost = (n_quality - q_count, long_miss, deviation, spread, rank)
+                if best_cost is None or cost < best_cost:
+                    best_cost, best = cost, (train, quality, long_day)
+                found = True
+            if found:
+                break
+
+    if best is None:
+        return ()
+    train, quality, long_day = best
+    layout = []
+    q_slot = 0
+    e_slot = 1 if long_day else 0
+    for d in mask_to_days(train):
+        if quality >> (d - 1) & 1:
+            layout.append((d, True, q_slot))
+            q_slot += 1
+        elif d == long_day:
+            layout.append((d, False, 0))
+        else:
+            layout.append((d, False, e_slot))
+            e_slot += 1
+    return tuple(layout)
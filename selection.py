@@ -1,16 +1,112 @@
 
-from dataclasses import dataclass
-from typing import List, Dict
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, List, Dict, Optional, Sequence, Tuple
+import math
 from .athlete import AthleteConfig
 from .sessions import SessionTemplate
+from .plan import WeeklyPlan
+from .library import SessionLibraryIndex
+from .scheduling import SchedulingConstraints, solve_week_layout
+
+SELECTION_MODES = ("rotation", "distance")
+
+
+def _reachable_bucket_sums(buckets: Sequence[Tuple[int, int]], n: int) -> Dict[int, Tuple[int, ...]]:
+    """
+    Knapsack com contagem exata: somas (em buckets) alcançáveis escolhendo ``n`` itens.
+
+    ``buckets`` é ``[(valor, capacidade), ...]``; cada bucket pode ser usado até
+    ``capacidade`` vezes. Retorna ``{soma: (índices dos buckets escolhidos)}``,
+    mantendo a primeira combinação encontrada para cada soma.
+    """
+    layers: List[Dict[int, Tuple[int, ...]]] = [{0: ()}] + [{} for _ in range(n)]
+    for g, (value, capacity) in enumerate(buckets):
+        for _ in range(min(capacity, n)):
+            for c in range(n, 0, -1):
+                prev, cur = layers[c - 1], layers[c]
+                for total, choice in prev.items():
+                    key = total + value
+                    if key not in cur:
+                        cur[key] = choice + (g,)
+    return layers[n]
+
+
+@dataclass
+class SelectorState:
+    """
+    Estado explícito do seletor: próxima semana (0-based) e cursores de rotação.
+
+    ``phase_cursor`` é usado no modo ``"rotation"``; ``bucket_cursor`` (chave
+    ``(pool, bucket)``) no modo ``"distance"``. ``to_dict``/``from_dict`` produzem
+    uma forma JSON-serializável para checkpoints.
+    """
+
+    week: int = 0
+    phase_cursor: Dict[str, int] = field(default_factory=dict)
+    bucket_cursor: Dict[Tuple[str, int], int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "week": self.week,
+            "phase_cursor": dict(self.phase_cursor),
+            "bucket_cursor": [[pool, bucket, n] for (pool, bucket), n in sorted(self.bucket_cursor.items())],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SelectorState":
+        return cls(
+            week=int(data.get("week", 0)),
+            phase_cursor={k: int(v) for k, v in data.get("phase_cursor", {}).items()},
+            bucket_cursor={(pool, int(bucket)): int(n) for pool, bucket, n in data.get("bucket_cursor", [])},
+        )
+
 
 @dataclass
 class WeeklySessionSelector:
     athlete: AthleteConfig
     session_lib: Dict[str, List[SessionTemplate]]
+    constraints: Optional[SchedulingConstraints] = None
+    index: Optional[SessionLibraryIndex] = None
+    selection_mode: str = "rotation"
+    distance_bucket_km: float = 0.5
+
+    # (frequency, n_quality, n_easy) -> ((day_of_week, is_quality, slot), ...)
+    _schedule_table: ClassVar[Dict[Tuple[int, int, int], Tuple[Tuple[int, bool, int], ...]]] = {}
 
     def __post_init__(self):
+        if self.selection_mode not in SELECTION_MODES:
+            raise ValueError(f"selection_mode inválido: {self.selection_mode!r} (use {SELECTION_MODES}).")
         self.phase_cursor: Dict[str, int] = {phase: 0 for phase in self.session_lib.keys()}
+        if self.index is None:
+            self.index = SessionLibraryIndex(self.session_lib)
+        self.templates = self.index.templates
+        self._phase_offset = self.index.phase_offset
+        self._easy_positions: List[int] = sorted(
+            self.index.query(phase="Base", main_zones=["E"])
+        ) or list(self.index.by_phase.get("Base", []))
+        self.bucket_cursor: Dict[Tuple[str, int], int] = {}
+        self._sums_cache: Dict[Tuple[str, int], Dict[int, Tuple[int, ...]]] = {}
+        self._groups_cache: Dict[str, List[Tuple[int, List[int]]]] = {}
+        self._shape_cache: Dict[str, tuple] = {}
+        self.week_cursor = 0
+        # ``set_state`` arma a retomada; o próximo ``build_plan`` sem ``start_week`` a consome
+        self._resume_pending = False
+
+    def get_state(self) -> SelectorState:
+        return SelectorState(
+            week=self.week_cursor,
+            phase_cursor=dict(self.phase_cursor),
+            bucket_cursor=dict(self.bucket_cursor),
+        )
+
+    def set_state(self, state: SelectorState) -> None:
+        self.week_cursor = state.week
+        self.phase_cursor = {phase: 0 for phase in self.session_lib.keys()}
+        self.phase_cursor.update(state.phase_cursor)
+        self.bucket_cursor = dict(state.bucket_cursor)
+        self._resume_pending = True
 
     def _num_quality_sessions(self, phase: str) -> int:
         f = self.athlete.frequency_per_week
@@ -48,30 +144,25 @@ class WeeklySessionSelector:
         return [1, 2, 3, 4, 5, 6, 7]
 
     def _pick_quality_templates(self, phase: str, n_quality: int) -> List[SessionTemplate]:
-        templates = self.session_lib.get(phase, [])
-        if not templates or n_quality == 0:
+        return [self.templates[i] for i in self._pick_quality_indices(phase, n_quality)]
+
+    def _pick_quality_indices(self, phase: str, n_quality: int) -> List[int]:
+        n_templates = len(self.session_lib.get(phase, []))
+        if not n_templates or n_quality == 0:
             return []
-        chosen = []
+        offset = self._phase_offset[phase]
         idx = self.phase_cursor[phase]
-        for _ in range(n_quality):
-            t = templates[idx % len(templates)]
-            chosen.append(t)
-            idx += 1
-        self.phase_cursor[phase] = idx
-        return chosen
+        self.phase_cursor[phase] = idx + n_quality
+        return [offset + i % n_templates for i in range(idx, idx + n_quality)]
 
     def _pick_easy_templates(self, n_easy: int) -> List[SessionTemplate]:
-        base_templates = [t for t in self.session_lib["Base"] if t.main_zones == ["E"]]
-        if not base_templates:
-            base_templates = self.session_lib["Base"]
-        chosen = []
+        return [self.templates[i] for i in self._pick_easy_indices(n_easy)]
+
+    def _pick_easy_indices(self, n_easy: int) -> List[int]:
+        pool = self._easy_positions
         idx = self.phase_cursor["Base"]
-        for _ in range(n_easy):
-            t = base_templates[idx % len(base_templates)]
-            chosen.append(t)
-            idx += 1
-        self.phase_cursor["Base"] = idx
-        return chosen
+        self.phase_cursor["Base"] = idx + n_easy
+        return [pool[i % len(pool)] for i in range(idx, idx + n_easy)]
 
     def _schedule_week_days(self, quality_sessions, easy_sessions):
         f = self.athlete.frequency_per_week
@@ -106,17 +197,184 @@ class WeeklySessionSelector:
                 scheduled.append({"day_of_week": d, "template": sess})
         return scheduled
 
-    def build_weekly_plan(self, phase_sequence: List[str]) -> List[Dict]:
-        plan = []
-        week_number = 1
-        for phase in phase_sequence:
+    def _week_layout(self, n_quality: int, n_easy: int) -> Tuple[Tuple[int, bool, int], ...]:
+        """Layout da semana, que só depende da frequência e da contagem de sessões."""
+        key = (self.athlete.frequency_per_week, n_quality, n_easy)
+        layout = self._schedule_table.get(key)
+        if layout is None:
+            quality_slots = [(True, i) for i in range(n_quality)]
+            easy_slots = [(False, i) for i in range(n_easy)]
+            scheduled = self._schedule_week_days(quality_slots, easy_slots)
+            layout = tuple((s["day_of_week"],) + s["template"] for s in scheduled)
+            self._schedule_table[key] = layout
+        return layout
+
+    def _constrained_layout(self, n_quality: int, n_easy: int) -> Tuple[Tuple[int, bool, int], ...]:
+        preferred = tuple(self._training_days_for_frequency(self.athlete.frequency_per_week))
+        return solve_week_layout(self.constraints, preferred, n_quality, n_easy)
+
+    def _groups_for(self, pool: str) -> List[Tuple[int, List[int]]]:
+        groups = self._groups_cache.get(pool)
+        if groups is None:
+            positions = self._easy_positions if pool == "easy" else self.index.by_phase.get(pool, [])
+            groups = self._groups_cache[pool] = self.index.distance_buckets(positions, self.distance_bucket_km)
+        return groups
+
+    def _bucket_sums(self, pool: str, n: int) -> Dict[int, Tuple[int, ...]]:
+        key = (pool, n)
+        sums = self._sums_cache.get(key)
+        if sums is None:
+            groups = self._groups_for(pool)
+            # easy pode repetir template; qualidade usa cada template no máximo uma vez
+            buckets = [(b, n if pool == "easy" else len(members)) for b, members in groups]
+            sums = self._sums_cache[key] = _reachable_bucket_sums(buckets, n)
+        return sums
+
+    def _take_from_buckets(self, pool: str, choice: Tuple[int, ...]) -> List[int]:
+        groups = self._groups_for(pool)
+        picked = []
+        for g in choice:
+            bucket, members = groups[g]
+            cursor_key = (pool, bucket)
+            idx = self.bucket_cursor.get(cursor_key, 0)
+            picked.append(members[idx % len(members)])
+            self.bucket_cursor[cursor_key] = idx + 1
+        return picked
+
+    def _distance_choice(self, phase: str, n_quality: int, n_easy: int, target_km: float):
+        """Buckets da combinação cuja soma de ``base_distance_km`` mais se aproxima da meta."""
+        q_sums = self._bucket_sums(phase, n_quality)
+        e_sums = self._bucket_sums("easy", n_easy)
+        e_keys = sorted(e_sums)
+        target = target_km / self.distance_bucket_km
+        best = None
+        for q_total in sorted(q_sums):
+            i = bisect_left(e_keys, target - q_total)
+            for e_total in e_keys[max(0, i - 1):i + 1]:
+                total = q_total + e_total
+                if total > 0 and target > 0:
+                    cost = abs(math.log(target / total))
+                else:
+                    cost = abs(target - total)
+                if best is None or cost < best[0]:
+                    best = (cost, q_total, e_total)
+        if best is None:
+            return (), ()
+        _, q_total, e_total = best
+        return q_sums[q_total], e_sums[e_total]
+
+    def _pick_by_distance(self, phase: str, n_quality: int, n_easy: int, target_km: float):
+        q_choice, e_choice = self._distance_choice(phase, n_quality, n_easy, target_km)
+        return self._take_from_buckets(phase, q_choice), self._take_from_buckets("easy", e_choice)
+
+    def _pick_week(self, phase: str, n_quality: int, n_easy: int, target_km: Optional[float]):
+        if self.selection_mode == "distance":
+            return self._pick_by_distance(phase, n_quality, n_easy, target_km)
+        return self._pick_quality_indices(phase, n_quality), self._pick_easy_indices(n_easy)
+
+    def _week_shape(self, phase: str):
+        """``(n_quality, n_easy, layout restrito ou None)`` da fase; não depende da semana."""
+        shape = self._shape_cache.get(phase)
+        if shape is None:
             n_quality = self._num_quality_sessions(phase)
-            n_total = self.athlete.frequency_per_week
-            n_easy = max(0, n_total - n_quality)
-            quality_sessions = self._pick_quality_templates(phase, n_quality)
-            easy_sessions = self._pick_easy_templates(n_easy)
-            scheduled_sessions = self._schedule_week_days(quality_sessions, easy_sessions)
-            week_plan = {"week": week_number, "phase": phase, "sessions": scheduled_sessions}
-            plan.append(week_plan)
-            week_number += 1
-        return plan
+            n_easy = max(0, self.athlete.frequency_per_week - n_quality)
+            if not self.session_lib.get(phase):
+                n_quality = 0
+            layout = None
+            if self.constraints is not None:
+                layout = self._constrained_layout(n_quality, n_easy)
+                n_quality = sum(1 for _, is_quality, _ in layout if is_quality)
+                n_easy = len(layout) - n_quality
+            shape = self._shape_cache[phase] = (n_quality, n_easy, layout)
+        return shape
+
+    def _check_targets(self, phase_sequence: List[str], weekly_targets: Optional[List[float]]) -> None:
+        if self.selection_mode == "distance":
+            if weekly_targets is None or len(weekly_targets) != len(phase_sequence):
+                raise ValueError("selection_mode='distance' exige weekly_targets com uma meta por semana.")
+
+    def state_at_week(
+        self, phase_sequence: List[str], week: int, weekly_targets: Optional[List[float]] = None
+    ) -> SelectorState:
+        """
+        Estado do seletor no início da semana ``week`` (0-based), sem gerar as semanas anteriores.
+
+        No modo ``"rotation"`` cada fase avança o cursor em um número fixo de sessões por semana,
+        então o cursor é ``semanas da fase antes de week × sessões por semana``. No modo
+        ``"distance"`` soma-se a escolha de buckets de cada semana anterior (sem montar o plano).
+        """
+        self._check_targets(phase_sequence, weekly_targets)
+        state = SelectorState(week=week, phase_cursor={phase: 0 for phase in self.session_lib.keys()})
+        if self.selection_mode == "rotation":
+            for phase, n_weeks in Counter(phase_sequence[:week]).items():
+                n_quality, n_easy, _ = self._week_shape(phase)
+                if n_quality:
+                    state.phase_cursor[phase] += n_weeks * n_quality
+                if n_easy:
+                    state.phase_cursor["Base"] += n_weeks * n_easy
+            return state
+        for w in range(week):
+            phase = phase_sequence[w]
+            n_quality, n_easy, _ = self._week_shape(phase)
+            q_choice, e_choice = self._distance_choice(phase, n_quality, n_easy, weekly_targets[w])
+            for pool, choice in ((phase, q_choice), ("easy", e_choice)):
+                groups = self._groups_for(pool)
+                for g in choice:
+                    key = (pool, groups[g][0])
+                    state.bucket_cursor[key] = state.bucket_cursor.get(key, 0) + 1
+        return state
+
+    def build_plan(
+        self,
+        phase_sequence: List[str],
+        weekly_targets: Optional[List[float]] = None,
+        start_week: Optional[int] = None,
+        end_week: Optional[int] = None,
+    ) -> WeeklyPlan:
+        """
+        Gera o ``WeeklyPlan`` da sequência de fases.
+
+        No modo ``selection_mode="distance"`` é obrigatório informar ``weekly_targets``:
+        a combinação de templates de cada semana é a que minimiza a distorção de escala
+        (``|log(meta / soma das distâncias-base)|``).
+
+        Sem ``start_week``, começa na semana 0, exceto logo após ``set_state``: a primeira
+        chamada seguinte retoma da semana guardada no checkpoint (``SelectorState.week``).
+        Chamadas repetidas no mesmo seletor geram sempre o plano inteiro.
+
+        Com ``start_week``/``end_week`` (0-based, fim exclusivo) gera só esse trecho, partindo
+        de ``state_at_week(start_week)``: o resultado é idêntico ao mesmo trecho da geração
+        serial, o que permite dividir planos longos entre processos.
+        """
+        self._check_targets(phase_sequence, weekly_targets)
+        if start_week is not None:
+            self.set_state(self.state_at_week(phase_sequence, start_week, weekly_targets))
+            first = start_week
+        else:
+            first = self.week_cursor if self._resume_pending else 0
+        self._resume_pending = False
+        last = len(phase_sequence) if end_week is None else end_week
+        counts: List[int] = []
+        days: List[int] = []
+        tidx: List[int] = []
+        for w in range(first, last):
+            phase = phase_sequence[w]
+            n_quality, n_easy, layout = self._week_shape(phase)
+            target = weekly_targets[w] if weekly_targets is not None else None
+            quality, easy = self._pick_week(phase, n_quality, n_easy, target)
+            if self.constraints is None:
+                layout = self._week_layout(len(quality), len(easy))
+            elif easy and self.constraints.long_run_days:
+                longest = max(range(len(easy)), key=lambda i: self.templates[easy[i]].base_distance_km)
+                easy[0], easy[longest] = easy[longest], easy[0]
+            counts.append(len(layout))
+            for day, is_quality, slot in layout:
+                days.append(day)
+                tidx.append(quality[slot] if is_quality else easy[slot])
+        self.week_cursor = last
+        return WeeklyPlan.from_slots(
+            self.templates, phase_sequence[first:last], counts, days, tidx, first_week=first + 1
+        )
+
+    def build_weekly_plan(self, phase_sequence: List[str]) -> List[Dict]:
+        return self.build_plan(phase_sequence).to_dicts()
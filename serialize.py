@@ -0,0 +1,75 @@
+import json
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Union
+
+from .sessions import Workout
+
+try:  # orjson é opcional: mesmo formato, serialização bem mais rápida
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+DEFAULT_BUFFER_SIZE = 1 << 16
+
+
+def workout_to_record(w: Workout) -> Dict[str, Any]:
+    """Workout como dict pronto para JSON, incluindo os segmentos estruturados."""
+    return {
+        "athlete": w.athlete_name,
+        "week": w.week,
+        "day_of_week": w.day_of_week,
+        "weekday": w.weekday_name,
+        "phase": w.phase,
+        "session_code": w.session_code,
+        "session_name": w.session_name,
+        "main_zones": list(w.main_zones),
+        "is_quality": w.is_quality,
+        "planned_distance_km": float(w.planned_distance_km),
+        "description": w.description,
+        "segments": w.segments,
+    }
+
+
+def _dumps_json(record: Dict[str, Any]) -> bytes:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _get_dumps(use_orjson: bool):
+    if use_orjson and orjson is not None:
+        return orjson.dumps
+    return _dumps_json
+
+
+def iter_ndjson(workouts: Iterable[Workout], use_orjson: bool = True) -> Iterator[bytes]:
+    """Gera uma linha NDJSON (bytes, com ``\\n``) por workout, sob demanda."""
+    dumps = _get_dumps(use_orjson)
+    for w in workouts:
+        yield dumps(workout_to_record(w)) + b"\n"
+
+
+def write_ndjson(
+    workouts: Iterable[Workout],
+    dest: Union[str, Path, BinaryIO],
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    use_orjson: bool = True,
+) -> int:
+    """
+    Escreve os workouts como NDJSON em ``dest`` (caminho ou arquivo binário).
+
+    As linhas são acumuladas em um buffer e gravadas em blocos de ~``buffer_size`` bytes,
+    então ``workouts`` pode ser um gerador de tamanho arbitrário. Retorna o número de linhas.
+    """
+    if isinstance(dest, (str, Path)):
+        with open(dest, "wb") as fh:
+            return write_ndjson(workouts, fh, buffer_size=buffer_size, use_orjson=use_orjson)
+    buf = bytearray()
+    n = 0
+    for line in iter_ndjson(workouts, use_orjson=use_orjson):
+        buf += line
+        n += 1
+        if len(buf) >= buffer_size:
+            dest.write(buf)
+            buf.clear()
+    if buf:
+        dest.write(buf)
+    return n
@@ -0,0 +1,236 @@
+import dataclasses
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .sessions import (
+    ContinuousSegment,
+    IntervalBlock,
+    SessionTemplate,
+    _estimate_session_distance_km,
+)
+
+FORMAT_VERSION = 1
+# versão do cache compilado: trocar ao mudar a forma como ele é gravado/lido
+CACHE_VERSION = 2
+DEFAULT_LIBRARY_PATH = Path(__file__).parent / "data" / "session_library_5k.json"
+VALID_ZONES = ("E", "M", "T", "I", "R")
+
+_CONTINUOUS_FIELDS = ("distance_km", "duration_min", "zone", "description")
+_INTERVAL_FIELDS = (
+    "reps", "work_distance_m", "work_duration_min", "work_zone",
+    "recovery_distance_m", "recovery_duration_min", "recovery_zone", "description",
+)
+
+# chave do cache -> documento já validado e normalizado (cada chamada recebe objetos novos)
+_Compiled = Dict[str, List[Dict[str, Any]]]
+_compiled: Dict[str, _Compiled] = {}
+
+
+def _segment_to_dict(seg: object) -> Dict[str, Any]:
+    if isinstance(seg, ContinuousSegment):
+        out: Dict[str, Any] = {"type": "continuous"}
+        fields = _CONTINUOUS_FIELDS
+    elif isinstance(seg, IntervalBlock):
+        out = {"type": "interval"}
+        fields = _INTERVAL_FIELDS
+    else:
+        raise TypeError(f"Segmento não suportado: {type(seg).__name__}")
+    for name in fields:
+        value = getattr(seg, name)
+        if value is not None and value != "":
+            out[name] = value
+    return out
+
+
+def template_to_dict(tpl: SessionTemplate) -> Dict[str, Any]:
+    out: Dict[str, Any] = {
+        "code": tpl.code,
+        "name": tpl.name,
+        "main_zones": list(tpl.main_zones),
+    }
+    if tpl.tags:
+        out["tags"] = list(tpl.tags)
+    for part in ("warmup", "main", "cooldown"):
+        segments = getattr(tpl, part)
+        if segments:
+            out[part] = [_segment_to_dict(seg) for seg in segments]
+    out["base_distance_km"] = tpl.base_distance_km
+    if tpl.description:
+        out["description"] = tpl.description
+    return out
+
+
+def dump_session_library(session_lib: Dict[str, List[SessionTemplate]], path: Union[str, Path]) -> None:
+    """Grava a biblioteca no formato declarativo (JSON)."""
+    lines = ['{"format": %d, "phases": {' % FORMAT_VERSION]
+    phases = list(session_lib.items())
+    for i, (phase, templates) in enumerate(phases):
+        lines.append(f"  {json.dumps(phase)}: [")
+        for j, tpl in enumerate(templates):
+            sep = "," if j < len(templates) - 1 else ""
+            lines.append(f"    {json.dumps(template_to_dict(tpl), ensure_ascii=False)}{sep}")
+        lines.append("  ]," if i < len(phases) - 1 else "  ]")
+    lines.append("}}")
+    # um template por linha: compacto e ainda legível em diffs
+    Path(path).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _check_zone(zone: Any, where: str) -> None:
+    if zone not in VALID_ZONES:
+        raise ValueError(f"{where}: zona inválida {zone!r} (use {'/'.join(VALID_ZONES)}).")
+
+
+def _segment_from_dict(raw: Dict[str, Any], where: str) -> object:
+    kind = raw.get("type")
+    if kind == "continuous":
+        allowed = _CONTINUOUS_FIELDS
+        cls = ContinuousSegment
+    elif kind == "interval":
+        allowed = _INTERVAL_FIELDS
+        cls = IntervalBlock
+    else:
+        raise ValueError(f"{where}: tipo de segmento inválido {kind!r} (use 'continuous' ou 'interval').")
+    unknown = set(raw) - set(allowed) - {"type"}
+    if unknown:
+        raise ValueError(f"{where}: campos desconhecidos {sorted(unknown)}.")
+    kwargs = {k: v for k, v in raw.items() if k != "type"}
+    for zone_field in ("zone", "work_zone", "recovery_zone"):
+        if zone_field in kwargs:
+            _check_zone(kwargs[zone_field], where)
+    try:
+        return cls(**kwargs)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"{where}: {exc}") from exc
+
+
+def _template_from_dict(raw: Dict[str, Any], phase: str) -> SessionTemplate:
+    where = f"{phase}/{raw.get('code', '?')}"
+    for required in ("code", "name", "main_zones"):
+        if required not in raw:
+            raise ValueError(f"{where}: campo obrigatório ausente {required!r}.")
+    for zone in raw["main_zones"]:
+        _check_zone(zone, where)
+    parts = {
+        part: [_segment_from_dict(seg, f"{where}/{part}[{i}]") for i, seg in enumerate(raw.get(part, []))]
+        for part in ("warmup", "main", "cooldown")
+    }
+    base_distance = raw.get("base_distance_km")
+    if base_distance is None:
+        base_distance = _estimate_session_distance_km([parts["warmup"], parts["main"], parts["cooldown"]])
+    return SessionTemplate(
+        code=raw["code"],
+        name=raw["name"],
+        phase=phase,
+        main_zones=list(raw["main_zones"]),
+        tags=list(raw.get("tags", [])),
+        warmup=parts["warmup"],
+        main=parts["main"],
+        cooldown=parts["cooldown"],
+        base_distance_km=float(base_distance),
+        description=raw.get("description", ""),
+    )
+
+
+def parse_session_library(doc: Dict[str, Any]) -> Dict[str, List[SessionTemplate]]:
+    """
+    Valida um documento declarativo e constrói a biblioteca.
+
+    Cada template recebe objetos de segmento próprios: os segmentos são mutáveis (a
+    anotação de ritmos escreve neles), então não são compartilhados entre templates.
+    """
+    if doc.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Formato de biblioteca não suportado: {doc.get('format')!r}.")
+    phases = doc.get("phases")
+    if not isinstance(phases, dict):
+        raise ValueError("Biblioteca sem o mapa 'phases'.")
+    return {
+        phase: [_template_from_dict(raw, phase) for raw in templates]
+        for phase, templates in phases.items()
+    }
+
+
+def _layout_signature() -> str:
+    """Campos das dataclasses da biblioteca: muda a chave do cache se o layout mudar."""
+    return ";".join(
+        f"{cls.__name__}:{','.join(f.name for f in dataclasses.fields(cls))}"
+        for cls in (SessionTemplate, ContinuousSegment, IntervalBlock)
+    )
+
+
+def _cache_key(raw_bytes: bytes) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{FORMAT_VERSION}|{CACHE_VERSION}|{_layout_signature()}|".encode("utf-8"))
+    h.update(raw_bytes)
+    return h.hexdigest()
+
+
+def _build_segment(raw: Dict[str, Any]) -> object:
+    cls = ContinuousSegment if raw["type"] == "continuous" else IntervalBlock
+    return cls(**{k: v for k, v in raw.items() if k != "type"})
+
+
+def _build_library(compiled: _Compiled) -> Dict[str, List[SessionTemplate]]:
+    """Constrói a biblioteca a partir do documento normalizado, sem validar de novo."""
+    return {
+        phase: [
+            SessionTemplate(
+                code=raw["code"],
+                name=raw["name"],
+                phase=phase,
+                main_zones=list(raw["main_zones"]),
+                tags=list(raw.get("tags", [])),
+                warmup=[_build_segment(seg) for seg in raw.get("warmup", [])],
+                main=[_build_segment(seg) for seg in raw.get("main", [])],
+                cooldown=[_build_segment(seg) for seg in raw.get("cooldown", [])],
+                base_distance_km=float(raw["base_distance_km"]),
+                description=raw.get("description", ""),
+            )
+            for raw in templates
+        ]
+        for phase, templates in compiled.items()
+    }
+
+
+def _read_cache(cache_file: Path) -> Optional[Tuple[_Compiled, Dict[str, List[SessionTemplate]]]]:
+    try:
+        compiled = json.loads(cache_file.read_text(encoding="utf-8"))
+        return compiled, _build_library(compiled)
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return None  # cache ilegível ou inválido: recompila a partir do arquivo-fonte
+
+
+def load_session_library(
+    path: Union[str, Path, None] = None,
+    cache_dir: Union[str, Path, None] = None,
+) -> Dict[str, List[SessionTemplate]]:
+    """
+    Carrega uma biblioteca declarativa (JSON).
+
+    O documento validado e normalizado (com ``base_distance_km`` já calculado) fica em
+    memória e, se ``cache_dir`` for informado, também em ``<cache_dir>/<chave>.json``.
+    A chave combina o hash do arquivo, ``FORMAT_VERSION``, ``CACHE_VERSION`` e os campos
+    das dataclasses, então caches de outra versão do código são ignorados. O cache é
+    JSON puro (nada é executado ao lê-lo); se estiver corrompido, é refeito. Cada
+    chamada devolve objetos novos.
+    """
+    raw_bytes = Path(path or DEFAULT_LIBRARY_PATH).read_bytes()
+    key = _cache_key(raw_bytes)
+    compiled = _compiled.get(key)
+    if compiled is not None:
+        return _build_library(compiled)
+    cache_file: Optional[Path] = Path(cache_dir) / f"{key}.json" if cache_dir is not None else None
+    cached = _read_cache(cache_file) if cache_file is not None and cache_file.exists() else None
+    if cached is not None:
+        _compiled[key], session_lib = cached
+        return session_lib
+    session_lib = parse_session_library(json.loads(raw_bytes))
+    compiled = {phase: [template_to_dict(t) for t in templates] for phase, templates in session_lib.items()}
+    if cache_file is not None:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(compiled, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(cache_file)
+    _compiled[key] = compiled
+    return session_lib
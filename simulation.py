@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .athlete import AthleteConfig
+from .facade_5k import build_5k_phase_sequence_simple
+from .feedback_rules import FeedbackRuleSet
+from .selection import WeeklySessionSelector
+from .sessions import build_5k_session_library
+from .volume import WeeklyVolumePlanner
+
+SIMULATION_EXECUTORS = ("process", "serial")
+DEFAULT_CHUNK_ATHLETES = 8192
+
+# Ramos das regras padrão de ``FeedbackEngine``, na ordem.
+FEEDBACK_BRANCHES = ("strong_reduction", "moderate_reduction", "keep", "increase", "intermediate")
+
+# (adesão, fadiga, dor) -> (volume_factor, quality_bias, ramo)
+VectorPolicy = Callable[[np.ndarray, np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray, np.ndarray]]
+
+
+_default_rules: Optional[FeedbackRuleSet] = None
+
+
+def feedback_engine_policy(adherence: np.ndarray, fatigue: np.ndarray, soreness: np.ndarray):
+    """Regras padrão de ``FeedbackEngine`` avaliadas sobre arrays de atletas."""
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = FeedbackRuleSet.default()
+    return _default_rules(adherence, fatigue, soreness)
+
+
+@dataclass(frozen=True)
+class SyntheticAthleteModel:
+    """
+    Processos aleatórios dos atletas sintéticos.
+
+    Adesão: média individual ~ Normal(``adherence_mean``, ``adherence_between_sd``) mais
+    ruído semanal AR(1). Fadiga: AR(1) que cresce com a carga relativa da semana
+    (volume cumprido / volume inicial) e com a carga de qualidade. Dor: acompanha a fadiga
+    com ruído próprio. Fadiga e dor são reportadas como inteiros de 1 a 10.
+    """
+
+    adherence_mean: float = 0.95
+    adherence_between_sd: float = 0.08
+    adherence_week_sd: float = 0.10
+    adherence_persistence: float = 0.4
+    fatigue_baseline: float = 4.0
+    fatigue_persistence: float = 0.5
+    fatigue_load_sensitivity: float = 2.5
+    fatigue_quality_sensitivity: float = 3.0
+    fatigue_week_sd: float = 1.0
+    soreness_coupling: float = 0.8
+    soreness_week_sd: float = 1.2
+
+
+@dataclass
+class FeedbackSimulationResult:
+    """
+    Resultado da simulação: arrays ``(atletas, semanas)`` e totais por atleta.
+
+    ``branch_counts[s, r]`` conta quantos atletas caíram no ramo ``r`` de
+    ``branch_names`` na semana ``s``.
+    """
+
+    planned_volume: np.ndarray
+    realized_volume: np.ndarray
+    quality_load: np.ndarray
+    volume_factor: np.ndarray
+    branch_counts: np.ndarray
+    weekly_targets: np.ndarray = field(repr=False)
+    branch_names: Sequence[str] = FEEDBACK_BRANCHES
+
+    @property
+    def n_athletes(self) -> int:
+        return self.realized_volume.shape[0]
+
+    def summary(self, percentiles: Sequence[float] = (5, 25, 50, 75, 95)) -> Dict[str, Dict[str, float]]:
+        """Percentis por atleta de volume total, carga de qualidade e fator final de volume."""
+        metrics = {
+            "realized_volume_km": self.realized_volume.sum(axis=1),
+            "volume_vs_initial_plan": self.realized_volume.sum(axis=1) / self.weekly_targets.sum(),
+            "quality_load_km": self.quality_load.sum(axis=1),
+            "final_volume_factor": self.volume_factor[:, -1],
+        }
+        out: Dict[str, Dict[str, float]] = {}
+        for name, values in metrics.items():
+            row = {"mean": float(values.mean())}
+            row.update({f"p{p:g}": float(v) for p, v in zip(percentiles, np.percentile(values, percentiles))})
+            out[name] = row
+        total = self.branch_counts.sum()
+        out["branch_share"] = {
+            b: float(self.branch_counts[:, i].sum() / total) if total else 0.0
+            for i, b in enumerate(self.branch_names)
+        }
+        return out
+
+
+def _simulate_chunk(
+    n: int,
+    seed: np.random.SeedSequence,
+    targets: np.ndarray,
+    quality_share: np.ndarray,
+    model: SyntheticAthleteModel,
+    policy: VectorPolicy,
+) -> Tuple[np.ndarray, ...]:
+    rng = np.random.default_rng(seed)
+    n_weeks = len(targets)
+    initial = max(float(targets[0]), 1e-3)
+
+    level = np.clip(rng.normal(model.adherence_mean, model.adherence_between_sd, n), 0.2, 1.4)
+    noise = np.zeros(n)
+    fatigue = np.full(n, model.fatigue_baseline)
+    multiplier = np.ones(n)
+    bias = np.ones(n)
+
+    planned = np.empty((n, n_weeks))
+    realized = np.empty((n, n_weeks))
+    quality = np.empty((n, n_weeks))
+    factors = np.empty((n, n_weeks))
+    n_branches = len(getattr(policy, "names", FEEDBACK_BRANCHES))
+    branches = np.zeros((n_weeks, n_branches), dtype=np.int64)
+
+    for w in range(n_weeks):
+        planned_w = targets[w] * multiplier
+        noise = model.adherence_persistence * noise + rng.normal(0.0, model.adherence_week_sd, n)
+        adherence = np.clip(level + noise, 0.0, 1.5)
+        done = planned_w * adherence
+        quality_w = done * quality_share[w] * bias
+
+        load = done / initial
+        fatigue = (
+            model.fatigue_persistence * fatigue
+            + (1 - model.fatigue_persistence) * model.fatigue_baseline
+            + model.fatigue_load_sensitivity * (load - 1.0)
+            + model.fatigue_quality_sensitivity * quality_w / np.maximum(done, 1e-3)
+            + rng.normal(0.0, model.fatigue_week_sd, n)
+        )
+        soreness = model.soreness_coupling * fatigue + rng.normal(0.0, model.soreness_week_sd, n)
+        fatigue_score = np.clip(np.rint(fatigue), 1, 10)
+        soreness_score = np.clip(np.rint(soreness), 1, 10)
+
+        ratio = done / np.maximum(planned_w, 1e-3)
+        volume_factor, quality_bias, branch = policy(ratio, fatigue_score, soreness_score)
+        # apply_adjustment_to_targets: o fator vale para todas as semanas seguintes
+        multiplier = multiplier * volume_factor
+        bias = quality_bias
+
+        planned[:, w] = planned_w
+        realized[:, w] = done
+        quality[:, w] = quality_w
+        factors[:, w] = multiplier
+        branches[w] = np.bincount(branch, minlength=n_branches)
+    return planned, realized, quality, factors, branches
+
+
+def _weekly_quality_share(athlete: AthleteConfig, phase_sequence: List[str]) -> np.ndarray:
+    plan = WeeklySessionSelector(athlete, build_5k_session_library()).build_plan(phase_sequence)
+    base = plan.base_distance_km()
+    is_quality = np.array([t.is_quality for t in plan.templates], dtype=bool)[plan.template_idx]
+    week = plan.week_of_slot()
+    total = np.bincount(week, weights=base, minlength=plan.n_weeks)
+    q = np.bincount(week, weights=np.where(is_quality, base, 0.0), minlength=plan.n_weeks)
+    return np.divide(q, total, out=np.zeros_like(q), where=total > 0)
+
+
+def simulate_feedback(
+    athlete: AthleteConfig,
+    n_athletes: int = 10_000,
+    total_weeks: int = 12,
+    phase_sequence: Optional[List[str]] = None,
+    model: SyntheticAthleteModel = SyntheticAthleteModel(),
+    policy: VectorPolicy = feedback_engine_policy,
+    seed: int = 0,
+    executor: str = "process",
+    max_workers: Optional[int] = None,
+    chunk_athletes: int = DEFAULT_CHUNK_ATHLETES,
+) -> FeedbackSimulationResult:
+    """
+    Simula o ciclo feedback → ``apply_adjustment_to_targets`` para atletas sintéticos.
+
+    Todos os atletas avançam juntos, semana a semana, em arrays NumPy; ``policy`` é a regra
+    vetorizada (padrão: as regras de ``FeedbackEngine``; qualquer ``FeedbackRuleSet`` serve).
+    Os atletas são divididos em blocos de ``chunk_athletes`` e cada bloco tem o próprio
+    gerador, semeado por ``SeedSequence(seed).spawn(n_blocos)``. Blocos e sementes dependem
+    só de ``n_athletes``, ``chunk_athletes`` e ``seed``, então o resultado não depende do
+    executor nem do número de processos (mudar ``chunk_athletes`` muda os sorteios).
+    """
+    if executor not in SIMULATION_EXECUTORS:
+        raise ValueError(f"executor inválido: {executor!r} (use {SIMULATION_EXECUTORS}).")
+    if n_athletes <= 0:
+        raise ValueError("n_athletes deve ser positivo.")
+    phase_sequence = phase_sequence or build_5k_phase_sequence_simple(total_weeks)
+    targets = np.asarray(WeeklyVolumePlanner(athlete).compute_weekly_targets(phase_sequence), dtype=np.float64)
+    quality_share = _weekly_quality_share(athlete, phase_sequence)
+
+    sizes = [min(chunk_athletes, n_athletes - i) for i in range(0, n_athletes, chunk_athletes)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(n, s, targets, quality_share, model, policy) for n, s in zip(sizes, seeds)]
+
+    workers = max_workers or os.cpu_count() or 1
+    if executor == "serial" or workers == 1 or len(args) == 1:
+        parts = [_simulate_chunk(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(args))) as pool:
+            parts = list(pool.map(_simulate_chunk, *zip(*args)))
+
+    planned, realized, quality, factors, branches = zip(*parts)
+    return FeedbackSimulationResult(
+        planned_volume=np.concatenate(planned),
+        realized_volume=np.concatenate(realized),
+        quality_load=np.concatenate(quality),
+        volume_factor=np.concatenate(factors),
+        branch_counts=np.sum(branches, axis=0),
+        weekly_targets=targets,
+        branch_names=tuple(getattr(policy, "names", FEEDBACK_BRANCHES)),
+    )
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Sequence, Union
+
+import numpy as np
+
+from .zones import zone_pace_table
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+SPLIT_DISTANCES_M = (200, 400, 800, 1000)
+SPLIT_ZONES = ("T", "I", "R")
+
+
+def split_table(
+    vdots: ArrayLike,
+    distances_m: Sequence[float] = SPLIT_DISTANCES_M,
+    zones: Sequence[str] = SPLIT_ZONES,
+) -> Dict[str, Any]:
+    """
+    Tempos de passagem (segundos) por VDOT, zona e distância, como arrays NumPy.
+
+    ``slow_s``/``fast_s`` têm forma ``(n_vdots, n_zonas, n_distancias)`` e saem dos ritmos
+    brutos de ``zone_pace_table`` (min/km): ``tempo = ritmo * 60 * distancia / 1000``.
+    Os tempos não são arredondados (nem passam pelo ritmo ``mm:ss`` arredondado ao segundo);
+    só ``format_split`` arredonda, ao décimo de segundo, na exibição.
+    """
+    table = zone_pace_table(vdots)
+    zone_pos = [table["zones"].index(z) for z in zones]
+    km = np.asarray(distances_m, dtype=np.float64) / 1000.0
+    out: Dict[str, Any] = {
+        "vdot": table["vdot"],
+        "zones": list(zones),
+        "distances_m": np.asarray(distances_m, dtype=np.float64),
+    }
+    for side in ("slow", "fast"):
+        pace_s_km = table[f"pace_{side}_min_km_raw"][:, zone_pos] * 60.0
+        out[f"{side}_s"] = pace_s_km[:, :, None] * km[None, None, :]
+    return out
+
+
+def format_split(seconds: float) -> str:
+    """``ss.s`` abaixo de um minuto, ``m:ss.s`` acima (ex.: ``92.4`` → ``1:32.4``)."""
+    tenths = int(round(seconds * 10))
+    minutes, rest = divmod(tenths, 600)
+    if minutes:
+        return f"{minutes}:{rest // 10:02d}.{rest % 10}"
+    return f"{rest // 10}.{rest % 10}"
+
+
+def attach_rep_splits(
+    step_table: Dict[str, np.ndarray],
+    vdot: ArrayLike,
+    distances_m: Sequence[float] = SPLIT_DISTANCES_M,
+    zones: Sequence[str] = SPLIT_ZONES,
+) -> Dict[str, np.ndarray]:
+    """
+    Acrescenta ``split_slow_s``/``split_fast_s`` às repetições de trabalho de uma tabela de
+    passos (``steps.plan_step_table``) cuja distância é uma das ``distances_m``.
+
+    ``vdot`` é um valor único ou um por linha da tabela (ex.:
+    ``vdot_por_semana[tabela["week"] - 1]``). Os VDOTs distintos vão para uma única
+    ``split_table`` e as linhas são resolvidas por indexação. Só passos ``work`` de zona em
+    ``zones`` com distância exatamente igual a uma de ``distances_m`` recebem parcial; as
+    demais linhas (recuperações, repetições por tempo, 600 m, ...) ficam com ``NaN``.
+    A tabela é alterada in-place e também retornada.
+    """
+    distances_m = sorted(distances_m)
+    n = len(step_table["kind"])
+    row_vdot = np.broadcast_to(np.asarray(vdot, dtype=np.float64), (n,))
+    unique, vdot_idx = np.unique(row_vdot, return_inverse=True)
+    table = split_table(unique, distances_m, zones)
+
+    dist = step_table["distance_m"]
+    dist_idx = np.searchsorted(table["distances_m"], dist)
+    dist_idx = np.minimum(dist_idx, len(table["distances_m"]) - 1)
+    zone_lookup = {z: i for i, z in enumerate(zones)}
+    zone_idx = np.array([zone_lookup.get(z, -1) for z in step_table["zone"].tolist()], dtype=np.int64)
+
+    mask = (
+        (step_table["kind"] == "work")
+        & (zone_idx >= 0)
+        & (table["distances_m"][dist_idx] == dist)
+    )
+    rows = np.flatnonzero(mask)
+    for side in ("slow", "fast"):
+        column = np.full(n, np.nan, dtype=np.float64)
+        column[rows] = table[f"{side}_s"][vdot_idx[rows], zone_idx[rows], dist_idx[rows]]
+        step_table[f"split_{side}_s"] = column
+    return step_table
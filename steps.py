@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Union
+
+import numpy as np
+
+from .pacing import WorkoutPaceAnnotator, ZonesInput, weekday_name_from_int
+from .plan import WeeklyPlan
+from .sessions import ContinuousSegment, IntervalBlock, SessionTemplate
+
+STEP_KINDS = ("warmup", "active", "work", "recovery", "cooldown")
+
+
+class WorkoutStep(NamedTuple):
+    """
+    Um passo executável de uma sessão (uma volta no relógio).
+
+    ``step`` numera os passos da sessão a partir de 1. Um bloco intervalado de ``reps``
+    repetições vira ``2 * reps`` passos (``work`` e ``recovery`` alternados, com ``rep`` de
+    1 a ``reps``); segmentos contínuos viram um passo cada (``warmup``, ``active`` ou
+    ``cooldown``). Exatamente um entre ``distance_m`` e ``duration_s`` é preenchido (o alvo
+    do passo).
+    Ritmos são códigos em segundos/km (ver ``zones.pace_code``); ``rep`` é ``0`` fora de
+    blocos intervalados.
+    """
+
+    step: int
+    part: str
+    kind: str
+    rep: int
+    reps: int
+    zone: str
+    distance_m: Optional[float]
+    duration_s: Optional[float]
+    pace_slow_code: int
+    pace_fast_code: int
+    description: str
+
+
+STEP_FIELDS = WorkoutStep._fields
+
+
+def _as_annotator(zones: Union[WorkoutPaceAnnotator, ZonesInput]) -> WorkoutPaceAnnotator:
+    return zones if isinstance(zones, WorkoutPaceAnnotator) else WorkoutPaceAnnotator(zones)
+
+
+def iter_session_steps(
+    template: SessionTemplate,
+    zones: Union[WorkoutPaceAnnotator, ZonesInput],
+) -> Iterator[WorkoutStep]:
+    """
+    Expande a sessão em passos, sob demanda: aquecimento, cada repetição e cada
+    recuperação dos blocos intervalados, e desaquecimento.
+
+    Os ritmos vêm das zonas (``WorkoutPaceAnnotator`` ou registros/DataFrame de
+    ``DanielsZones``), sem depender de o template já ter sido anotado.
+    """
+    paces = _as_annotator(zones).zone_paces
+    step = 0
+
+    def make(part, kind, rep, reps, zone, distance_m, duration_s, description):
+        p = paces[zone]
+        return WorkoutStep(
+            step, part, kind, rep, reps, zone, distance_m, duration_s,
+            p["slow_code"], p["fast_code"], description,
+        )
+
+    for part in ("warmup", "main", "cooldown"):
+        kind = part if part != "main" else "active"
+        for item in getattr(template, part):
+            if isinstance(item, ContinuousSegment):
+                step += 1
+                yield make(
+                    part, kind, 0, 0, item.zone,
+                    item.distance_km * 1000.0 if item.distance_km is not None else None,
+                    item.duration_min * 60.0 if item.distance_km is None else None,
+                    item.description,
+                )
+            elif isinstance(item, IntervalBlock):
+                work_m = float(item.work_distance_m) if item.work_distance_m is not None else None
+                work_s = item.work_duration_min * 60.0 if work_m is None else None
+                rec_m = float(item.recovery_distance_m) if item.recovery_distance_m is not None else None
+                rec_s = item.recovery_duration_min * 60.0 if rec_m is None else None
+                for rep in range(1, item.reps + 1):
+                    step += 1
+                    yield make(part, "work", rep, item.reps, item.work_zone, work_m, work_s, item.description)
+                    step += 1
+                    yield make(part, "recovery", rep, item.reps, item.recovery_zone, rec_m, rec_s, "")
+
+
+def _template_step_columns(templates: List[SessionTemplate], annotator: WorkoutPaceAnnotator):
+    """Passos de cada template concatenados em colunas, com offsets por template."""
+    offsets = np.zeros(len(templates) + 1, dtype=np.int64)
+    columns: Dict[str, List[Any]] = {name: [] for name in STEP_FIELDS}
+    for t, tpl in enumerate(templates):
+        n = 0
+        for s in iter_session_steps(tpl, annotator):
+            for name, value in zip(STEP_FIELDS, s):
+                columns[name].append(value)
+            n += 1
+        offsets[t + 1] = offsets[t] + n
+    arrays = {
+        "step": np.asarray(columns["step"], dtype=np.int32),
+        "part": np.asarray(columns["part"], dtype=object),
+        "kind": np.asarray(columns["kind"], dtype=object),
+        "rep": np.asarray(columns["rep"], dtype=np.int32),
+        "reps": np.asarray(columns["reps"], dtype=np.int32),
+        "zone": np.asarray(columns["zone"], dtype=object),
+        "distance_m": np.array([np.nan if v is None else v for v in columns["distance_m"]], dtype=np.float64),
+        "duration_s": np.array([np.nan if v is None else v for v in columns["duration_s"]], dtype=np.float64),
+        "pace_slow_code": np.asarray(columns["pace_slow_code"], dtype=np.int32),
+        "pace_fast_code": np.asarray(columns["pace_fast_code"], dtype=np.int32),
+        "description": np.asarray(columns["description"], dtype=object),
+    }
+    return offsets, arrays
+
+
+def plan_step_table(
+    plan: WeeklyPlan,
+    zones: Union[WorkoutPaceAnnotator, ZonesInput],
+    athlete_name: Optional[str] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Tabela plana com todos os passos de todas as sessões do plano (colunas como arrays).
+
+    Cada template usado é expandido uma vez; as linhas do plano são montadas por
+    indexação (``template_idx`` → faixa de passos do template), sem criar um objeto por
+    repetição. Colunas: ``athlete`` (se informado), ``week``, ``day_of_week``, ``weekday``,
+    ``session_code``, ``slot`` (sessão no plano, 0-based) e os campos de ``WorkoutStep``
+    (alvos ausentes viram ``NaN``). Há uma linha por passo expandido, na ordem das sessões
+    do plano; ``slot`` liga cada linha de volta à sessão. ``pd.DataFrame(tabela)`` dá o
+    DataFrame.
+    """
+    annotator = _as_annotator(zones)
+    used, local_idx = np.unique(plan.template_idx, return_inverse=True)
+    used_templates = [plan.templates[t] for t in used.tolist()]
+    offsets, steps = _template_step_columns(used_templates, annotator)
+
+    counts = np.diff(offsets)[local_idx]
+    slot = np.repeat(np.arange(plan.n_sessions), counts)
+    # índice do passo dentro da tabela de templates: início do template + posição no slot
+    starts = np.repeat(offsets[:-1][local_idx], counts)
+    within = np.arange(len(slot)) - np.repeat(np.cumsum(counts) - counts, counts)
+    rows = starts + within
+
+    week = (plan.week_of_slot() + plan.first_week).astype(np.int32)
+    day = plan.day_of_week.astype(np.int8)
+    weekday = np.array([weekday_name_from_int(d) for d in range(8)], dtype=object)
+    codes = np.array([t.code for t in used_templates], dtype=object)
+
+    table: Dict[str, np.ndarray] = {}
+    if athlete_name is not None:
+        table["athlete"] = np.full(len(slot), athlete_name, dtype=object)
+    table["week"] = week[slot]
+    table["day_of_week"] = day[slot]
+    table["weekday"] = weekday[np.clip(day[slot], 0, 7)]
+    table["session_code"] = codes[local_idx][slot]
+    table["slot"] = slot
+    for name, column in steps.items():
+        table[name] = column[rows]
+    return table
@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union,
+)
+
+from .athlete import AthleteConfig
+from .feedback import CompletedWorkoutFeedback, WeeklyFeedback
+from .pacing import PLAN_COLUMNS
+from .sessions import Workout
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+PlanRows = Union["pd.DataFrame", Sequence[Mapping[str, Any]], Iterable[Workout]]
+
+SCHEMA_VERSION = 1
+DEFAULT_BATCH_SIZE = 10_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS athletes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    frequency_per_week INTEGER NOT NULL,
+    objective TEXT NOT NULL,
+    initial_weekly_volume REAL NOT NULL,
+    peak_weekly_volume REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS plan_versions (
+    id INTEGER PRIMARY KEY,
+    athlete_id INTEGER NOT NULL REFERENCES athletes(id),
+    version INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    note TEXT NOT NULL DEFAULT '',
+    UNIQUE (athlete_id, version)
+);
+CREATE TABLE IF NOT EXISTS workouts (
+    plan_version_id INTEGER NOT NULL REFERENCES plan_versions(id),
+    athlete_id INTEGER NOT NULL REFERENCES athletes(id),
+    week INTEGER NOT NULL,
+    day_of_week INTEGER NOT NULL,
+    weekday TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    session_code TEXT NOT NULL,
+    session_name TEXT NOT NULL,
+    main_zones TEXT NOT NULL,
+    is_quality INTEGER NOT NULL,
+    planned_distance_km REAL NOT NULL,
+    description TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS workouts_athlete_week ON workouts (athlete_id, week);
+CREATE INDEX IF NOT EXISTS workouts_plan_version ON workouts (plan_version_id);
+CREATE TABLE IF NOT EXISTS weekly_feedback (
+    athlete_id INTEGER NOT NULL REFERENCES athletes(id),
+    week INTEGER NOT NULL,
+    planned_volume_km REAL NOT NULL,
+    completed_volume_km REAL NOT NULL,
+    missed_workouts INTEGER NOT NULL,
+    avg_rpe_quality REAL,
+    fatigue_score INTEGER,
+    soreness_score INTEGER,
+    notes TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (athlete_id, week)
+);
+CREATE TABLE IF NOT EXISTS workout_feedback (
+    athlete_id INTEGER NOT NULL REFERENCES athletes(id),
+    week INTEGER NOT NULL,
+    day_of_week INTEGER NOT NULL,
+    completed_distance_km REAL,
+    rpe INTEGER,
+    notes TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (athlete_id, week, day_of_week)
+);
+"""
+
+_WEEKLY_FEEDBACK_FIELDS = (
+    "week", "planned_volume_km", "completed_volume_km", "missed_workouts",
+    "avg_rpe_quality", "fatigue_score", "soreness_score", "notes",
+)
+_WORKOUT_FEEDBACK_FIELDS = ("week", "day_of_week", "completed_distance_km", "rpe", "notes")
+
+
+def _plan_rows(plan: PlanRows) -> Iterator[Tuple[Any, ...]]:
+    """Linhas do plano como tuplas na ordem de ``PLAN_COLUMNS``, sem materializar o plano."""
+    if hasattr(plan, "columns"):
+        yield from plan[PLAN_COLUMNS].itertuples(index=False, name=None)
+        return
+    for row in plan:
+        if isinstance(row, Workout):
+            yield (row.athlete_name, row.week, row.day_of_week, row.weekday_name, row.phase,
+                   row.session_code, row.session_name, "/".join(row.main_zones), row.is_quality,
+                   row.planned_distance_km, row.description)
+        else:
+            yield tuple(row[c] for c in PLAN_COLUMNS)
+
+
+class PlanRepository:
+    """
+    Repositório SQLite local de atletas, versões de plano, sessões e feedback.
+
+    Cada ``save_*`` grava tudo numa única transação, com ``executemany`` em lotes de
+    ``batch_size`` linhas. Arquivos em disco usam ``journal_mode=WAL`` (leitores não
+    bloqueiam a escrita) e ``synchronous=NORMAL``. Sessões e feedback são indexados por
+    ``(athlete_id, week)``. Os ``load_*_dataframe`` leem com uma consulta só, via pandas.
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:", batch_size: int = DEFAULT_BATCH_SIZE):
+        if batch_size <= 0:
+            raise ValueError("batch_size deve ser positivo.")
+        self.path = str(path)
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(self.path)
+        if self.path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        with self.conn:
+            self.conn.executescript(_SCHEMA)
+            self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._athlete_ids: Dict[str, int] = dict(self.conn.execute("SELECT name, id FROM athletes"))
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "PlanRepository":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _athlete_id(self, name: str) -> int:
+        athlete_id = self._athlete_ids.get(name)
+        if athlete_id is None:
+            raise ValueError(f"Atleta desconhecido: {name!r} (grave-o com save_athletes).")
+        return athlete_id
+
+    def _executemany(self, sql: str, rows: Iterable[Tuple[Any, ...]]) -> int:
+        count = 0
+        batch: List[Tuple[Any, ...]] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self.conn.executemany(sql, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self.conn.executemany(sql, batch)
+            count += len(batch)
+        return count
+
+    def save_athletes(self, athletes: Iterable[AthleteConfig]) -> int:
+        """Insere ou atualiza (pelo nome) os atletas. Retorna quantos foram gravados."""
+        rows = [
+            (a.name, a.frequency_per_week, a.objective, a.initial_weekly_volume, a.peak_weekly_volume)
+            for a in athletes
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO athletes (name, frequency_per_week, objective, initial_weekly_volume, "
+                "peak_weekly_volume) VALUES (?, ?, ?, ?, ?) ON CONFLICT (name) DO UPDATE SET "
+                "frequency_per_week=excluded.frequency_per_week, objective=excluded.objective, "
+                "initial_weekly_volume=excluded.initial_weekly_volume, "
+                "peak_weekly_volume=excluded.peak_weekly_volume",
+                rows,
+            )
+        self._athlete_ids.update(self.conn.execute("SELECT name, id FROM athletes"))
+        return len(rows)
+
+    def load_athletes(self) -> List[AthleteConfig]:
+        rows = self.conn.execute(
+            "SELECT name, frequency_per_week, objective, initial_weekly_volume, peak_weekly_volume "
+            "FROM athletes ORDER BY id"
+        )
+        return [AthleteConfig(*row) for row in rows]
+
+    def save_plans(self, plan: PlanRows, note: str = "") -> Dict[str, int]:
+        """
+        Grava uma nova versão de plano para cada atleta presente em ``plan`` (DataFrame,
+        lista de dicts ou de ``Workout``, de um ou vários atletas). As linhas são lidas em
+        streaming e inseridas em lotes. Retorna ``{atleta: número da versão}``.
+        """
+        created_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        versions: Dict[str, int] = {}
+        version_ids: Dict[str, int] = {}
+
+        def rows() -> Iterator[Tuple[Any, ...]]:
+            for row in _plan_rows(plan):
+                athlete = row[0]
+                version_id = version_ids.get(athlete)
+                if version_id is None:
+                    athlete_id = self._athlete_id(athlete)
+                    (last,) = self.conn.execute(
+                        "SELECT COALESCE(MAX(version), 0) FROM plan_versions WHERE athlete_id = ?",
+                        (athlete_id,),
+                    ).fetchone()
+                    versions[athlete] = last + 1
+                    version_id = version_ids[athlete] = self.conn.execute(
+                        "INSERT INTO plan_versions (athlete_id, version, created_at, note) VALUES (?, ?, ?, ?)",
+                        (athlete_id, last + 1, created_at, note),
+                    ).lastrowid
+                yield (version_id, self._athlete_ids[athlete], int(row[1]), int(row[2]), *row[3:8],
+                       int(bool(row[8])), float(row[9]), row[10])
+
+        with self.conn:
+            self._executemany(
+                f"INSERT INTO workouts (plan_version_id, athlete_id, {', '.join(PLAN_COLUMNS[1:])}) "
+                f"VALUES ({', '.join('?' * (len(PLAN_COLUMNS) + 1))})",
+                rows(),
+            )
+        return versions
+
+    def plan_versions(self, athlete: str) -> List[Dict[str, Any]]:
+        """Versões gravadas do plano do atleta, da mais antiga para a mais nova."""
+        rows = self.conn.execute(
+            "SELECT pv.version, pv.created_at, pv.note, COUNT(w.plan_version_id) "
+            "FROM plan_versions pv LEFT JOIN workouts w ON w.plan_version_id = pv.id "
+            "WHERE pv.athlete_id = ? GROUP BY pv.id ORDER BY pv.version",
+            (self._athlete_id(athlete),),
+        )
+        return [{"version": v, "created_at": c, "note": n, "workouts": k} for v, c, n, k in rows]
+
+    def load_plan_dataframe(
+        self,
+        athletes: Optional[Sequence[str]] = None,
+        version: Optional[int] = None,
+        weeks: Optional[Tuple[int, int]] = None,
+    ) -> "pd.DataFrame":
+        """
+        Plano em DataFrame (colunas de ``PLAN_COLUMNS`` mais ``plan_version``).
+
+        Sem ``version``, traz a versão mais recente de cada atleta; ``weeks=(início, fim)``
+        filtra pelo índice ``(athlete_id, week)`` (inclusivo).
+        """
+        import pandas as pd
+
+        where, params = self._athlete_filter("w", athletes)
+        if version is None:
+            where.append(
+                "pv.version = (SELECT MAX(version) FROM plan_versions WHERE athlete_id = pv.athlete_id)"
+            )
+        else:
+            where.append("pv.version = ?")
+            params.append(int(version))
+        if weeks is not None:
+            where.append("w.week BETWEEN ? AND ?")
+            params.extend(int(w) for w in weeks)
+        sql = (
+            f"SELECT a.name AS athlete, {', '.join('w.' + c for c in PLAN_COLUMNS[1:])}, "
+            "pv.version AS plan_version FROM workouts w "
+            "JOIN plan_versions pv ON pv.id = w.plan_version_id JOIN athletes a ON a.id = w.athlete_id "
+            f"WHERE {' AND '.join(where)} ORDER BY w.athlete_id, w.week, w.day_of_week"
+        )
+        df = pd.read_sql_query(sql, self.conn, params=params)
+        df["is_quality"] = df["is_quality"].astype(bool)
+        return df
+
+    def save_feedback(
+        self, feedback: Iterable[Tuple[str, Union[WeeklyFeedback, CompletedWorkoutFeedback]]]
+    ) -> int:
+        """
+        Grava pares ``(atleta, feedback)`` — semanais e/ou por sessão — numa transação.
+        Um novo feedback para a mesma semana (ou sessão) substitui o anterior.
+        Retorna quantos registros foram gravados.
+        """
+        tables = {
+            WeeklyFeedback: ("weekly_feedback", _WEEKLY_FEEDBACK_FIELDS),
+            CompletedWorkoutFeedback: ("workout_feedback", _WORKOUT_FEEDBACK_FIELDS),
+        }
+        pending: Dict[type, List[Tuple[Any, ...]]] = {kind: [] for kind in tables}
+        count = 0
+
+        def flush(kind: type) -> None:
+            table, fields = tables[kind]
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO {table} (athlete_id, {', '.join(fields)}) "
+                f"VALUES ({', '.join('?' * (len(fields) + 1))})",
+                pending[kind],
+            )
+            pending[kind].clear()
+
+        with self.conn:
+            for athlete, fb in feedback:
+                kind = type(fb)
+                if kind not in tables:
+                    raise ValueError(f"Tipo de feedback não suportado: {kind.__name__}.")
+                rows = pending[kind]
+                rows.append((self._athlete_id(athlete), *(getattr(fb, f) for f in tables[kind][1])))
+                count += 1
+                if len(rows) >= self.batch_size:
+                    flush(kind)
+            for kind in tables:
+                if pending[kind]:
+                    flush(kind)
+        return count
+
+    def load_weekly_feedback(self, athlete: str) -> List[WeeklyFeedback]:
+        """Feedback semanal do atleta, por semana, como objetos ``WeeklyFeedback``."""
+        rows = self.conn.execute(
+            f"SELECT {', '.join(_WEEKLY_FEEDBACK_FIELDS)} FROM weekly_feedback "
+            "WHERE athlete_id = ? ORDER BY week",
+            (self._athlete_id(athlete),),
+        )
+        return [WeeklyFeedback(*row) for row in rows]
+
+    def load_feedback_dataframe(
+        self, athletes: Optional[Sequence[str]] = None, per_workout: bool = False
+    ) -> "pd.DataFrame":
+        """Feedback semanal (ou por sessão, com ``per_workout``) de todos ou alguns atletas."""
+        import pandas as pd
+
+        table, fields = (
+            ("workout_feedback", _WORKOUT_FEEDBACK_FIELDS) if per_workout
+            else ("weekly_feedback", _WEEKLY_FEEDBACK_FIELDS)
+        )
+        where, params = self._athlete_filter("f", athletes)
+        order = "f.athlete_id, f.week" + (", f.day_of_week" if per_workout else "")
+        sql = (
+            f"SELECT a.name AS athlete, {', '.join('f.' + c for c in fields)} FROM {table} f "
+            f"JOIN athletes a ON a.id = f.athlete_id "
+            f"WHERE {' AND '.join(where) or '1'} ORDER BY {order}"
+        )
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def _athlete_filter(self, alias: str, athletes: Optional[Sequence[str]]) -> Tuple[List[str], List[Any]]:
+        if athletes is None:
+            return [], []
+        ids = [self._athlete_id(a) for a in athletes]
+        return [f"{alias}.athlete_id IN ({', '.join('?' * len(ids))})"], ids
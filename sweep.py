@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .athlete import AthleteConfig
+from .facade_5k import build_5k_phase_sequence_simple, estimate_vdot_from_race
+from .library import SessionLibraryIndex
+from .pacing import weekly_plan_to_workouts, workouts_to_dataframe
+from .selection import WeeklySessionSelector
+from .sessions import build_5k_session_library
+from .volume import WeeklyVolumePlanner
+from .zones import DanielsZones
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+SWEEP_EXECUTORS = ("process", "thread", "serial")
+
+# (total_weeks, frequency_per_week, initial_weekly_volume, peak_weekly_volume)
+Variant = Tuple[int, int, float, float]
+
+
+@dataclass
+class _SweepContext:
+    """Tudo que não depende dos eixos variados: VDOT, zonas, biblioteca e fases por nº de semanas."""
+
+    athlete_name: str
+    vdot: float
+    zones: List[Dict[str, Any]]
+    index: SessionLibraryIndex
+    is_quality: np.ndarray
+    phase_sequences: Dict[int, List[str]]
+    selection_mode: str
+
+
+_context: Optional[_SweepContext] = None
+
+
+def _build_context(athlete_name: str, vdot: float, weeks: Sequence[int], selection_mode: str) -> _SweepContext:
+    index = SessionLibraryIndex(build_5k_session_library())
+    return _SweepContext(
+        athlete_name=athlete_name,
+        vdot=vdot,
+        zones=DanielsZones(vdot).build_records(),
+        index=index,
+        is_quality=index.quality_mask,
+        phase_sequences={w: build_5k_phase_sequence_simple(w) for w in weeks},
+        selection_mode=selection_mode,
+    )
+
+
+def _init_worker(athlete_name: str, vdot: float, weeks: Sequence[int], selection_mode: str) -> None:
+    global _context
+    _context = _build_context(athlete_name, vdot, weeks, selection_mode)
+
+
+def _run_variant(ctx: _SweepContext, variant: Variant, return_plan: bool) -> Tuple[Dict[str, Any], Any]:
+    total_weeks, frequency, initial_volume, peak_volume = variant
+    athlete = AthleteConfig(
+        name=ctx.athlete_name,
+        frequency_per_week=frequency,
+        objective="5K",
+        initial_weekly_volume=initial_volume,
+        peak_weekly_volume=peak_volume,
+    )
+    phase_sequence = ctx.phase_sequences[total_weeks]
+    selector = WeeklySessionSelector(
+        athlete, ctx.index.session_lib, index=ctx.index, selection_mode=ctx.selection_mode
+    )
+    volume_planner = WeeklyVolumePlanner(athlete)
+    weekly_targets = volume_planner.compute_weekly_targets(phase_sequence)
+    plan = selector.build_plan(phase_sequence, weekly_targets)
+    volume_planner.apply_volume_to_plan(plan, weekly_targets)
+
+    planned = plan.planned_distance_km
+    quality = ctx.is_quality[plan.template_idx]
+    week_km = np.bincount(plan.week_of_slot(), weights=planned, minlength=plan.n_weeks)
+    summary = {
+        "total_weeks": total_weeks,
+        "frequency_per_week": frequency,
+        "initial_weekly_volume": initial_volume,
+        "peak_weekly_volume": peak_volume,
+        "n_sessions": plan.n_sessions,
+        "n_quality_sessions": int(quality.sum()),
+        "total_km": float(planned.sum()),
+        "quality_km": float(planned[quality].sum()),
+        "quality_share": float(planned[quality].sum() / planned.sum()) if planned.sum() > 0 else 0.0,
+        "peak_week_km": float(week_km.max()) if len(week_km) else 0.0,
+        "mean_week_km": float(week_km.mean()) if len(week_km) else 0.0,
+    }
+    full_plan = None
+    if return_plan:
+        full_plan = workouts_to_dataframe(weekly_plan_to_workouts(plan, athlete, ctx.zones))
+    return summary, full_plan
+
+
+def _run_chunk(variants: List[Variant], return_plans: bool) -> List[Tuple[Dict[str, Any], Any]]:
+    return [_run_variant(_context, v, return_plans) for v in variants]
+
+
+def sweep_5k_plans(
+    athlete_name: str,
+    race_distance_km: float,
+    race_time_min: float,
+    total_weeks: Sequence[int] = (8,),
+    frequency_per_week: Sequence[int] = (4,),
+    volume_pairs: Sequence[Tuple[float, float]] = ((30.0, 50.0),),
+    selection_mode: str = "rotation",
+    return_plans: bool = False,
+    executor: str = "process",
+    max_workers: Optional[int] = None,
+):
+    """
+    Gera uma variante de plano para cada combinação da grade de parâmetros.
+
+    VDOT, zonas, biblioteca (com índice) e sequência de fases por nº de semanas são
+    calculados uma vez (uma vez por processo no executor ``"process"``) e reaproveitados.
+    Retorna um DataFrame com uma linha de métricas por variante, na ordem da grade; com
+    ``return_plans=True`` retorna ``(resumo, planos)``, onde ``planos`` mapeia
+    ``(total_weeks, frequency_per_week, initial, peak)`` para o DataFrame completo.
+    """
+    import pandas as pd
+
+    if executor not in SWEEP_EXECUTORS:
+        raise ValueError(f"executor inválido: {executor!r} (use {SWEEP_EXECUTORS}).")
+    vdot = estimate_vdot_from_race(distance_km=race_distance_km, time_min=race_time_min)
+    weeks = sorted(set(total_weeks))
+    variants: List[Variant] = [
+        (w, f, float(v0), float(vp))
+        for w, f, (v0, vp) in itertools.product(total_weeks, frequency_per_week, volume_pairs)
+    ]
+
+    workers = max_workers or os.cpu_count() or 1
+    if executor == "serial" or workers == 1 or len(variants) <= 1:
+        ctx = _build_context(athlete_name, vdot, weeks, selection_mode)
+        results = [_run_variant(ctx, v, return_plans) for v in variants]
+    elif executor == "thread":
+        ctx = _build_context(athlete_name, vdot, weeks, selection_mode)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda v: _run_variant(ctx, v, return_plans), variants))
+    else:
+        # blocos contíguos preservam a ordem da grade e amortizam o custo de IPC
+        chunk = max(1, -(-len(variants) // (workers * 4)))
+        chunks = [variants[i:i + chunk] for i in range(0, len(variants), chunk)]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(athlete_name, vdot, weeks, selection_mode),
+        ) as pool:
+            results = [r for part in pool.map(_run_chunk, chunks, itertools.repeat(return_plans)) for r in part]
+
+    summary = pd.DataFrame([s for s, _ in results])
+    summary.insert(0, "vdot", vdot)
+    summary.insert(0, "athlete", athlete_name)
+    if not return_plans:
+        return summary
+    plans = {v: plan for v, (_, plan) in zip(variants, results)}
+    return summary, plans
@@ -0,0 +1,13 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+# O repositório é o próprio pacote: registra-o como ``daniels_5k_planner`` para os testes.
+ROOT = Path(__file__).resolve().parents[1]
+if "daniels_5k_planner" not in sys.modules:
+    spec = importlib.util.spec_from_file_location(
+        "daniels_5k_planner", ROOT / "__init__.py", submodule_search_locations=[str(ROOT)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["daniels_5k_planner"] = module
+    spec.loader.exec_module(module)
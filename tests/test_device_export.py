@@ -0,0 +1,91 @@
+import struct
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from daniels_5k_planner.athlete import AthleteConfig
+from daniels_5k_planner.device_export import WorkoutFileExporter
+from daniels_5k_planner.facade_5k import build_5k_phase_sequence_simple
+from daniels_5k_planner.selection import WeeklySessionSelector
+from daniels_5k_planner.sessions import build_5k_session_library
+
+TCX_NS = {"tcx": "http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2"}
+XSI_TYPE = "{http://www.w3.org/2001/XMLSchema-instance}type"
+
+
+def _plan():
+    athlete = AthleteConfig(name="Zé", frequency_per_week=5)
+    return WeeklySessionSelector(athlete, build_5k_session_library()).build_plan(build_5k_phase_sequence_simple(8))
+
+
+def _crc16_bitwise(data):
+    # implementação independente (bit a bit) do CRC do FIT, sem tabela
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def _fit_messages(data):
+    """(global_num, bytes) de cada mensagem de dados, só com cabeçalhos normais."""
+    header_size = data[0]
+    end = header_size + struct.unpack_from("<I", data, 4)[0]
+    pos, local, out = header_size, {}, []
+    while pos < end:
+        head = data[pos]
+        pos += 1
+        assert not head & 0x80, "cabeçalho comprimido inesperado"
+        if head & 0x40:
+            global_num, n_fields = struct.unpack_from("<HB", data, pos + 2)
+            sizes = [data[pos + 5 + 3 * i + 1] for i in range(n_fields)]
+            local[head & 0x0F] = (global_num, sum(sizes))
+            pos += 5 + 3 * n_fields
+        else:
+            global_num, size = local[head & 0x0F]
+            out.append((global_num, data[pos:pos + size]))
+            pos += size
+    assert pos == end
+    return out
+
+
+def test_fit_files_have_valid_header_and_file_crc():
+    plan = _plan()
+    files = list(WorkoutFileExporter(time_created=0).iter_plan_fit(plan, "Zé", 50.0))
+    assert len(files) == plan.n_sessions
+    for _, data in files:
+        assert data[0] == 14 and data[8:12] == b".FIT"
+        assert struct.unpack_from("<I", data, 4)[0] == len(data) - 16
+        assert struct.unpack_from("<H", data, 12)[0] == _crc16_bitwise(data[:12])
+        assert struct.unpack_from("<H", data, len(data) - 2)[0] == _crc16_bitwise(data[14:-2])
+
+
+@pytest.mark.parametrize("vdot", [38.0, 61.3])
+def test_fit_step_count_matches_workout_message(vdot):
+    exporter = WorkoutFileExporter(time_created=0)
+    for tpl in _plan().templates[:40]:
+        messages = _fit_messages(exporter.fit_bytes(tpl, vdot))
+        assert [g for g, _ in messages[:2]] == [0, 26]
+        num_steps = struct.unpack_from("<H", messages[1][1], 1)[0]
+        assert sum(1 for g, _ in messages if g == 27) == num_steps > 0
+
+
+def test_tcx_parses_with_one_workout_per_session():
+    plan = _plan()
+    root = ET.fromstring(WorkoutFileExporter().plan_to_tcx(plan, 50.0).encode("utf-8"))
+    workouts = root.findall("tcx:Workouts/tcx:Workout", TCX_NS)
+    assert len(workouts) == plan.n_sessions
+    for workout in workouts:
+        assert workout.get("Sport") == "Running"
+        assert len(workout.find("tcx:Name", TCX_NS).text) <= 15
+        ids = [int(e.text) for e in workout.iter(f"{{{TCX_NS['tcx']}}}StepId")]
+        assert ids == list(range(1, len(ids) + 1))
+        for repeat in workout.findall("tcx:Step", TCX_NS):
+            if repeat.get(XSI_TYPE) == "Repeat_t":
+                assert int(repeat.find("tcx:Repetitions", TCX_NS).text) >= 1
+                assert repeat.findall("tcx:Child", TCX_NS)
+        for speed in workout.iter(f"{{{TCX_NS['tcx']}}}SpeedZone"):
+            low = float(speed.find("tcx:LowInMetersPerSecond", TCX_NS).text)
+            high = float(speed.find("tcx:HighInMetersPerSecond", TCX_NS).text)
+            assert 0 < low <= high
@@ -0,0 +1,42 @@
+import json
+
+import pandas as pd
+
+from daniels_5k_planner.diff import DIFF_KEY, PATCH_VERSION, apply_plan_patch, diff_plans
+from daniels_5k_planner.facade_5k import generate_5k_plan_from_race
+
+
+def _plan(weeks):
+    df, _ = generate_5k_plan_from_race("Ana", 5.0, 22.0, frequency_per_week=5, total_weeks=weeks)
+    return df
+
+
+def _sorted(df):
+    return df.sort_values(list(DIFF_KEY), kind="stable").reset_index(drop=True)
+
+
+def test_patch_round_trip_rebuilds_new_plan():
+    old = _plan(8)
+    new = old.copy()
+    new.loc[3, "planned_distance_km"] += 1.5
+    new.loc[5, "description"] = "Ajustado"
+    new = new.drop(index=[0, 1])
+    extra = old.iloc[[2]].copy()
+    extra["week"] = 9
+    new = pd.concat([new, extra], ignore_index=True)
+
+    diff = diff_plans(old, new)
+    assert len(diff.added) == 1 and len(diff.removed) == 2
+    assert sorted(set(f for m in diff.modified for f in m["changes"])) == ["description", "planned_distance_km"]
+
+    patch = json.loads(json.dumps(diff.to_patch()))
+    assert patch["v"] == PATCH_VERSION
+    rebuilt = apply_plan_patch(old, patch)
+    pd.testing.assert_frame_equal(rebuilt, _sorted(new[old.columns]))
+
+
+def test_identical_plans_give_empty_patch():
+    old = _plan(6)
+    diff = diff_plans(old, old.sample(frac=1.0, random_state=0))
+    assert diff.is_empty
+    pd.testing.assert_frame_equal(apply_plan_patch(old, diff.to_patch()), _sorted(old))
@@ -0,0 +1,52 @@
+import math
+from itertools import combinations, combinations_with_replacement
+
+from daniels_5k_planner.athlete import AthleteConfig
+from daniels_5k_planner.facade_5k import build_5k_phase_sequence_simple
+from daniels_5k_planner.selection import WeeklySessionSelector
+from daniels_5k_planner.sessions import build_5k_session_library
+from daniels_5k_planner.volume import WeeklyVolumePlanner
+
+ATHLETE = AthleteConfig(name="A", frequency_per_week=5)
+PHASES = build_5k_phase_sequence_simple(16)
+
+
+def _cost(target, total):
+    return abs(math.log(target / total))
+
+
+def test_distance_mode_picks_total_closest_to_target():
+    targets = WeeklyVolumePlanner(ATHLETE).compute_weekly_targets(PHASES)
+    selector = WeeklySessionSelector(ATHLETE, build_5k_session_library(), selection_mode="distance")
+    plan = selector.build_plan(PHASES, targets)
+    bucket = selector.distance_bucket_km
+    easy_pool = [t.base_distance_km for t in selector.index.get(selector.index.query(phase="Base", main_zones=["E"]))]
+
+    # a escolha é feita em unidades de bucket: cada distância-base é arredondada ao bucket
+    totals = [0] * plan.n_weeks
+    for week, _, _, tpl, _ in plan.iter_sessions():
+        totals[week - plan.first_week] += round(tpl.base_distance_km / bucket)
+
+    for w, phase in enumerate(PHASES):
+        n_quality, n_easy, _ = selector._week_shape(phase)
+        phase_pool = [t.base_distance_km for t in selector.session_lib[phase]]
+        q_sums = {sum(round(d / bucket) for d in c) for c in combinations(phase_pool, n_quality)}
+        e_sums = {sum(round(d / bucket) for d in c) for c in combinations_with_replacement(easy_pool, n_easy)}
+        target = targets[w] / bucket
+        best = min(_cost(target, q + e) for q in q_sums for e in e_sums)
+        assert _cost(target, totals[w]) <= best + 1e-12, (w, phase, totals[w], target)
+
+
+def test_distance_mode_is_closer_than_rotation():
+    targets = WeeklyVolumePlanner(ATHLETE).compute_weekly_targets(PHASES)
+
+    def error(mode):
+        plan = WeeklySessionSelector(ATHLETE, build_5k_session_library(), selection_mode=mode).build_plan(
+            PHASES, targets
+        )
+        totals = [0.0] * plan.n_weeks
+        for week, _, _, tpl, _ in plan.iter_sessions():
+            totals[week - plan.first_week] += tpl.base_distance_km
+        return sum(_cost(t, s) for t, s in zip(targets, totals))
+
+    assert error("distance") < error("rotation")
@@ -0,0 +1,25 @@
+import pytest
+
+from daniels_5k_planner.facade_5k import build_5k_phase_sequence_simple
+
+CLASSIC_ORDER = ["Base", "EarlyQ", "Threshold", "Interval", "Repetition", "RS", "Taper"]
+
+
+@pytest.mark.parametrize("total_weeks", [6, 7, 8])
+def test_short_sequences_keep_taper(total_weeks):
+    seq = build_5k_phase_sequence_simple(total_weeks)
+    assert len(seq) == total_weeks
+    assert seq[-1] == "Taper"
+    assert "RS" in seq
+    assert [CLASSIC_ORDER.index(p) for p in seq] == sorted(CLASSIC_ORDER.index(p) for p in seq)
+
+
+def test_six_weeks_drops_lowest_priority_phase():
+    assert build_5k_phase_sequence_simple(6) == [
+        "EarlyQ", "Threshold", "Interval", "Repetition", "RS", "Taper",
+    ]
+
+
+@pytest.mark.parametrize("total_weeks", range(1, 21))
+def test_sequence_length_matches(total_weeks):
+    assert len(build_5k_phase_sequence_simple(total_weeks)) == total_weeks
@@ -0,0 +1,58 @@
+import itertools
+import json
+
+import numpy as np
+
+from daniels_5k_planner.athlete import AthleteConfig
+from daniels_5k_planner.feedback import FeedbackEngine, WeeklyFeedback
+from daniels_5k_planner.feedback_rules import DEFAULT_FEEDBACK_RULES, FeedbackRuleSet
+from daniels_5k_planner.simulation import feedback_engine_policy
+
+COMPLETED = [3.0, 5.9, 6.0, 8.9, 9.0, 10.0, 11.0, 11.1, 13.0]
+SCORES = [None, 1, 5, 6, 7, 8, 10]
+
+
+def _legacy_chain(fb):
+    """Cadeia if/elif original de ``FeedbackEngine.compute_adjustment_from_week``."""
+    a = fb.completed_volume_km / max(fb.planned_volume_km, 1e-3)
+    fatigue = fb.fatigue_score if fb.fatigue_score is not None else 5
+    soreness = fb.soreness_score if fb.soreness_score is not None else 5
+    if a < 0.6 or fatigue >= 8 or soreness >= 8:
+        return 0.8, 0.7, "Redução forte por baixa adesão ou fadiga/dor alta."
+    if a < 0.9 or fatigue >= 7:
+        return 0.9, 0.85, "Redução moderada de volume e qualidade."
+    if 0.9 <= a <= 1.1 and fatigue <= 6 and soreness <= 6:
+        return 1.0, 1.0, "Manter progressão planejada."
+    if a > 1.1 and fatigue <= 5 and soreness <= 5:
+        return 1.05, 1.05, "Atleta suportando bem — leve aumento permitido."
+    return 1.0, 1.0, "Situação intermediária — manter plano."
+
+
+def _grid():
+    return [
+        WeeklyFeedback(week=1, planned_volume_km=10.0, completed_volume_km=c, missed_workouts=0,
+                       fatigue_score=f, soreness_score=s)
+        for c, f, s in itertools.product(COMPLETED, SCORES, SCORES)
+    ]
+
+
+def test_default_rules_match_legacy_chain():
+    feedbacks = _grid()
+    adjustments = FeedbackEngine(AthleteConfig(name="A", frequency_per_week=5)).compute_adjustments(feedbacks)
+    for fb, adj in zip(feedbacks, adjustments):
+        assert (adj.volume_factor, adj.quality_bias, adj.comment) == _legacy_chain(fb), fb
+
+
+def test_policy_and_json_rules_match_engine():
+    feedbacks = _grid()
+    adherence = np.array([fb.completed_volume_km / fb.planned_volume_km for fb in feedbacks])
+    fatigue = np.array([np.nan if fb.fatigue_score is None else fb.fatigue_score for fb in feedbacks])
+    soreness = np.array([np.nan if fb.soreness_score is None else fb.soreness_score for fb in feedbacks])
+    expected = np.array([_legacy_chain(fb)[:2] for fb in feedbacks])
+
+    volume, quality, _ = feedback_engine_policy(adherence, fatigue, soreness)
+    np.testing.assert_array_equal(np.stack([volume, quality], axis=1), expected)
+
+    from_json = FeedbackRuleSet(json.loads(json.dumps(DEFAULT_FEEDBACK_RULES)))
+    volume, quality, _ = from_json(adherence, fatigue, soreness)
+    np.testing.assert_array_equal(np.stack([volume, quality], axis=1), expected)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from daniels_5k_planner.device_export import WorkoutFileExporter
+from daniels_5k_planner.athlete import AthleteConfig
+from daniels_5k_planner.facade_5k import build_5k_phase_sequence_simple
+from daniels_5k_planner.hashing import plan_hash
+from daniels_5k_planner.pacing import weekly_plan_to_workouts
+from daniels_5k_planner.selection import WeeklySessionSelector
+from daniels_5k_planner.sessions import build_5k_session_library
+from daniels_5k_planner.zones import DanielsZones
+
+
+def _interval_template():
+    return build_5k_session_library()["Interval"][0]
+
+
+def test_template_hash_follows_in_place_edits():
+    tpl = _interval_template()
+    before = tpl.content_hash
+    tpl.main[0].reps += 1
+    assert tpl.content_hash != before
+
+
+def test_workout_hash_follows_in_place_edits():
+    athlete = AthleteConfig(name="A", frequency_per_week=4)
+    plan = WeeklySessionSelector(athlete, build_5k_session_library()).build_plan(
+        build_5k_phase_sequence_simple(8)
+    )
+    workouts = weekly_plan_to_workouts(plan, athlete, DanielsZones(50.0).build_records())
+    workout_before, plan_before = workouts[0].content_hash, plan_hash(workouts)
+    workouts[0].planned_distance_km += 1.0
+    assert workouts[0].content_hash != workout_before
+    assert plan_hash(workouts) != plan_before
+
+
+def test_fit_cache_misses_after_template_edit():
+    exporter = WorkoutFileExporter(time_created=0)
+    tpl = _interval_template()
+    before = exporter.fit_bytes(tpl, 50.0)
+    tpl.main[0].reps += 1
+    assert exporter.fit_bytes(tpl, 50.0) != before
+
+
+def test_index_positions_follow_in_place_template_edits():
+    import pickle
+
+    from daniels_5k_planner.library import SessionLibraryIndex
+
+    index = SessionLibraryIndex(build_5k_session_library())
+    copy = pickle.loads(pickle.dumps(index.templates))
+    version = index.version
+    np.testing.assert_array_equal(index.positions_of(copy), np.arange(len(copy)))
+
+    index.templates[0].description += " (editado)"
+    assert index.version != version
+    with pytest.raises(ValueError):
+        index.positions_of(copy)
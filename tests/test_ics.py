@@ -0,0 +1,104 @@
+import io
+from datetime import date
+
+from daniels_5k_planner.ics import IcsCalendarExporter, athlete_key, event_uid, write_plan_ics
+
+
+def _rows(athlete, weeks=2):
+    return [
+        {
+            "athlete": athlete, "week": w, "day_of_week": d, "session_name": "Easy",
+            "session_code": "E1", "main_zones": "E", "planned_distance_km": 8.0 + w,
+            "description": "Rodagem",
+        }
+        for w in range(1, weeks + 1)
+        for d in (2, 4)
+    ]
+
+
+def test_accented_names_do_not_collide():
+    assert athlete_key("Zé") != athlete_key("Zá")
+    assert athlete_key("Zé").startswith("ze-")
+    assert event_uid("Zé", 1, 2) != event_uid("Zá", 1, 2)
+
+
+def test_write_per_athlete_keeps_every_calendar(tmp_path):
+    rows = _rows("Zé") + _rows("Zá")
+    result = IcsCalendarExporter(date(2026, 1, 5)).write_per_athlete(rows, tmp_path)
+    files = sorted(tmp_path.glob("*.ics"))
+    assert len(files) == 2
+    on_disk = sum(f.read_text(encoding="utf-8").count("BEGIN:VEVENT") for f in files)
+    assert on_disk == result.events == len(rows)
+
+
+def _export(rows, state_path, only_changed=True):
+    out = io.StringIO()
+    result = write_plan_ics(rows, out, date(2026, 1, 5), state_path=state_path, only_changed=only_changed)
+    return result, out.getvalue()
+
+
+def test_delta_survives_a_new_process(tmp_path):
+    state = tmp_path / "state.json"
+    rows = _rows("Ana", weeks=3)
+    first, _ = _export(rows, state)
+    assert first.events == len(rows)
+
+    # nova execução, novo exportador: nada mudou, nada é escrito
+    again, text = _export(rows, state)
+    assert again.events == 0 and not again.changed and "BEGIN:VEVENT" not in text
+
+    edited = [dict(r) for r in rows[:-1]]
+    edited[0]["planned_distance_km"] = 20.0
+    delta, text = _export(edited, state)
+    assert delta.changed == [event_uid("Ana", 1, 2)]
+    assert delta.removed == [event_uid("Ana", 3, 4)]
+    assert "SEQUENCE:1" in text and "STATUS:CANCELLED" in text
+
+
+def test_state_round_trip_keeps_sequence_and_dtstamp():
+    exporter = IcsCalendarExporter(date(2026, 1, 5))
+    original = io.StringIO()
+    exporter.write(_rows("Ana"), original)
+
+    restored = IcsCalendarExporter(date(2026, 1, 5), state=exporter.get_state())
+    assert restored.get_state() == exporter.get_state()
+    again = io.StringIO()
+    restored.write(_rows("Ana"), again)
+    assert again.getvalue() == original.getvalue()
+
+
+def test_full_export_still_cancels_removed_sessions():
+    exporter = IcsCalendarExporter(date(2026, 1, 5))
+    exporter.write(_rows("Ana", weeks=2), io.StringIO())
+    out = io.StringIO()
+    result = exporter.write(_rows("Ana", weeks=1), out)
+    assert result.removed == [event_uid("Ana", 2, 2), event_uid("Ana", 2, 4)]
+    assert out.getvalue().count("STATUS:CANCELLED") == 2
+
+
+def test_missing_athlete_is_cancelled_only_when_covered():
+    exporter = IcsCalendarExporter(date(2026, 1, 5))
+    exporter.write(_rows("Ana") + _rows("Bia"), io.StringIO())
+
+    # Bia fora do plano e fora de ``athletes``: estado dela fica intocado
+    result = exporter.write(_rows("Ana"), io.StringIO())
+    assert result.removed == []
+    assert "Bia" in exporter.get_state()["athletes"]
+
+    out = io.StringIO()
+    result = exporter.write(_rows("Ana"), out, athletes=["Ana", "Bia"])
+    assert len(result.removed) == len(_rows("Bia"))
+    assert out.getvalue().count("STATUS:CANCELLED") == len(_rows("Bia"))
+    state = exporter.get_state()
+    assert "Bia" not in state["athletes"]
+    assert len(state["events"]) == len(_rows("Ana"))
+
+
+def test_write_per_athlete_cancels_inside_each_calendar(tmp_path):
+    exporter = IcsCalendarExporter(date(2026, 1, 5))
+    exporter.write_per_athlete(_rows("Ana") + _rows("Bia"), tmp_path)
+    exporter.write_per_athlete(_rows("Ana", weeks=1), tmp_path, athletes=["Bia"])
+    ana = (tmp_path / f"{athlete_key('Ana')}.ics").read_text(encoding="utf-8")
+    bia = (tmp_path / f"{athlete_key('Bia')}.ics").read_text(encoding="utf-8")
+    assert ana.count("STATUS:CANCELLED") == 2 and ana.rstrip().endswith("END:VCALENDAR")
+    assert bia.count("STATUS:CANCELLED") == 4 and bia.count("BEGIN:VEVENT") == 4
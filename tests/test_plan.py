@@ -0,0 +1,52 @@
+import pickle
+
+import numpy as np
+
+from daniels_5k_planner.athlete import AthleteConfig
+from daniels_5k_planner.facade_5k import build_5k_phase_sequence_simple
+from daniels_5k_planner.plan import WeeklyPlan
+from daniels_5k_planner.selection import WeeklySessionSelector
+from daniels_5k_planner.sessions import build_5k_session_library
+
+ATHLETE = AthleteConfig(name="A", frequency_per_week=5)
+PHASES = build_5k_phase_sequence_simple(16)
+
+
+def _selector():
+    return WeeklySessionSelector(ATHLETE, build_5k_session_library())
+
+
+def _slots(plan):
+    return [(w, day, tpl.content_hash) for w, _, day, tpl, _ in plan.iter_sessions()]
+
+
+def test_concat_accepts_unpickled_shard():
+    serial = _selector().build_plan(PHASES)
+    head = _selector().build_plan(PHASES, start_week=0, end_week=7)
+    tail = pickle.loads(pickle.dumps(_selector().build_plan(PHASES, start_week=7)))
+    assert tail.templates is not head.templates
+
+    joined = WeeklyPlan.concat([head, tail])
+    assert joined.templates is head.templates
+    assert joined.n_weeks == serial.n_weeks
+    np.testing.assert_array_equal(joined.template_idx, serial.template_idx)
+    np.testing.assert_array_equal(joined.day_of_week, serial.day_of_week)
+    assert _slots(joined) == _slots(serial)
+
+
+def test_concat_appends_templates_missing_from_first_table():
+    head = _selector().build_plan(PHASES, start_week=0, end_week=7)
+    tail = pickle.loads(pickle.dumps(_selector().build_plan(PHASES, start_week=7)))
+    used = sorted(set(head.template_idx.tolist()))
+    head = WeeklyPlan(
+        templates=[head.templates[i] for i in used],
+        phases=head.phases,
+        week_offsets=head.week_offsets,
+        day_of_week=head.day_of_week,
+        template_idx=np.searchsorted(used, head.template_idx).astype(head.template_idx.dtype),
+        planned_distance_km=head.planned_distance_km,
+        first_week=head.first_week,
+    )
+    joined = WeeklyPlan.concat([head, tail])
+    assert joined.templates[:len(used)] == head.templates
+    assert _slots(joined) == _slots(head) + _slots(tail)
@@ -0,0 +1,18 @@
+import numpy as np
+
+from daniels_5k_planner.facade_5k import estimate_vdot_from_race
+from daniels_5k_planner.prediction import predict_race_time, vdot_from_race_array
+
+
+def test_predicted_time_round_trips_through_facade_estimate():
+    vdots = np.linspace(30.0, 80.0, 11)
+    for distance_km in (1.5, 5.0, 21.0975):
+        times = predict_race_time(vdots, distance_km)
+        back = [estimate_vdot_from_race(distance_km, t) for t in times]
+        np.testing.assert_allclose(back, vdots, rtol=1e-9)
+
+
+def test_array_estimate_matches_scalar_facade():
+    times = np.array([18.0, 22.5, 31.0])
+    expected = [estimate_vdot_from_race(5.0, t) for t in times]
+    np.testing.assert_array_equal(vdot_from_race_array(5.0, times), expected)
@@ -0,0 +1,57 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from daniels_5k_planner.athlete import AthleteConfig
+from daniels_5k_planner.facade_5k import build_5k_phase_sequence_simple
+from daniels_5k_planner.quality import apply_quality_bias
+from daniels_5k_planner.selection import WeeklySessionSelector
+from daniels_5k_planner.sessions import build_5k_session_library
+
+ATHLETE = AthleteConfig(name="A", frequency_per_week=5)
+PHASES = build_5k_phase_sequence_simple(12)
+
+
+def _plan():
+    selector = WeeklySessionSelector(ATHLETE, build_5k_session_library())
+    return selector, selector.build_plan(PHASES)
+
+
+def _codes(plan):
+    return [tpl.code for _, _, _, tpl, _ in plan.iter_sessions()]
+
+
+def test_unpickled_plan_matches_live_plan():
+    selector, live = _plan()
+    restored = pickle.loads(pickle.dumps(live))
+    assert restored.templates is not selector.index.templates
+
+    apply_quality_bias(live, 0.7, 3, selector.index)
+    apply_quality_bias(restored, 0.7, 3, selector.index)
+    assert restored.templates is selector.index.templates
+    assert _codes(restored) == _codes(live)
+    np.testing.assert_allclose(restored.planned_distance_km, live.planned_distance_km)
+
+
+def test_plans_are_edited_in_place():
+    selector, plan = _plan()
+    before = plan.planned_distance_km.copy()
+    out = apply_quality_bias(plan, 0.7, 3, selector.index)
+    assert out[0] is plan
+    assert not np.array_equal(plan.planned_distance_km, before)
+
+
+def test_template_missing_from_index_is_rejected():
+    selector, plan = _plan()
+    other = pickle.loads(pickle.dumps(plan))
+    other.templates[int(other.template_idx[0])].base_distance_km += 1.0
+    with pytest.raises(ValueError):
+        apply_quality_bias(other, 0.7, 3, selector.index)
+
+
+def test_quality_mask_matches_template_zones():
+    selector, _ = _plan()
+    expected = [any(z in ("T", "I", "R") for z in t.main_zones) for t in selector.index.templates]
+    assert selector.index.quality_mask.tolist() == expected
+    assert [t.is_quality for t in selector.index.templates] == expected
@@ -0,0 +1,62 @@
+from collections import defaultdict
+
+import pytest
+
+from daniels_5k_planner.athlete import AthleteConfig
+from daniels_5k_planner.facade_5k import build_5k_phase_sequence_simple
+from daniels_5k_planner.scheduling import SchedulingConstraints, solve_week_layout
+from daniels_5k_planner.selection import WeeklySessionSelector
+from daniels_5k_planner.sessions import build_5k_session_library
+
+PHASES = build_5k_phase_sequence_simple(16)
+
+
+def _weeks(frequency, constraints):
+    athlete = AthleteConfig(name="A", frequency_per_week=frequency)
+    plan = WeeklySessionSelector(athlete, build_5k_session_library(), constraints=constraints).build_plan(PHASES)
+    weeks = defaultdict(list)
+    for week, _, day, tpl, _ in plan.iter_sessions():
+        weeks[week].append((day, tpl))
+    return weeks
+
+
+def _consecutive(days, wrap=True):
+    days = set(days)
+    pairs = [(d, d + 1) for d in range(1, 7)] + ([(7, 1)] if wrap else [])
+    return [p for p in pairs if p[0] in days and p[1] in days]
+
+
+@pytest.mark.parametrize("frequency", [3, 4, 5, 6])
+def test_no_quality_on_consecutive_days(frequency):
+    constraints = SchedulingConstraints(available_days=(1, 2, 3, 4, 5, 6, 7))
+    for week, sessions in _weeks(frequency, constraints).items():
+        quality_days = [day for day, tpl in sessions if tpl.is_quality]
+        assert not _consecutive(quality_days), (week, quality_days)
+
+
+@pytest.mark.parametrize("long_run_days", [(6,), (7,), (6, 7)])
+def test_long_run_only_on_allowed_days(long_run_days):
+    constraints = SchedulingConstraints(available_days=(1, 2, 4, 6, 7), long_run_days=long_run_days)
+    for week, sessions in _weeks(5, constraints).items():
+        easy = [(tpl.base_distance_km, day) for day, tpl in sessions if not tpl.is_quality]
+        if not easy:
+            continue
+        longest = max(km for km, _ in easy)
+        assert any(day in long_run_days for km, day in easy if km == longest), (week, easy)
+
+
+def test_sessions_stay_on_available_days():
+    constraints = SchedulingConstraints(available_days=(2, 4, 6))
+    for sessions in _weeks(5, constraints).values():
+        assert {day for day, _ in sessions} <= {2, 4, 6}
+
+
+def test_quality_is_demoted_when_spacing_cannot_hold():
+    constraints = SchedulingConstraints(available_days=(1, 2, 3), long_run_days=())
+    layout = solve_week_layout(constraints, (1, 2, 3), n_quality=2, n_easy=1)
+    quality_days = [day for day, is_quality, _ in layout if is_quality]
+    assert quality_days == [1, 3]
+    layout = solve_week_layout(
+        SchedulingConstraints(available_days=(1, 2), long_run_days=()), (1, 2), n_quality=2, n_easy=0
+    )
+    assert sum(is_quality for _, is_quality, _ in layout) == 1
@@ -0,0 +1,58 @@
+import pytest
+
+from daniels_5k_planner.athlete import AthleteConfig
+from daniels_5k_planner.facade_5k import build_5k_phase_sequence_simple
+from daniels_5k_planner.selection import SelectorState, WeeklySessionSelector
+from daniels_5k_planner.sessions import build_5k_session_library
+from daniels_5k_planner.volume import WeeklyVolumePlanner
+
+ATHLETE = AthleteConfig(name="A", frequency_per_week=5)
+PHASES = build_5k_phase_sequence_simple(16)
+
+
+def _selector(mode="rotation"):
+    return WeeklySessionSelector(ATHLETE, build_5k_session_library(), selection_mode=mode)
+
+
+def _targets():
+    return WeeklyVolumePlanner(ATHLETE).compute_weekly_targets(PHASES)
+
+
+def _slots(plan):
+    return [(w, day, tpl.content_hash) for w, _, day, tpl, _ in plan.iter_sessions()]
+
+
+@pytest.mark.parametrize("mode", ["rotation", "distance"])
+def test_resume_from_checkpoint_continues_at_saved_week(mode):
+    targets = _targets()
+    full = _selector(mode).build_plan(PHASES, targets)
+
+    first = _selector(mode)
+    first.build_plan(PHASES, targets, end_week=5)
+    state = SelectorState.from_dict(first.get_state().to_dict())
+    assert state.week == 5
+
+    resumed = _selector(mode)
+    resumed.set_state(state)
+    rest = resumed.build_plan(PHASES, targets)
+    assert rest.first_week == 6
+    assert rest.n_weeks == len(PHASES) - 5
+    assert _slots(rest) == _slots(full)[-rest.n_sessions:]
+
+
+def test_repeated_build_weekly_plan_returns_full_plan():
+    selector = _selector()
+    first = selector.build_weekly_plan(PHASES)
+    second = selector.build_weekly_plan(PHASES)
+    assert len(first) == len(second) > 0
+    assert [w["week"] for w in second] == list(range(1, len(PHASES) + 1))
+    assert [[s["day_of_week"] for s in w["sessions"]] for w in first] == [
+        [s["day_of_week"] for s in w["sessions"]] for w in second
+    ]
+
+
+def test_resume_is_consumed_by_one_build():
+    selector = _selector()
+    selector.set_state(SelectorState(week=5))
+    assert selector.build_plan(PHASES).first_week == 6
+    assert selector.build_plan(PHASES).first_week == 1
@@ -0,0 +1,15 @@
+import numpy as np
+
+from daniels_5k_planner.athlete import AthleteConfig
+from daniels_5k_planner.simulation import simulate_feedback
+
+ATHLETE = AthleteConfig(name="A", frequency_per_week=5)
+
+
+def test_result_does_not_depend_on_executor_or_workers():
+    kwargs = dict(n_athletes=250, total_weeks=8, seed=7, chunk_athletes=100)
+    serial = simulate_feedback(ATHLETE, executor="serial", **kwargs)
+    pooled = simulate_feedback(ATHLETE, executor="process", max_workers=2, **kwargs)
+    np.testing.assert_array_equal(serial.realized_volume, pooled.realized_volume)
+    np.testing.assert_array_equal(serial.volume_factor, pooled.volume_factor)
+    np.testing.assert_array_equal(serial.branch_counts, pooled.branch_counts)
@@ -0,0 +1,71 @@
+import pandas as pd
+
+from daniels_5k_planner.athlete import AthleteConfig
+from daniels_5k_planner.facade_5k import generate_5k_plan_from_race
+from daniels_5k_planner.feedback import CompletedWorkoutFeedback, WeeklyFeedback
+from daniels_5k_planner.pacing import PLAN_COLUMNS
+from daniels_5k_planner.storage import PlanRepository
+
+ATHLETES = [
+    AthleteConfig(name="Ana", frequency_per_week=5),
+    AthleteConfig(name="Zé", frequency_per_week=4, initial_weekly_volume=25.0, peak_weekly_volume=40.0),
+]
+
+
+def _plans():
+    frames = [
+        generate_5k_plan_from_race(a.name, 5.0, 22.0 + i, frequency_per_week=a.frequency_per_week, total_weeks=6)[0]
+        for i, a in enumerate(ATHLETES)
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_plan_round_trip_across_connections(tmp_path):
+    path = tmp_path / "plans.sqlite"
+    plan = _plans()
+    with PlanRepository(path, batch_size=7) as repo:
+        repo.save_athletes(ATHLETES)
+        assert repo.save_plans(plan, note="inicial") == {"Ana": 1, "Zé": 1}
+
+    with PlanRepository(path) as repo:
+        assert repo.load_athletes() == ATHLETES
+        loaded = repo.load_plan_dataframe()
+        assert set(loaded["plan_version"]) == {1}
+        pd.testing.assert_frame_equal(
+            loaded[PLAN_COLUMNS], plan[PLAN_COLUMNS].reset_index(drop=True), check_dtype=False
+        )
+        weeks = repo.load_plan_dataframe(athletes=["Zé"], weeks=(2, 3))
+        assert set(weeks["athlete"]) == {"Zé"} and set(weeks["week"]) == {2, 3}
+
+
+def test_new_version_keeps_the_previous_one():
+    plan = _plans()
+    with PlanRepository() as repo:
+        repo.save_athletes(ATHLETES)
+        repo.save_plans(plan)
+        edited = plan.copy()
+        edited["planned_distance_km"] *= 0.9
+        assert repo.save_plans(edited[edited["athlete"] == "Ana"], note="ajuste") == {"Ana": 2}
+
+        latest = repo.load_plan_dataframe(athletes=["Ana"])
+        assert set(latest["plan_version"]) == {2}
+        first = repo.load_plan_dataframe(athletes=["Ana"], version=1)
+        ana = plan[plan["athlete"] == "Ana"].reset_index(drop=True)
+        pd.testing.assert_series_equal(first["planned_distance_km"], ana["planned_distance_km"])
+        assert [v["note"] for v in repo.plan_versions("Ana")] == ["", "ajuste"]
+        assert set(repo.load_plan_dataframe(athletes=["Zé"])["plan_version"]) == {1}
+
+
+def test_feedback_round_trip():
+    weekly = [
+        WeeklyFeedback(week=1, planned_volume_km=30.0, completed_volume_km=27.5, missed_workouts=1,
+                       avg_rpe_quality=7.5, fatigue_score=6, soreness_score=None, notes="ok"),
+        WeeklyFeedback(week=2, planned_volume_km=32.0, completed_volume_km=32.0, missed_workouts=0),
+    ]
+    session = CompletedWorkoutFeedback(week=1, day_of_week=3, completed_distance_km=9.2, rpe=8)
+    with PlanRepository(batch_size=1) as repo:
+        repo.save_athletes(ATHLETES)
+        assert repo.save_feedback([("Ana", weekly[0]), ("Ana", session), ("Ana", weekly[1])]) == 3
+        assert repo.load_weekly_feedback("Ana") == weekly
+        per_session = repo.load_feedback_dataframe(per_workout=True)
+        assert per_session[["week", "day_of_week", "rpe"]].values.tolist() == [[1, 3, 8]]
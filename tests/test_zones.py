@@ -0,0 +1,14 @@
+from daniels_5k_planner.zones import DanielsZones, zone_records_for_vdots
+
+
+def test_build_records_matches_batched_records():
+    vdots = [35.0, 50.0, 62.5]
+    assert [DanielsZones(v).build_records() for v in vdots] == zone_records_for_vdots(vdots)
+
+
+def test_build_records_uses_instance_fractions():
+    zones = DanielsZones(50.0)
+    zones.zone_fractions["T"] = (0.86, 0.90)
+    threshold = next(r for r in zones.build_records() if r["zone"] == "T")
+    assert (threshold["fraction_slow"], threshold["fraction_fast"]) == (0.86, 0.90)
+    assert threshold["vo2_slow"] == 0.86 * 50.0
@@ -1,6 +1,8 @@
 
-from typing import List, Dict
+from typing import List, Dict, Union
+import numpy as np
 from .athlete import AthleteConfig
+from .plan import WeeklyPlan
 
 class WeeklyVolumePlanner:
     def __init__(self, athlete: AthleteConfig):
@@ -48,9 +50,24 @@ class WeeklyVolumePlanner:
             targets.append(Vw * factor)
         return targets
 
-    def apply_volume_to_plan(self, weekly_plan: List[Dict], weekly_targets: List[float]) -> List[Dict]:
-        if len(weekly_plan) != len(weekly_targets):
+    def _apply_volume_in_place(self, plan: WeeklyPlan, weekly_targets: List[float]) -> WeeklyPlan:
+        base = plan.base_distance_km()
+        week_of_slot = plan.week_of_slot()
+        base_sum = np.bincount(week_of_slot, weights=np.where(base > 0, base, 0.0), minlength=plan.n_weeks)
+        targets = np.asarray(weekly_targets, dtype=np.float64)
+        scale = np.divide(targets, base_sum, out=np.ones_like(targets), where=base_sum > 0)
+        np.multiply(base, scale[week_of_slot], out=plan.planned_distance_km)
+        return plan
+
+    def apply_volume_to_plan(
+        self, weekly_plan: Union[WeeklyPlan, List[Dict]], weekly_targets: List[float]
+    ) -> Union[WeeklyPlan, List[Dict]]:
+        """Escala as sessões para a meta semanal. Um ``WeeklyPlan`` é atualizado in-place."""
+        n_weeks = weekly_plan.n_weeks if isinstance(weekly_plan, WeeklyPlan) else len(weekly_plan)
+        if n_weeks != len(weekly_targets):
             raise ValueError("weekly_plan e weekly_targets têm tamanhos diferentes.")
+        if isinstance(weekly_plan, WeeklyPlan):
+            return self._apply_volume_in_place(weekly_plan, weekly_targets)
         new_plan = []
         for week_idx, week_data in enumerate(weekly_plan):
             target_vol = weekly_targets[week_idx]
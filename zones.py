@@ -1,102 +1,166 @@
+from __future__ import annotations
 
-import pandas as pd
-import numpy as np
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 
-class DanielsZones:
-    """
-    Calculadora de zonas oficiais de Daniels (E/M/T/I/R) para um VDOT dado.
-    Produz um DataFrame profissional com metadados.
-    """
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
 
-    def __init__(self, vdot: float):
-        self.vdot = float(vdot)
+# Ritmos são guardados como códigos inteiros (segundos por km); a string "mm:ss"
+# de cada código é formatada uma única vez e compartilhada.
+PACE_TABLE_MAX_CODE = 3599
+_pace_strings: List[str] = []
 
-        # Frações fisiológicas slow–fast (%VO2max)
-        self.zone_fractions = {
-            "E": (0.65, 0.78),
-            "M": (0.83, 0.87),
-            "T": (0.88, 0.92),
-            "I": (0.97, 1.00),
-            "R": (1.05, 1.10),
-        }
-
-        # Metadados
-        self.zone_meta = {
-            "E": ("Easy", "Aerobic endurance / recovery", 1),
-            "M": ("Marathon", "Specific endurance / economy", 2),
-            "T": ("Threshold", "Lactate steady-state", 3),
-            "I": ("Interval", "VO2max development", 4),
-            "R": ("Repetition", "Speed / neuromuscular", 5),
-        }
-
-    def _solve_velocity(self, vo2_target: float) -> float:
-        a = 0.000104
-        b = 0.182258
-        c = -4.60 - vo2_target
-        discriminant = b * b - 4 * a * c
-        if discriminant < 0:
-            raise ValueError("Discriminante negativo — verifique VDOT.")
 
-        v1 = (-b + np.sqrt(discriminant)) / (2 * a)
-        v2 = (-b - np.sqrt(discriminant)) / (2 * a)
-        return float(max(v1, v2))
+def pace_code(pace_min_km: float) -> int:
+    """Código inteiro (segundos/km, arredondado como em ``_format_pace``) de um ritmo em min/km."""
+    minutes = int(pace_min_km)
+    return minutes * 60 + int(round((pace_min_km - minutes) * 60))
 
-    def _pace_from_velocity(self, v_m_min: float) -> float:
-        return 1000.0 / v_m_min
 
-    def _compute_zone(self, frac_slow: float, frac_fast: float) -> dict:
-        vo2_slow = frac_slow * self.vdot
-        vo2_fast = frac_fast * self.vdot
+def pace_str(code: int) -> str:
+    """String ``mm:ss`` internada de um código de ritmo."""
+    if not _pace_strings:
+        _pace_strings.extend(f"{s // 60:02d}:{s % 60:02d}" for s in range(PACE_TABLE_MAX_CODE + 1))
+    if 0 <= code <= PACE_TABLE_MAX_CODE:
+        return _pace_strings[code]
+    return f"{code // 60:02d}:{code % 60:02d}"
 
-        v_slow = self._solve_velocity(vo2_slow)
-        v_fast = self._solve_velocity(vo2_fast)
 
-        pace_slow = self._pace_from_velocity(v_slow)
-        pace_fast = self._pace_from_velocity(v_fast)
+# Frações fisiológicas slow–fast (%VO2max)
+ZONE_FRACTIONS = {
+    "E": (0.65, 0.78),
+    "M": (0.83, 0.87),
+    "T": (0.88, 0.92),
+    "I": (0.97, 1.00),
+    "R": (1.05, 1.10),
+}
 
-        return {
-            "vo2_slow": vo2_slow,
-            "vo2_fast": vo2_fast,
-            "v_slow_m_min": v_slow,
-            "v_fast_m_min": v_fast,
-            "pace_slow_min_km_raw": pace_slow,
-            "pace_fast_min_km_raw": pace_fast,
-        }
+# Metadados
+ZONE_META = {
+    "E": ("Easy", "Aerobic endurance / recovery", 1),
+    "M": ("Marathon", "Specific endurance / economy", 2),
+    "T": ("Threshold", "Lactate steady-state", 3),
+    "I": ("Interval", "VO2max development", 4),
+    "R": ("Repetition", "Speed / neuromuscular", 5),
+}
 
-    def _format_pace(self, x: float) -> str:
-        minutes = int(x)
-        seconds = int(round((x - minutes) * 60))
-        if seconds == 60:
-            minutes += 1
-            seconds = 0
-        return f"{minutes:02d}:{seconds:02d}"
+# Coeficientes de Daniels–Gilbert, definidos só aqui (prediction e facade_5k importam):
+# custo de VO2 na velocidade v (m/min): VO2_C + VO2_B·v + VO2_A·v²
+VO2_A, VO2_B, VO2_C = 0.000104, 0.182258, -4.60
+# fração do VO2max sustentável por t minutos: FRAC_C + FRAC_A1·e^(FRAC_K1·t) + FRAC_A2·e^(FRAC_K2·t)
+FRAC_C, FRAC_A1, FRAC_K1, FRAC_A2, FRAC_K2 = 0.8, 0.1894393, -0.012778, 0.2989558, -0.1932605
 
-    def build_dataframe(self) -> pd.DataFrame:
+
+def zone_pace_table(
+    vdots: Union[float, Sequence[float], "np.ndarray"],
+    fractions: Optional[Mapping[str, Tuple[float, float]]] = None,
+    meta: Optional[Mapping[str, Tuple[str, str, int]]] = None,
+) -> Dict[str, Any]:
+    """
+    Zonas de vários VDOTs de uma vez, como arrays ``(n_vdots, n_zonas)``.
+
+    Calcula ``vo2_*``, ``v_*_m_min``, ``pace_*_min_km_raw`` e ``pace_*_code``, além de
+    ``zones`` (ordem das colunas, por prioridade) e ``vdot``. ``fractions``/``meta``
+    substituem ``ZONE_FRACTIONS``/``ZONE_META``.
+    """
+    import numpy as np
+
+    fractions = ZONE_FRACTIONS if fractions is None else fractions
+    meta = ZONE_META if meta is None else meta
+    vdot = np.atleast_1d(np.asarray(vdots, dtype=np.float64))
+    zones = sorted(fractions, key=lambda z: meta[z][2])
+    out: Dict[str, Any] = {"zones": zones, "vdot": vdot}
+    for side, k in (("slow", 0), ("fast", 1)):
+        frac = np.array([fractions[z][k] for z in zones])
+        vo2 = frac[None, :] * vdot[:, None]
+        c = VO2_C - vo2
+        discriminant = VO2_B * VO2_B - 4 * VO2_A * c
+        if np.any(discriminant < 0):
+            raise ValueError("Discriminante negativo — verifique VDOT.")
+        v = (-VO2_B + np.sqrt(discriminant)) / (2 * VO2_A)
+        pace = 1000.0 / v
+        minutes = np.trunc(pace)
+        out[f"vo2_{side}"] = vo2
+        out[f"v_{side}_m_min"] = v
+        out[f"pace_{side}_min_km_raw"] = pace
+        out[f"pace_{side}_code"] = (minutes * 60 + np.round((pace - minutes) * 60)).astype(np.int64)
+    return out
+
+
+def zone_records_for_vdots(
+    vdots: Union[Sequence[float], "np.ndarray"],
+    fractions: Optional[Mapping[str, Tuple[float, float]]] = None,
+    meta: Optional[Mapping[str, Tuple[str, str, int]]] = None,
+) -> List[List[Dict[str, Any]]]:
+    """
+    Registros de zona (colunas de ``DanielsZones.build_dataframe``) para cada VDOT, a
+    partir de uma única ``zone_pace_table``. É a única definição do layout dos registros.
+    """
+    fractions = ZONE_FRACTIONS if fractions is None else fractions
+    meta = ZONE_META if meta is None else meta
+    table = zone_pace_table(vdots, fractions, meta)
+    zones = table["zones"]
+    columns = {
+        key: table[key].tolist()
+        for key in (
+            "vo2_slow", "vo2_fast", "v_slow_m_min", "v_fast_m_min",
+            "pace_slow_min_km_raw", "pace_fast_min_km_raw", "pace_slow_code", "pace_fast_code",
+        )
+    }
+    result = []
+    for i in range(len(table["vdot"])):
         rows = []
-        for zone, (frac_slow, frac_fast) in self.zone_fractions.items():
-            long_name, description, priority = self.zone_meta[zone]
-            calc = self._compute_zone(frac_slow, frac_fast)
-            row = {
+        for j, zone in enumerate(zones):
+            long_name, description, priority = meta[zone]
+            slow_code = columns["pace_slow_code"][i][j]
+            fast_code = columns["pace_fast_code"][i][j]
+            rows.append({
                 "zone": zone,
                 "long_name": long_name,
-                "fraction_slow": frac_slow,
-                "fraction_fast": frac_fast,
-                "vo2_slow": calc["vo2_slow"],
-                "vo2_fast": calc["vo2_fast"],
-                "v_slow_m_min": calc["v_slow_m_min"],
-                "v_fast_m_min": calc["v_fast_m_min"],
-                "pace_slow_min_km_raw": calc["pace_slow_min_km_raw"],
-                "pace_fast_min_km_raw": calc["pace_fast_min_km_raw"],
-                "pace_slow_min_km_str": self._format_pace(calc["pace_slow_min_km_raw"]),
-                "pace_fast_min_km_str": self._format_pace(calc["pace_fast_min_km_raw"]),
+                "fraction_slow": fractions[zone][0],
+                "fraction_fast": fractions[zone][1],
+                "vo2_slow": columns["vo2_slow"][i][j],
+                "vo2_fast": columns["vo2_fast"][i][j],
+                "v_slow_m_min": columns["v_slow_m_min"][i][j],
+                "v_fast_m_min": columns["v_fast_m_min"][i][j],
+                "pace_slow_min_km_raw": columns["pace_slow_min_km_raw"][i][j],
+                "pace_fast_min_km_raw": columns["pace_fast_min_km_raw"][i][j],
+                "pace_slow_min_km_str": pace_str(slow_code),
+                "pace_fast_min_km_str": pace_str(fast_code),
+                "pace_slow_code": slow_code,
+                "pace_fast_code": fast_code,
                 "description": description,
                 "intensity_level": priority,
                 "priority": priority,
-            }
-            rows.append(row)
-        df = pd.DataFrame(rows)
-        df = df.sort_values("priority").reset_index(drop=True)
-        return df
+            })
+        result.append(rows)
+    return result
+
+
+class DanielsZones:
+    """
+    Calculadora de zonas oficiais de Daniels (E/M/T/I/R) para um VDOT dado.
+    Produz um DataFrame profissional com metadados.
+    """
+
+    def __init__(self, vdot: float):
+        self.vdot = float(vdot)
+
+        self.zone_fractions = dict(ZONE_FRACTIONS)
+        self.zone_meta = dict(ZONE_META)
+
+    def _format_pace(self, x: float) -> str:
+        return pace_str(pace_code(x))
+
+    def build_records(self) -> List[Dict[str, Any]]:
+        """Zonas como lista de dicts (mesmas colunas do DataFrame), sem depender do pandas."""
+        return zone_records_for_vdots([self.vdot], self.zone_fractions, self.zone_meta)[0]
+
+    def build_dataframe(self) -> pd.DataFrame:
+        import pandas as pd
+
+        return pd.DataFrame(self.build_records())
 
     def get_zone(self, zone: str) -> pd.Series:
         df = self.build_dataframe()